@@ -3,6 +3,7 @@ from gotoh import Gotoh
 from needleman_wunsch import NeedlemanWunsch
 from needleman_wunsch3 import NeedlemanWunsch3
 from nussinov_alg import Nussinov
+from smith_waterman import SmithWaterman
 
 class AlgorithmHandler:
     """
@@ -26,5 +27,7 @@ class AlgorithmHandler:
             procedure = NeedlemanWunsch3()
         elif algorithm == available_algorithms.NUSSINOV:
             procedure = Nussinov()
+        elif algorithm == available_algorithms.SMITH_WATERMAN:
+            procedure = SmithWaterman()
 
         procedure.compute(input)
@@ -1,7 +1,11 @@
+from algorithms.backtracking.alignment_graph import AlignmentGraph
 from data.alignment_output_data import AlignmentOutputData
+from data.move_string import MoveString
+from data.scratch_space import ScratchSpace
 from formats.fasta import Fasta
 from system import messages
 
+import itertools
 import system.string_symbols as strings
 import system.words as words
 
@@ -12,17 +16,48 @@ class AlignmentAlgorithm:
 
     TRACEBACK_ALL = "all"
 
+    _OPTIMAL_ALIGNMENTS_NUMBER = words.OPTIMAL_ALIGNMENTS_NUMBER  # label of the printed number of alignments
+
+    global _checkpoint
     global _data
+    global _memory_budget
+    global _publish_output
+    global _result
+    global _resume
+    global _scratch_directory
+    global _scratch_space
     global _tbl_len_x
     global _tbl_len_y
     global _traceback_mode
 
-    def __init__(self):
+    def __init__(self, publish_output=True, scratch_directory=None, memory_budget=ScratchSpace.MEMORY_BUDGET):
         """
         Initializes parameters used by alignment algorithms.
+        The tables and results of a run are stored in an own AlignmentOutputData instance,
+        so alignments can run in parallel threads with one algorithm instance per thread.
+
+        Args:
+            publish_output: if True, the results of each run are also copied into the class attributes
+                of AlignmentOutputData (set it to False if alignments run in parallel threads)
+            scratch_directory: if it is set, the matrices of the Python engine are stored in files
+                of this directory and only memory_budget bytes of them are kept in memory (see ScratchSpace)
+            memory_budget: number of bytes of the matrices in the scratch directory which are kept in memory
         """
+        self._publish_output = publish_output
+        self._scratch_directory = scratch_directory
+        self._memory_budget = memory_budget
+        self._scratch_space = None
+        self._checkpoint = None
+        self._resume = False
+        self._result = AlignmentOutputData()
         self._traceback_mode = strings.EMPTY
 
+    def get_output_data(self):
+        """
+        Returns the output data (tables, paths, alignments and score) of the last run of this instance.
+        """
+        return self._result
+
     def compute(self, input_data):
         """
         Abstract function which has to be overriden to avoid an error message.
@@ -37,103 +72,216 @@ class AlignmentAlgorithm:
     def _compute_alignments(self):
         """
         Computes the alignment matrix by using the scoring-function.
+        The current and the previous row of each table are lists while they are used,
+        afterwards they are packed back into the table (see DPTable).
+        The rows are filled from top to bottom, so tables in a scratch space are written sequentially.
+        With a checkpoint the completed rows are stored from time to time and a resumed fill
+        begins after the last stored row (see Checkpoint).
         """
-        for y in range(1, self._tbl_len_y):
-            cur_char_seq1 = self._data.sequence_a[y - 1]
+        tables = self._get_filled_tables()
+        records = [] if self._checkpoint is None \
+            else self._checkpoint.open(self._get_checkpoint_parameters(), self._resume)
+
+        try:
+            self.__fill_rows(tables, self.__restore_checkpoint(tables, records))
+        finally:  # the thread of the checkpoint is also stopped if the fill raises an error
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+
+    def __fill_rows(self, tables, start):
+        """
+        Fills the rows of the tables which are not restored from the checkpoint.
+
+        Args:
+            tables: the filled tables (see _get_filled_tables)
+            start: the first row which has to be computed
+        """
+        scores = self._data.cost_function.get_scores()
+        codes_b = self._data.codes_b
+        checkpointed = start  # first row which is not stored in the checkpoint
+
+        for table in tables:
+            table.release()  # the borders touch all rows
+            table.unpack_row(start - 1)
+
+        for y in range(start, self._tbl_len_y):
+            cur_scores_seq1 = scores[self._data.codes_a[y - 1]]
+
+            for table in tables:
+                table.unpack_row(y)
 
             for x in range(1, self._tbl_len_x):
-                cur_char_seq2 = self._data.sequence_b[x - 1]
-                AlignmentOutputData.table_values[y][x] = self._value(cur_char_seq1, cur_char_seq2, x, y)
+                self._result.table_values.rows[y][x] = self._value(cur_scores_seq1[codes_b[x - 1]], x, y)
 
-    def _create_alignments(self):
-        """Creates the alignments by going through the traceback paths."""
-        alignments = []
+            for table in tables:
+                table.pack_row(y - 1)
+
+            if self._checkpoint is not None and self._checkpoint.is_due(self._tbl_len_x - 1):
+                self.__write_checkpoint(tables, checkpointed, y)
+                checkpointed = y + 1
+
+        for table in tables:
+            table.pack_row(self._tbl_len_y - 1)
 
-        for i in range(0, len(AlignmentOutputData.paths)):
-            alignments.append(self._create_alignment(AlignmentOutputData.paths[i]))
+        if self._checkpoint is not None and checkpointed < self._tbl_len_y:
+            self.__write_checkpoint(tables, checkpointed, self._tbl_len_y - 1)
 
-        AlignmentOutputData.alignments = alignments
+    def _get_checkpoint_parameters(self):
+        """
+        Returns the parameters which have an influence on the matrices, so a checkpoint is only used by the same fill.
+        """
+        parameters = sorted([(key, value) for (key, value) in vars(self._data).items()
+                             if key != "cost_function" and not key.startswith("codes")])
+
+        return [type(self).__name__, parameters, self._data.cost_function.get_scores()]
 
-    def _create_alignment(self, path):
+    def __restore_checkpoint(self, tables, records):
         """
-        Creates one alignment by going through a traceback path.
+        Restores the rows of the last fill with the same parameters if it is resumed.
 
         Args:
-            path: from which you want get the traceback
+            tables: the filled tables (see _get_filled_tables)
+            records: the records of the opened checkpoint (see Checkpoint.open)
+
+        Returns:
+            the first row which has to be computed
         """
-        path.reverse()
-        start = path[0]
+        start = 1
 
-        alignment_a = strings.EMPTY
-        alignment_b = strings.EMPTY
+        for (first, last, directions, values) in records:
+            for y in range(first, last + 1):
+                tables[-1].set_row(y, directions[y - first])
 
-        cur_char_align_1 = 0
-        cur_char_align_2 = 0
+            for (table, row) in zip(tables[:-1], values):
+                table.set_row(last, row)
 
-        for i in range(0, len(path) - 1):
-            if path[i + 1].x - path[i].x > 0 and path[i + 1].y - path[i].y > 0:
-                alignment_a += self._data.sequence_a[start.y + cur_char_align_1]
-                alignment_b += self._data.sequence_b[start.x + cur_char_align_2]
-                cur_char_align_1 += 1
-                cur_char_align_2 += 1
-            elif path[i + 1].x - path[i].x > 0:
-                alignment_a += strings.GAP
-                alignment_b += self._data.sequence_b[start.x + cur_char_align_2]
-                cur_char_align_2 += 1
-            elif path[i + 1].y - path[i].y > 0:
-                alignment_a += self._data.sequence_a[start.y + cur_char_align_1]
-                alignment_b += strings.GAP
-                cur_char_align_1 += 1
+            start = last + 1
 
-        return [alignment_a, alignment_b]
+        return start
 
-    def _traceback(self, vec, all, backtracking):
+    def __write_checkpoint(self, tables, first, last):
         """
-        Starts the traceback.
+        Stores the direction bits of the rows which are completed since the last checkpoint
+        and the values of the last completed row.
+
+        Args:
+            tables: the filled tables (see _get_filled_tables)
+            first: first row which is not stored in the checkpoint
+            last: last completed row
+        """
+        self._checkpoint.write(first, last,
+                               [tables[-1].get_row(y) for y in range(first, last + 1)],
+                               [table.get_row(last) for table in tables[:-1]])
+
+    def _get_filled_tables(self):
+        """
+        Returns the tables which are filled by the scoring-function.
+        The table with the direction bits is the last one.
+        """
+        return [self._result.table_values, self._result.table_directions]
+
+    def _create_alignments(self):
+        """
+        Creates the alignments of the traceback paths as move strings.
+        They are created lazily, so each path can be dropped as soon as its moves exist,
+        and the aligned strings are only created when they are printed (see _output).
+        """
+        self._result.moves = (MoveString().from_path(path) for path in self._result.paths)
+
+    def _traceback(self, vec, all, backtracking, max_alignments=None, seed=None):
+        """
+        Starts the traceback and stores the graph of all co-optimal tracebacks.
+        The graph is created lazily (see AlignmentGraph), so the complete traceback
+        only builds its nodes when the alignments are counted for the output.
+        The complete traceback returns no path which only contains the upper left corner,
+        so in this case no graph is stored and no alignments are counted.
 
         Args:
             vec: from which you begin with the alignment
-            all: if this is True then all tracebacks are returned
+            all: if this is True then all tracebacks are returned, otherwise uniformly drawn random tracebacks
             backtracking: a Backtracking instance
+            max_alignments: maximum number of tracebacks if all is True (None for no limit),
+                otherwise number of random tracebacks (None for one)
+            seed: seed of the random number generator for the random tracebacks
+
+        Returns:
+            iterator over the traceback paths, all paths are computed only when they are needed
         """
         path = []
         path.append(vec)
 
+        self._result.graph = AlignmentGraph(vec, backtracking, self._data)
+
         if all:
-            backtracking.traceback_all(path, self._data)
-        else:
-            backtracking.traceback_one(path, self._data)
+            if vec.x == 0 and vec.y == 0:
+                self._result.graph = None
+            return itertools.islice(backtracking.iterate_all(path, self._data), max_alignments)
 
-        return backtracking.paths
+        return iter(self._result.graph.sample(1 if max_alignments is None else max_alignments, seed))
 
     def _output(self):
         """
         Outputs a nice string on the console.
+        Each alignment is created from its move string when it is printed,
+        afterwards the move strings and the alignments are stored in lists.
+        The number of optimal alignments is counted with the graph of the traceback,
+        so it is also printed if not all of them are returned.
         """
-        print(words.OPTIMAL_SCORE + str(AlignmentOutputData.table_values[self._tbl_len_y - 1][self._tbl_len_x - 1]))
+        print(words.OPTIMAL_SCORE + str(self._result.score))
+
+        if self._result.graph is not None:
+            print(self._OPTIMAL_ALIGNMENTS_NUMBER + str(self._result.graph.count()))
 
         print(words.OPTIMAL_ALIGNMENTS)
-        formatted_lines = Fasta().lines_output(AlignmentOutputData.alignments, self._data.ids)
+        moves_list = []
+        alignments = []
+
+        for moves in self._result.moves:
+            alignment = moves.materialize(self._data.sequence_a, self._data.sequence_b)
+
+            for line in Fasta().lines_output([alignment], self._data.ids):
+                print(line)
+
+            moves_list.append(moves)
+            alignments.append(alignment)
+
+        self._result.moves = moves_list
+        self._result.alignments = alignments
 
-        for alignment in formatted_lines:
-            print(alignment)
+    def _new_output_data(self):
+        """
+        Creates the output data of a new run and the scratch space for its matrices.
+        """
+        self._result = AlignmentOutputData()
+
+        if self._scratch_directory is not None:
+            self._scratch_space = ScratchSpace(self._scratch_directory, self._memory_budget)
+
+    def _publish(self):
+        """
+        Copies the results of the run into the class attributes of AlignmentOutputData if this is wanted.
+        """
+        if self._publish_output:
+            self._result.publish()
 
-    def _count_gaps(self, path):
+    def _score_bound(self, gap_costs, *codes):
         """
-        Counts the number of gaps given a traceback path.
+        Returns an upper bound for the absolute values in the alignment matrices, which chooses their integer type.
+        Each column of an alignment gets for each pair of sequences at most the largest absolute substitution score
+        or the absolute costs of a gap character.
 
         Args:
-            path: traceback path from which you calculate the number of gaps in the final alignment
+            gap_costs: largest costs of a gap character
+            codes: the character codes of the aligned sequences
         """
-        path.reverse()
-        gaps = 0
+        scores = self._data.cost_function.get_scores()
+        largest = abs(gap_costs)
 
-        for i in range(0, len(path) - 1):
-            if path[i + 1].x - path[i].x > 0 and path[i + 1].y - path[i].y > 0:
-                pass
-            elif path[i + 1].x - path[i].x > 0:
-                gaps += 1
-            elif path[i + 1].y - path[i].y > 0:
-                gaps += 1
+        for codes_a, codes_b in itertools.combinations(codes, 2):
+            for code_a in set(codes_a):
+                for code_b in set(codes_b):
+                    if scores[code_a][code_b] is not None:
+                        largest = max(largest, abs(scores[code_a][code_b]))
 
-        return gaps
\ No newline at end of file
+        pairs = len(codes) * (len(codes) - 1) // 2
+        return sum([len(codes_x) for codes_x in codes]) * pairs * largest
\ No newline at end of file
@@ -1,5 +1,5 @@
 from algorithms.alignment.alignment_algorithm import AlignmentAlgorithm
-from data.alignment_output_data import AlignmentOutputData
+from algorithms.backtracking.backtracking_3d import Backtracking3D
 from formats.three_blocks_format import ThreeBlocksFormat
 
 import os
@@ -22,36 +22,139 @@ class AlignmentAlgorithm3D(AlignmentAlgorithm):
     def _compute_alignments(self):
         """
         Computes the three-dimensional alignment matrix by using the scoring-function.
+        The matrix values are read from the dense table of the cost function with the encoded sequences
+        and the rows which do not change in the inner loop are looked up only once.
+        For each cell the cases which reach its score are stored as direction bits.
+        The rows of the current and the previous layer are lists while they are used (see DPTable).
+        With a checkpoint the completed layers are stored from time to time and a resumed fill
+        begins after the last stored layer (see Checkpoint).
+        """
+        records = [] if self._checkpoint is None \
+            else self._checkpoint.open(self._get_checkpoint_parameters(), self._resume)
+
+        try:
+            self.__fill_layers(self.__restore_checkpoint(records))
+        finally:  # the thread of the checkpoint is also stopped if the fill raises an error
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+
+    def __fill_layers(self, start):
+        """
+        Fills the layers of the matrix which are not restored from the checkpoint.
 
         Args:
-            input: input from console
+            start: the first layer which has to be computed
         """
+        scores = self._data.cost_function.get_scores()
+        codes_c = self._data.codes_c
+        table = self._result.table_values_3d.rows
+        gap_costs = 2 * self._data.gap_cost
+        checkpointed = start  # first layer which is not stored in the checkpoint
 
-        for z in range(1, self._tbl_len_z):
-            cur_char_seq1 = self._data.sequence_a[z - 1]
+        for y in range(0, self._tbl_len_y):
+            self._result.table_values_3d.unpack_row(y, start - 1)
+
+        for z in range(start, self._tbl_len_z):
+            cur_scores_seq1 = scores[self._data.codes_a[z - 1]]
+
+            for y in range(0, self._tbl_len_y):
+                self._result.table_values_3d.unpack_row(y, z)
 
             for y in range(1, self._tbl_len_y):
-                cur_char_seq2 = self._data.sequence_b[y - 1]
+                cur_code_seq2 = self._data.codes_b[y - 1]
+                cur_scores_seq2 = scores[cur_code_seq2]
+                value_yz = cur_scores_seq1[cur_code_seq2]
+
+                before_zy = table[z - 1][y - 1]
+                before_z = table[z - 1][y]
+                before_y = table[z][y - 1]
+                row = table[z][y]
+                directions = self._result.table_directions_3d[z][y]
 
                 for x in range(1, self._tbl_len_x):
-                    cur_char_seq3 = self._data.sequence_c[x - 1]
+                    cur_code_seq3 = codes_c[x - 1]
+
+                    value_xz = cur_scores_seq1[cur_code_seq3]
+                    value_xy = cur_scores_seq2[cur_code_seq3]
 
-                    value_yz = self._data.cost_function.get_value(cur_char_seq1, cur_char_seq2)
-                    value_xz = self._data.cost_function.get_value(cur_char_seq1, cur_char_seq3)
-                    value_xy = self._data.cost_function.get_value(cur_char_seq2, cur_char_seq3)
+                    case_1 = before_zy[x - 1] + value_yz + value_xz + value_xy
 
-                    case_1 = AlignmentOutputData.table_values_3d[z - 1][y - 1][x - 1] + value_yz + value_xz + value_xy
+                    case_2 = before_zy[x] + value_yz + gap_costs
+                    case_3 = before_z[x - 1] + value_xz + gap_costs
+                    case_4 = before_y[x - 1] + value_xy + gap_costs
 
-                    case_2 = AlignmentOutputData.table_values_3d[z - 1][y - 1][x] + value_yz + 2 * self._data.gap_cost
-                    case_3 = AlignmentOutputData.table_values_3d[z - 1][y][x - 1] + value_xz + 2 * self._data.gap_cost
-                    case_4 = AlignmentOutputData.table_values_3d[z][y - 1][x - 1] + value_xy + 2 * self._data.gap_cost
+                    case_5 = before_z[x] + gap_costs
+                    case_6 = before_y[x] + gap_costs
+                    case_7 = row[x - 1] + gap_costs
 
-                    case_5 = AlignmentOutputData.table_values_3d[z - 1][y][x] + 2 * self._data.gap_cost
-                    case_6 = AlignmentOutputData.table_values_3d[z][y - 1][x] + 2 * self._data.gap_cost
-                    case_7 = AlignmentOutputData.table_values_3d[z][y][x - 1] + 2 * self._data.gap_cost
+                    value = max(case_1, case_2, case_3, case_4, case_5, case_6, case_7)
+                    row[x] = value
 
-                    AlignmentOutputData.table_values_3d[z][y][x] \
-                        = max(case_1, case_2, case_3, case_4, case_5, case_6, case_7)
+                    directions[x] = (Backtracking3D.TRIPLE_MATCH if case_1 == value else 0) \
+                        | (Backtracking3D.MATCH_AB if case_2 == value else 0) \
+                        | (Backtracking3D.MATCH_AC if case_3 == value else 0) \
+                        | (Backtracking3D.MATCH_BC if case_4 == value else 0) \
+                        | (Backtracking3D.ONLY_A if case_5 == value else 0) \
+                        | (Backtracking3D.ONLY_B if case_6 == value else 0) \
+                        | (Backtracking3D.ONLY_C if case_7 == value else 0)
+
+            for y in range(0, self._tbl_len_y):
+                self._result.table_values_3d.pack_row(y, z - 1)
+
+            if self._checkpoint is not None and self._checkpoint.is_due((self._tbl_len_y - 1) * (self._tbl_len_x - 1)):
+                self.__write_checkpoint(checkpointed, z)
+                checkpointed = z + 1
+
+        for y in range(0, self._tbl_len_y):
+            self._result.table_values_3d.pack_row(y, self._tbl_len_z - 1)
+
+        if self._checkpoint is not None and checkpointed < self._tbl_len_z:
+            self.__write_checkpoint(checkpointed, self._tbl_len_z - 1)
+
+    def __restore_checkpoint(self, records):
+        """
+        Restores the layers of the last fill with the same parameters if it is resumed.
+
+        Args:
+            records: the records of the opened checkpoint (see Checkpoint.open)
+
+        Returns:
+            the first layer which has to be computed
+        """
+        start = 1
+
+        for (first, last, directions, values) in records:
+            for z in range(first, last + 1):
+                for y in range(0, self._tbl_len_y):
+                    self._result.table_directions_3d[z][y][:] = directions[z - first][y]
+
+            for y in range(0, self._tbl_len_y):
+                self._result.table_values_3d.set_row(y, values[y], last)
+
+            start = last + 1
+
+        return start
+
+    def __write_checkpoint(self, first, last):
+        """
+        Stores the direction bits of the layers which are completed since the last checkpoint
+        and the values of the last completed layer.
+
+        Args:
+            first: first layer which is not stored in the checkpoint
+            last: last completed layer
+        """
+        self._checkpoint.write(first, last,
+                               [[bytes(row) for row in self._result.table_directions_3d[z]]
+                                for z in range(first, last + 1)],
+                               [self._result.table_values_3d.get_row(y, last) for y in range(0, self._tbl_len_y)])
+
+    def _create_alignments(self):
+        """
+        Creates the alignments by going through the traceback paths.
+        The alignments are created lazily, so each path can be dropped as soon as its alignment exists.
+        """
+        self._result.alignments = (self._create_alignment(path) for path in self._result.paths)
 
     def _create_alignment(self, path):
         """Creates the alignments by going through the traceback paths."""
@@ -129,17 +232,22 @@ class AlignmentAlgorithm3D(AlignmentAlgorithm):
         Outputs a nice string on the console.
         """
         print(os.linesep + words.OUTPUT)
-        print(words.OPTIMAL_SCORE + str(AlignmentOutputData.table_values_3d[self._tbl_len_z - 1][self._tbl_len_y - 1][self._tbl_len_x - 1]))
+        print(words.OPTIMAL_SCORE + str(self._result.table_values_3d[self._tbl_len_z - 1][self._tbl_len_y - 1][self._tbl_len_x - 1]))
+        print(words.OPTIMAL_ALIGNMENTS_NUMBER + str(self._result.graph.count()))
 
         print(words.OPTIMAL_ALIGNMENTS)
-        formatted_lines = ThreeBlocksFormat().lines_output(AlignmentOutputData.alignments, self._data.ids)
+        alignments = []
+
+        for alignment in self._result.alignments:
+            for line in ThreeBlocksFormat().lines_output([alignment], self._data.ids):
+                print(line)
+            alignments.append(alignment)
 
-        for line in formatted_lines:
-            print(line)
+        self._result.alignments = alignments
 
         print(words.OTHER_PARAMETERS, end=strings.SPACE)
-        print(str(AlignmentOutputData.table_values_xy[self._tbl_len_x - 1][self._tbl_len_y - 1]) + self.__COMMA +
-              str(AlignmentOutputData.table_values_xz[self._tbl_len_x - 1][self._tbl_len_z - 1]) + self.__COMMA +
-              str(AlignmentOutputData.table_values_yz[self._tbl_len_y - 1][self._tbl_len_z - 1]))
+        print(str(self._result.table_values_xy[self._tbl_len_x - 1][self._tbl_len_y - 1]) + self.__COMMA +
+              str(self._result.table_values_xz[self._tbl_len_x - 1][self._tbl_len_z - 1]) + self.__COMMA +
+              str(self._result.table_values_yz[self._tbl_len_y - 1][self._tbl_len_z - 1]))
 
         print(os.linesep + messages.HINT)
\ No newline at end of file
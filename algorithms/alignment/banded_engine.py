@@ -0,0 +1,241 @@
+from algorithms.backtracking.backtracking import Backtracking
+from algorithms.backtracking.multi_table_backtracking import MultiTableBacktracking
+from data.banded_table import BandedTable
+
+import system.string_symbols as strings
+
+class BandedEngine:
+    """
+    Fills only a diagonal band of the alignment matrices.
+    The band contains the diagonals of both corners and k diagonals on each side of them.
+    It starts with a small k which is doubled until the score is provably optimal:
+    a path leaving the band needs at least |m - n| + 2 (k + 1) gap characters (Ukkonen, Fickett).
+    With g gap characters an alignment has (n + m - g) / 2 substitutions and each character
+    takes part in at most one of them, so its score is at most the sum of the
+    (n + m - g) / 2 best substitution scores the characters of a sequence can reach plus the gap costs.
+    The direction bits of the cells are stored in a band of the same size.
+    """
+
+    INITIAL_BAND_WIDTH = 8
+
+    def compute_needleman(self, input_data):
+        """
+        Computes the band of the Needleman-Wunsch matrix.
+
+        Args:
+            input_data: the input for which you create the matrix
+
+        Returns:
+            tuple of banded tables (matrix with the optimal score in its last cell, direction bits of the cells)
+        """
+        band_width = self.INITIAL_BAND_WIDTH
+
+        while True:
+            table = self.__create_table(input_data, band_width)
+            directions = self.__create_table(input_data, band_width, 0)
+            self.__fill_needleman(input_data, table, directions)
+
+            score = table.get(len(table) - 1, table.len_x - 1)
+            if self.__is_optimal(input_data, table, band_width, score, input_data.gap_cost, 0):
+                return table, directions
+            band_width *= 2
+
+    def compute_gotoh(self, input_data):
+        """
+        Computes the bands of the Gotoh matrices.
+
+        Args:
+            input_data: the input for which you create the matrices
+
+        Returns:
+            tuple of banded tables (main matrix, horizontal gaps matrix, vertical gaps matrix,
+            direction bits of the cells)
+        """
+        band_width = self.INITIAL_BAND_WIDTH
+
+        while True:
+            tables = (self.__create_table(input_data, band_width),
+                      self.__create_table(input_data, band_width),
+                      self.__create_table(input_data, band_width),
+                      self.__create_table(input_data, band_width, 0))
+            self.__fill_gotoh(input_data, tables)
+
+            table_values = tables[0]
+            score = table_values.get(len(table_values) - 1, table_values.len_x - 1)
+            if self.__is_optimal(input_data, table_values, band_width, score, input_data.gap_beta,
+                                 input_data.gap_alpha):
+                return tables
+            band_width *= 2
+
+    def __create_table(self, input_data, band_width, empty=strings.NEGATIVE_INFINITY):
+        """
+        Creates an empty band around the diagonals of both corners.
+
+        Args:
+            input_data: the input for which you create the matrix
+            band_width: number of diagonals on each side of the corner diagonals
+            empty: value of the cells which are not set
+        """
+        length_a = len(input_data.sequence_a)
+        length_b = len(input_data.sequence_b)
+
+        return BandedTable(length_a + 1, length_b + 1,
+                           min(0, length_b - length_a) - band_width,
+                           max(0, length_b - length_a) + band_width,
+                           empty)
+
+    def __fill_needleman(self, input_data, table, directions):
+        """
+        Fills the band of the Needleman-Wunsch matrix.
+
+        Args:
+            input_data: the input for which you fill the matrix
+            table: the banded table
+            directions: the banded table for the direction bits
+        """
+        gap_cost = input_data.gap_cost
+        scores = input_data.cost_function.get_scores()
+        codes_b = input_data.codes_b
+        get = table.get
+
+        for x in table.columns(0):
+            table.set(0, x, x * gap_cost)
+            directions.set(0, x, Backtracking.LEFT if x > 0 else 0)
+
+        for y in range(1, len(table)):
+            scores_a = scores[input_data.codes_a[y - 1]]
+
+            for x in table.columns(y):
+                if x == 0:
+                    table.set(y, 0, y * gap_cost)
+                    directions.set(y, 0, Backtracking.UP)
+                    continue
+
+                insertion = get(y, x - 1) + gap_cost
+                matching = get(y - 1, x - 1) + scores_a[codes_b[x - 1]]
+                deletion = get(y - 1, x) + gap_cost
+                value = max(insertion, matching, deletion)
+
+                table.set(y, x, value)
+                directions.set(y, x, (Backtracking.DIAGONAL if matching == value else 0)
+                               | (Backtracking.LEFT if insertion == value else 0)
+                               | (Backtracking.UP if deletion == value else 0))
+
+    def __fill_gotoh(self, input_data, tables):
+        """
+        Fills the bands of the Gotoh matrices.
+
+        Args:
+            input_data: the input for which you fill the matrices
+            tables: tuple of banded tables (main matrix, horizontal gaps matrix, vertical gaps matrix,
+                direction bits of the cells)
+        """
+        table_values, table_horizontal_gaps, table_vertical_gaps, directions = tables
+        gap_alpha = input_data.gap_alpha
+        gap_beta = input_data.gap_beta
+        gap_opening = input_data.gap_opening
+        scores = input_data.cost_function.get_scores()
+        codes_b = input_data.codes_b
+
+        table_values.set(0, 0, 0)
+        table_horizontal_gaps.set(0, 0, 0)
+        table_vertical_gaps.set(0, 0, 0)
+
+        for x in table_values.columns(0):
+            if x > 0:
+                table_values.set(0, x, gap_alpha + gap_beta * x)
+
+        for y in range(1, len(table_values)):
+            scores_a = scores[input_data.codes_a[y - 1]]
+
+            for x in table_values.columns(y):
+                if x == 0:
+                    table_values.set(y, 0, gap_alpha + gap_beta * y)
+                    continue
+
+                horizontal_extension = table_horizontal_gaps.get(y, x - 1) + gap_beta
+                horizontal_opening = table_values.get(y, x - 1) + gap_opening
+                horizontal_gap = max(horizontal_extension, horizontal_opening)
+
+                vertical_extension = table_vertical_gaps.get(y - 1, x) + gap_beta
+                vertical_opening = table_values.get(y - 1, x) + gap_opening
+                vertical_gap = max(vertical_extension, vertical_opening)
+
+                matching = table_values.get(y - 1, x - 1) + scores_a[codes_b[x - 1]]
+                value = max(horizontal_gap, matching, vertical_gap)
+
+                table_horizontal_gaps.set(y, x, horizontal_gap)
+                table_vertical_gaps.set(y, x, vertical_gap)
+                table_values.set(y, x, value)
+                directions.set(y, x, (MultiTableBacktracking.MAIN_DIAGONAL if matching == value else 0)
+                               | (MultiTableBacktracking.MAIN_TO_P if vertical_gap == value else 0)
+                               | (MultiTableBacktracking.MAIN_TO_Q if horizontal_gap == value else 0)
+                               | (MultiTableBacktracking.P_FROM_P if vertical_extension == vertical_gap else 0)
+                               | (MultiTableBacktracking.P_FROM_MAIN if vertical_opening == vertical_gap else 0)
+                               | (MultiTableBacktracking.Q_FROM_Q if horizontal_extension == horizontal_gap else 0)
+                               | (MultiTableBacktracking.Q_FROM_MAIN if horizontal_opening == horizontal_gap else 0))
+
+    def __is_optimal(self, input_data, table, band_width, score, gap_cost, gap_alpha):
+        """
+        Checks if no path outside of the band can have a better score.
+
+        Args:
+            input_data: the input for which the band was computed
+            table: the banded table
+            band_width: number of diagonals on each side of the corner diagonals
+            score: optimal score inside of the band
+            gap_cost: costs for each gap character
+            gap_alpha: additional costs for each gap (0 for linear gap costs)
+        """
+        length_a = len(input_data.sequence_a)
+        length_b = len(input_data.sequence_b)
+
+        # the band already contains the whole matrix
+        if table.offsets[-1] <= 0 and table.offsets[0] + table.width - 1 >= length_b:
+            return True
+
+        best_sums_a = self.__best_substitution_sums(input_data, input_data.sequence_a, input_data.sequence_b, False)
+        best_sums_b = self.__best_substitution_sums(input_data, input_data.sequence_b, input_data.sequence_a, True)
+
+        fewest_gaps = abs(length_b - length_a) + 2 * (band_width + 1)
+        most_gaps = length_a + length_b
+
+        for gaps in range(fewest_gaps, most_gaps + 1, 2):
+            substitutions = (most_gaps - gaps) // 2
+            bound = min(best_sums_a[substitutions], best_sums_b[substitutions]) + gap_cost * gaps
+
+            if gap_alpha > 0:
+                bound += gap_alpha * gaps  # each gap character could be its own gap
+            else:
+                bound += gap_alpha
+
+            if bound > score:
+                return False
+
+        return True
+
+    def __best_substitution_sums(self, input_data, sequence, other_sequence, swapped):
+        """
+        Returns for each k the sum of the k best substitution scores the characters of a sequence can reach.
+
+        Args:
+            input_data: the input for which the band was computed
+            sequence: the sequence whose characters are substituted
+            other_sequence: the sequence with the characters they can be substituted with
+            swapped: if True, the characters of the sequence are the second argument of the cost function
+        """
+        best_scores = {}
+
+        for char in set(sequence):
+            if swapped:
+                best_scores[char] = max([input_data.cost_function.get_value(other_char, char)
+                                         for other_char in set(other_sequence)])
+            else:
+                best_scores[char] = max([input_data.cost_function.get_value(char, other_char)
+                                         for other_char in set(other_sequence)])
+
+        sums = [0]
+        for best_score in sorted([best_scores[char] for char in sequence], reverse=True):
+            sums.append(sums[-1] + best_score)
+
+        return sums
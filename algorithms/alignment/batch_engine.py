@@ -0,0 +1,320 @@
+from algorithms.alignment.vector_engine import VectorEngine, np
+from algorithms.backtracking.backtracking import Backtracking
+from algorithms.backtracking.multi_table_backtracking import MultiTableBacktracking
+
+import system.string_symbols as strings
+
+class BatchEngine(VectorEngine):
+    """
+    Aligns many pairs of sequences at once, which is much faster than a run for each pair
+    if the sequences are short (for example peptides).
+    The pairs are sorted by length and up to BATCH_SIZE of them are computed together row by row:
+    each NumPy call computes one row of the matrices of all pairs of the bucket.
+    Shorter sequences are padded at the end, which does not change the cells of the pair,
+    so the score of a pair is read from its own last cell.
+    The horizontal gaps are resolved with a prefix maximum (see RowEngine).
+    For the alignments only the direction bits of the cells are kept and not the matrices.
+    """
+
+    BATCH_SIZE = 256
+
+    global _codes
+    global _scores
+
+    def align_needleman(self, cost_function, gap_cost, pairs, with_alignments=False):
+        """
+        Computes the optimal, global alignments of pairs of sequences with linear gap costs.
+
+        Args:
+            cost_function: initialized evaluation function used to evaluate alignments
+            gap_cost: costs for a gap
+            pairs: list of tuples (sequence_a, sequence_b)
+            with_alignments: If True, one optimal alignment of each pair is created.
+
+        Returns:
+            list with a tuple (score, [alignment_a, alignment_b]) for each pair,
+            the alignment is None if with_alignments is False
+        """
+        return self.__align(cost_function, pairs, with_alignments,
+                            lambda codes_a, codes_b, lengths_a, lengths_b:
+                            self.__fill_needleman(codes_a, codes_b, lengths_a, lengths_b, gap_cost,
+                                                  with_alignments),
+                            lambda directions, k, sequence_a, sequence_b:
+                            self.__traceback_needleman(directions, k, sequence_a, sequence_b))
+
+    def align_gotoh(self, cost_function, gap_alpha, gap_beta, pairs, with_alignments=False):
+        """
+        Computes the optimal, global alignments of pairs of sequences with affine gap costs.
+
+        Args:
+            cost_function: initialized evaluation function used to evaluate alignments
+            gap_alpha: costs to open a gap
+            gap_beta: costs to extend a gap
+            pairs: list of tuples (sequence_a, sequence_b)
+            with_alignments: If True, one optimal alignment of each pair is created.
+
+        Returns:
+            list with a tuple (score, [alignment_a, alignment_b]) for each pair,
+            the alignment is None if with_alignments is False
+        """
+        return self.__align(cost_function, pairs, with_alignments,
+                            lambda codes_a, codes_b, lengths_a, lengths_b:
+                            self.__fill_gotoh(codes_a, codes_b, lengths_a, lengths_b, gap_alpha, gap_beta,
+                                              with_alignments),
+                            lambda directions, k, sequence_a, sequence_b:
+                            self.__traceback_gotoh(directions, k, sequence_a, sequence_b))
+
+    def __align(self, cost_function, pairs, with_alignments, fill, traceback):
+        """
+        Encodes all sequences, buckets the pairs by length and fills the matrices of each bucket.
+
+        Args:
+            cost_function: initialized evaluation function used to evaluate alignments
+            pairs: list of tuples (sequence_a, sequence_b)
+            with_alignments: If True, one optimal alignment of each pair is created.
+            fill: function which fills the matrices of a bucket and returns the scores and the direction bits
+            traceback: function which creates the alignment of one pair of a bucket from the direction bits
+        """
+        alphabet = sorted(set().union(*[set(sequence_a) | set(sequence_b) for (sequence_a, sequence_b) in pairs]))
+        self._codes = {char: code for code, char in enumerate(alphabet)}
+        padding = len(alphabet)
+
+        # the padding code gets the score 0 with all characters
+        self._scores = np.zeros((len(alphabet) + 1, len(alphabet) + 1), dtype=np.int64)
+        for char_a in alphabet:
+            for char_b in alphabet:
+                self._scores[self._codes[char_a]][self._codes[char_b]] = cost_function.get_value(char_a, char_b)
+
+        order = sorted(range(0, len(pairs)), key=lambda i: (len(pairs[i][0]), len(pairs[i][1])))
+        results = [None] * len(pairs)
+
+        for start in range(0, len(order), self.BATCH_SIZE):
+            bucket = order[start:start + self.BATCH_SIZE]
+            lengths_a = np.array([len(pairs[i][0]) for i in bucket])
+            lengths_b = np.array([len(pairs[i][1]) for i in bucket])
+
+            codes_a = np.full((len(bucket), lengths_a.max()), padding, dtype=np.intp)
+            codes_b = np.full((len(bucket), lengths_b.max()), padding, dtype=np.intp)
+            for k in range(0, len(bucket)):
+                codes_a[k, :lengths_a[k]] = [self._codes[char] for char in pairs[bucket[k]][0]]
+                codes_b[k, :lengths_b[k]] = [self._codes[char] for char in pairs[bucket[k]][1]]
+
+            scores, directions = fill(codes_a, codes_b, lengths_a, lengths_b)
+
+            for k in range(0, len(bucket)):
+                alignment = traceback(directions, k, *pairs[bucket[k]]) if with_alignments else None
+                results[bucket[k]] = (scores[k], alignment)
+
+        return results
+
+    def __fill_needleman(self, codes_a, codes_b, lengths_a, lengths_b, gap_cost, with_alignments):
+        """
+        Fills the Needleman-Wunsch matrices of a bucket row by row.
+
+        Args:
+            codes_a: two-dimensional array with the padded character codes of the first sequences
+            codes_b: two-dimensional array with the padded character codes of the second sequences
+            lengths_a: lengths of the first sequences
+            lengths_b: lengths of the second sequences
+            gap_cost: costs for a gap
+            with_alignments: If True, the direction bits of all cells are kept.
+
+        Returns:
+            tuple of (list with the scores, three-dimensional array with the direction bits or None)
+        """
+        bucket_size = len(lengths_a)
+        tbl_len_y = codes_a.shape[1] + 1
+        tbl_len_x = codes_b.shape[1] + 1
+        gaps = gap_cost * np.arange(0, tbl_len_x)
+
+        row = np.tile(gaps, (bucket_size, 1))
+        scores = [0] * bucket_size
+        best = np.empty((bucket_size, tbl_len_x), dtype=np.int64)
+
+        directions = None
+        if with_alignments:
+            directions = np.zeros((bucket_size, tbl_len_y, tbl_len_x), dtype=np.uint8)
+            directions[:, 0, 1:] = Backtracking.LEFT
+            directions[:, 1:, 0] = Backtracking.UP
+
+        for y in range(0, tbl_len_y):
+            if y > 0:
+                matching = row[:, :-1] + self._scores[codes_a[:, y - 1][:, None], codes_b]
+                deletion = row[:, 1:] + gap_cost
+                best[:, 0] = gap_cost * y
+                best[:, 1:] = np.maximum(matching, deletion)
+                row = gaps + np.maximum.accumulate(best - gaps, axis=1)
+
+                if with_alignments:
+                    directions[:, y, 1:] = (matching == row[:, 1:]) * Backtracking.DIAGONAL \
+                        | (row[:, :-1] + gap_cost == row[:, 1:]) * Backtracking.LEFT \
+                        | (deletion == row[:, 1:]) * Backtracking.UP
+
+            self.__store_scores(row, y, scores, lengths_a, lengths_b)
+
+        return scores, directions
+
+    def __fill_gotoh(self, codes_a, codes_b, lengths_a, lengths_b, gap_alpha, gap_beta, with_alignments):
+        """
+        Fills the Gotoh matrices of a bucket row by row.
+
+        Args:
+            codes_a: two-dimensional array with the padded character codes of the first sequences
+            codes_b: two-dimensional array with the padded character codes of the second sequences
+            lengths_a: lengths of the first sequences
+            lengths_b: lengths of the second sequences
+            gap_alpha: costs to open a gap
+            gap_beta: costs to extend a gap
+            with_alignments: If True, the direction bits of all cells are kept.
+
+        Returns:
+            tuple of (list with the scores, three-dimensional array with the direction bits or None)
+        """
+        bucket_size = len(lengths_a)
+        tbl_len_y = codes_a.shape[1] + 1
+        tbl_len_x = codes_b.shape[1] + 1
+        gap_opening = gap_alpha + gap_beta
+        extensions = gap_beta * np.arange(1, tbl_len_x)
+
+        values = np.tile(gap_alpha + gap_beta * np.arange(0, tbl_len_x), (bucket_size, 1))
+        values[:, 0] = 0
+        horizontal_gaps = np.full((bucket_size, tbl_len_x), self.NEGATIVE_INFINITY, dtype=np.int64)
+        vertical_gaps = np.full((bucket_size, tbl_len_x), self.NEGATIVE_INFINITY, dtype=np.int64)
+
+        directions = np.zeros((bucket_size, tbl_len_y, tbl_len_x), dtype=np.uint8) if with_alignments else None
+        scores = [0] * bucket_size
+
+        for y in range(0, tbl_len_y):
+            if y > 0:
+                first = gap_alpha + gap_beta * y
+                vertical_extensions = vertical_gaps + gap_beta
+                vertical_openings = values + gap_opening
+                vertical_gaps = np.maximum(vertical_extensions, vertical_openings)
+                vertical_gaps[:, 0] = self.NEGATIVE_INFINITY
+
+                diagonal = values[:, :-1] + self._scores[codes_a[:, y - 1][:, None], codes_b]
+                without_horizontal = np.maximum(diagonal, vertical_gaps[:, 1:])
+
+                sources = without_horizontal
+                while True:
+                    openings = np.concatenate((np.full((bucket_size, 1), first), sources[:, :-1]), axis=1) \
+                        + gap_opening - extensions
+                    gaps = extensions + np.maximum.accumulate(openings, axis=1)
+                    row = np.maximum(without_horizontal, gaps)
+
+                    # see RowEngine
+                    if gap_alpha <= 0 or np.array_equal(row, sources):
+                        break
+                    sources = row
+
+                horizontal_gaps[:, 1:] = gaps
+                values = np.concatenate((np.full((bucket_size, 1), first), row), axis=1)
+
+                if with_alignments:
+                    vertical_gaps_row = vertical_gaps[:, 1:]
+                    directions[:, y, 1:] = (diagonal == row) * MultiTableBacktracking.MAIN_DIAGONAL \
+                        | (vertical_gaps_row == row) * MultiTableBacktracking.MAIN_TO_P \
+                        | (gaps == row) * MultiTableBacktracking.MAIN_TO_Q \
+                        | (vertical_extensions[:, 1:] == vertical_gaps_row) * MultiTableBacktracking.P_FROM_P \
+                        | (vertical_openings[:, 1:] == vertical_gaps_row) * MultiTableBacktracking.P_FROM_MAIN \
+                        | (horizontal_gaps[:, :-1] + gap_beta == gaps) * MultiTableBacktracking.Q_FROM_Q \
+                        | (values[:, :-1] + gap_opening == gaps) * MultiTableBacktracking.Q_FROM_MAIN
+
+            self.__store_scores(values, y, scores, lengths_a, lengths_b)
+
+        return scores, directions
+
+    def __store_scores(self, row, y, scores, lengths_a, lengths_b):
+        """
+        Stores the scores of the pairs whose first sequence ends in this row.
+
+        Args:
+            row: two-dimensional array with the row of all pairs
+            y: number of the row
+            scores: list with the scores of the pairs
+            lengths_a: lengths of the first sequences
+            lengths_b: lengths of the second sequences
+        """
+        for k in np.flatnonzero(lengths_a == y):
+            scores[k] = int(row[k, lengths_b[k]])
+
+    def __traceback_needleman(self, directions, k, sequence_a, sequence_b):
+        """
+        Creates one optimal alignment of a pair from the direction bits of its Needleman-Wunsch matrix.
+        Matches are preferred over gaps in the second and gaps in the first sequence.
+
+        Args:
+            directions: three-dimensional array with the direction bits of the bucket
+            k: position of the pair in the bucket
+            sequence_a: first sequence
+            sequence_b: second sequence
+        """
+        table = directions[k].tolist()
+        alignment_a = []
+        alignment_b = []
+        y = len(sequence_a)
+        x = len(sequence_b)
+
+        while y > 0 or x > 0:
+            if table[y][x] & Backtracking.DIAGONAL:
+                y -= 1
+                x -= 1
+                alignment_a.append(sequence_a[y])
+                alignment_b.append(sequence_b[x])
+            elif table[y][x] & Backtracking.UP:
+                y -= 1
+                alignment_a.append(sequence_a[y])
+                alignment_b.append(strings.GAP)
+            else:
+                x -= 1
+                alignment_a.append(strings.GAP)
+                alignment_b.append(sequence_b[x])
+
+        return [strings.EMPTY.join(reversed(alignment_a)), strings.EMPTY.join(reversed(alignment_b))]
+
+    def __traceback_gotoh(self, directions, k, sequence_a, sequence_b):
+        """
+        Creates one optimal alignment of a pair from the direction bits of its Gotoh matrices.
+        Matches are preferred over gaps in the second and gaps in the first sequence
+        and closing a gap is preferred over extending it.
+
+        Args:
+            directions: three-dimensional array with the direction bits of the bucket
+            k: position of the pair in the bucket
+            sequence_a: first sequence
+            sequence_b: second sequence
+        """
+        table = directions[k].tolist()
+        alignment_a = []
+        alignment_b = []
+        y = len(sequence_a)
+        x = len(sequence_b)
+        matrix_label = MultiTableBacktracking.MATRIX_LBL_MAIN
+
+        while y > 0 or x > 0:
+            if matrix_label == MultiTableBacktracking.MATRIX_LBL_MAIN:
+                if table[y][x] & MultiTableBacktracking.MAIN_DIAGONAL:
+                    y -= 1
+                    x -= 1
+                    alignment_a.append(sequence_a[y])
+                    alignment_b.append(sequence_b[x])
+                    continue
+                elif x == 0 or table[y][x] & MultiTableBacktracking.MAIN_TO_P:
+                    matrix_label = MultiTableBacktracking.MATRIX_LBL_VERTICAL_GAPS
+                else:
+                    matrix_label = MultiTableBacktracking.MATRIX_LBL_HORIZONTAL_GAPS
+
+            if matrix_label == MultiTableBacktracking.MATRIX_LBL_VERTICAL_GAPS:
+                if x == 0 or table[y][x] & MultiTableBacktracking.P_FROM_MAIN:
+                    matrix_label = MultiTableBacktracking.MATRIX_LBL_MAIN
+                y -= 1
+                alignment_a.append(sequence_a[y])
+                alignment_b.append(strings.GAP)
+            else:
+                if y == 0 or table[y][x] & MultiTableBacktracking.Q_FROM_MAIN:
+                    matrix_label = MultiTableBacktracking.MATRIX_LBL_MAIN
+                x -= 1
+                alignment_a.append(strings.GAP)
+                alignment_b.append(sequence_b[x])
+
+        return [strings.EMPTY.join(reversed(alignment_a)), strings.EMPTY.join(reversed(alignment_b))]
@@ -0,0 +1,191 @@
+class BitVectorEngine:
+    """
+    Computes the edit distance (each substitution, insertion and deletion costs one)
+    of a pattern with a text column by column with Myers' bit-vector algorithm (Myers, 1999).
+    The values of a column differ by -1, 0 or +1 from row to row, so a column is stored
+    as two bit-vectors with the rows where the value goes up and where it goes down.
+    Python integers have any length, so a whole column is one pair of integers
+    and the next column is computed with a few bit operations on them (in the formulation of Hyyrö, 2003).
+
+    For long patterns the column can be split into blocks of block_size rows.
+    With a maximal distance k the blocks below the last block with a value of at most k
+    are not computed (Ukkonen's cutoff), because a value can only decrease by one from row to row.
+    A block is computed again when the value above it allows a value of at most k in it.
+    The operations on one long integer are fast, so blocks only pay off for long patterns
+    (e.g. blocks of some hundred rows for patterns with many thousand characters and a small k).
+    """
+
+    def get_distance(self, pattern, text, max_distance=None, block_size=None):
+        """
+        Returns the edit distance of two sequences (a global alignment).
+
+        Args:
+            pattern: first sequence (the rows of the matrix), the bit-vectors have its length
+            text: second sequence (the columns of the matrix)
+            max_distance: largest distance of interest (None for no cutoff)
+            block_size: number of rows of a block (None for one block with the whole pattern)
+
+        Returns:
+            the edit distance or None if it is larger than max_distance
+        """
+        distance = len(text)
+
+        if len(pattern) > 0:
+            for end, distance in self.__compute(pattern, text, max_distance, block_size, True):
+                pass
+
+        if max_distance is not None and (distance is None or distance > max_distance):
+            return None
+        return distance
+
+    def search(self, pattern, text, max_distance, block_size=None):
+        """
+        Returns all ends of the occurrences of a pattern in a text with at most max_distance errors
+        (a semi-global alignment: the gaps before and after the pattern are free).
+
+        Args:
+            pattern: the searched sequence (the rows of the matrix)
+            text: the sequence which is searched (the columns of the matrix)
+            max_distance: largest number of errors of an occurrence
+            block_size: number of rows of a block (None for one block with the whole pattern)
+
+        Returns:
+            list of tuples (end, distance) where end is the position after the last character of the occurrence
+            in the text and distance the smallest number of errors of an occurrence with this end
+        """
+        if len(pattern) == 0:
+            return [(end, 0) for end in range(0, len(text) + 1)]
+
+        return [(end, distance) for (end, distance) in self.__compute(pattern, text, max_distance, block_size, False)
+                if distance is not None and distance <= max_distance]
+
+    def __compute(self, pattern, text, max_distance, block_size, is_global):
+        """
+        Computes the last row of the matrix column by column.
+
+        Args:
+            pattern: the sequence of the rows
+            text: the sequence of the columns
+            max_distance: largest distance of interest (None for no cutoff)
+            block_size: number of rows of a block (None for one block with the whole pattern)
+            is_global: if True, the first row is 0, 1, 2, ... (the text is aligned completely), otherwise 0, 0, 0, ...
+
+        Yields:
+            tuples (column, value in the last row or None if the last block is not computed)
+        """
+        if block_size is None or block_size > len(pattern):
+            block_size = len(pattern)
+
+        self.__create_blocks(pattern, block_size)
+        last_block = len(self.__lengths) - 1
+        carry_in = 1 if is_global else 0  # difference between two cells of the first row
+
+        if max_distance is None:
+            active_block = last_block
+        else:  # the first column is 0, 1, 2, ...
+            active_block = min(max(0, (max_distance - 1) // block_size), last_block)
+
+        yield 0, len(pattern) if active_block == last_block else None
+
+        for column in range(1, len(text) + 1):
+            character = text[column - 1]
+            carry = carry_in
+
+            for block in range(0, active_block + 1):
+                carry = self.__advance(block, character, carry)
+
+            if max_distance is not None:
+                scores = self.__scores
+
+                if active_block < last_block and scores[active_block] - carry <= max_distance \
+                        and (self.__matches[active_block + 1].get(character, 0) & 1 or carry < 0):
+                    active_block += 1
+                    self.__reset(active_block, scores[active_block - 1] - carry)
+                    self.__advance(active_block, character, carry)
+
+                while active_block > 0 and scores[active_block] >= max_distance + self.__lengths[active_block]:
+                    active_block -= 1
+
+            yield column, self.__scores[last_block] if active_block == last_block else None
+
+    def __create_blocks(self, pattern, block_size):
+        """
+        Creates the bit-vectors of the matches of each character with the rows of each block
+        and the first column of the matrix.
+
+        Args:
+            pattern: the sequence of the rows
+            block_size: number of rows of a block
+        """
+        self.__lengths = []
+        self.__matches = []
+
+        for start in range(0, len(pattern), block_size):
+            rows = pattern[start:start + block_size]
+            matches = {}
+
+            for row in range(0, len(rows)):
+                matches[rows[row]] = matches.get(rows[row], 0) | (1 << row)
+
+            self.__lengths.append(len(rows))
+            self.__matches.append(matches)
+
+        self.__positive = [0] * len(self.__lengths)
+        self.__negative = [0] * len(self.__lengths)
+        self.__scores = [0] * len(self.__lengths)
+
+        for block in range(0, len(self.__lengths)):
+            self.__reset(block, block * block_size)
+
+    def __reset(self, block, score_above):
+        """
+        Sets the values of a block to the value above it plus 1, 2, 3, ...
+
+        Args:
+            block: number of the block
+            score_above: the value in the row above the block
+        """
+        self.__positive[block] = (1 << self.__lengths[block]) - 1
+        self.__negative[block] = 0
+        self.__scores[block] = score_above + self.__lengths[block]
+
+    def __advance(self, block, character, carry):
+        """
+        Computes the next column of a block.
+
+        Args:
+            block: number of the block
+            character: character of the text in this column
+            carry: difference between this and the last column in the row above the block
+
+        Returns:
+            difference between this and the last column in the last row of the block
+        """
+        mask = (1 << self.__lengths[block]) - 1
+        last_row = 1 << (self.__lengths[block] - 1)
+        positive = self.__positive[block]
+        negative = self.__negative[block]
+        matches = self.__matches[block].get(character, 0)
+
+        vertical = matches | negative
+        if carry < 0:
+            matches |= 1
+
+        horizontal = (((matches & positive) + positive) ^ positive) | matches
+        horizontal_positive = (negative | ~(horizontal | positive)) & mask
+        horizontal_negative = positive & horizontal
+
+        if horizontal_positive & last_row:
+            carry_out = 1
+        elif horizontal_negative & last_row:
+            carry_out = -1
+        else:
+            carry_out = 0
+
+        horizontal_positive = horizontal_positive << 1 | (1 if carry > 0 else 0)
+        horizontal_negative = horizontal_negative << 1 | (1 if carry < 0 else 0)
+
+        self.__positive[block] = (horizontal_negative | ~(vertical | horizontal_positive)) & mask
+        self.__negative[block] = horizontal_positive & vertical & mask
+        self.__scores[block] += carry_out
+        return carry_out
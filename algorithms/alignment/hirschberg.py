@@ -0,0 +1,136 @@
+import system.string_symbols as strings
+
+class Hirschberg:
+    """
+    Computes one optimal, global alignment with linear gap costs in linear space.
+    The first sequence is halved and the column in which an optimal path crosses the middle row
+    is found with a forward and a backward pass which only keep one row.
+    Both halves are then aligned recursively.
+    """
+
+    global _data
+
+    def align(self, input_data):
+        """
+        Returns one optimal alignment and its score.
+
+        Args:
+            input_data: the input for which you create the alignment
+
+        Returns:
+            tuple of (score, [alignment_a, alignment_b])
+        """
+        self._data = input_data
+        alignment_a, alignment_b = self.__align(0, len(input_data.sequence_a), 0, len(input_data.sequence_b))
+
+        return self.__score(alignment_a, alignment_b), [alignment_a, alignment_b]
+
+    def __align(self, start_a, end_a, start_b, end_b):
+        """
+        Aligns the sub-sequences sequence_a[start_a:end_a] and sequence_b[start_b:end_b].
+
+        Args:
+            start_a: first position in sequence a
+            end_a: position after the last position in sequence a
+            start_b: first position in sequence b
+            end_b: position after the last position in sequence b
+        """
+        if end_a - start_a == 0:
+            return strings.GAP * (end_b - start_b), self._data.sequence_b[start_b:end_b]
+
+        if end_a - start_a == 1:
+            return self.__align_one(start_a, start_b, end_b)
+
+        middle_a = (start_a + end_a) // 2
+        upper = self.__last_row(start_a, middle_a, start_b, end_b, False)
+        lower = self.__last_row(middle_a, end_a, start_b, end_b, True)
+
+        length_b = end_b - start_b
+        split = max(range(0, length_b + 1), key=lambda x: upper[x] + lower[length_b - x])
+
+        upper_a, upper_b = self.__align(start_a, middle_a, start_b, start_b + split)
+        lower_a, lower_b = self.__align(middle_a, end_a, start_b + split, end_b)
+
+        return upper_a + lower_a, upper_b + lower_b
+
+    def __align_one(self, position_a, start_b, end_b):
+        """
+        Aligns a single character of sequence a with the sub-sequence sequence_b[start_b:end_b].
+
+        Args:
+            position_a: position of the character in sequence a
+            start_b: first position in sequence b
+            end_b: position after the last position in sequence b
+        """
+        char_a = self._data.sequence_a[position_a]
+        sequence_b = self._data.sequence_b[start_b:end_b]
+        gap_cost = self._data.gap_cost
+
+        best_score = gap_cost * (len(sequence_b) + 1)  # character a aligned with a gap
+        best_position = -1
+
+        for x in range(0, len(sequence_b)):
+            score = self._data.cost_function.get_value(char_a, sequence_b[x]) + gap_cost * (len(sequence_b) - 1)
+            if score > best_score:
+                best_score = score
+                best_position = x
+
+        if best_position == -1:
+            return char_a + strings.GAP * len(sequence_b), strings.GAP + sequence_b
+
+        alignment_a = strings.GAP * best_position + char_a + strings.GAP * (len(sequence_b) - best_position - 1)
+        return alignment_a, sequence_b
+
+    def __last_row(self, start_a, end_a, start_b, end_b, backwards):
+        """
+        Returns the last row of the Needleman-Wunsch matrix of two sub-sequences by keeping only one row.
+
+        Args:
+            start_a: first position in sequence a
+            end_a: position after the last position in sequence a
+            start_b: first position in sequence b
+            end_b: position after the last position in sequence b
+            backwards: if True, the matrix of the reversed sub-sequences is computed
+        """
+        gap_cost = self._data.gap_cost
+        scores = self._data.cost_function.get_scores()
+        codes_a = self._data.codes_a[start_a:end_a]
+        codes_b = self._data.codes_b[start_b:end_b]
+
+        if backwards:
+            codes_a = codes_a[::-1]
+            codes_b = codes_b[::-1]
+
+        row = [x * gap_cost for x in range(0, len(codes_b) + 1)]
+
+        for y in range(1, len(codes_a) + 1):
+            scores_a = scores[codes_a[y - 1]]
+            diagonal = row[0]
+            row[0] = y * gap_cost
+
+            for x in range(1, len(codes_b) + 1):
+                value = max(row[x - 1] + gap_cost,
+                            diagonal + scores_a[codes_b[x - 1]],
+                            row[x] + gap_cost)
+                diagonal = row[x]
+                row[x] = value
+
+        return row
+
+    def __score(self, alignment_a, alignment_b):
+        """
+        Returns the score of an alignment.
+
+        Args:
+            alignment_a: first row of the alignment
+            alignment_b: second row of the alignment
+        """
+        score = 0
+
+        for i in range(0, len(alignment_a)):
+            if alignment_a[i] == strings.GAP or alignment_b[i] == strings.GAP:
+                score += self._data.gap_cost
+            else:
+                score += self._data.cost_function.get_value(alignment_a[i], alignment_b[i])
+
+        return score
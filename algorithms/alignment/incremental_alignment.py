@@ -0,0 +1,319 @@
+from algorithms.backtracking.backtracking import Backtracking
+from data.alignment_input_data import AlignmentInputData
+from data.alignment_output_data import AlignmentOutputData
+from data.move_string import MoveString
+from maths.vector import Vector
+
+import itertools
+import system.string_symbols as strings
+
+class IncrementalAlignment:
+    """
+    Keeps the state of a global alignment (Needleman-Wunsch), so it can be updated after small changes
+    of the sequences without computing the whole matrix again.
+
+    The direction bits of all cells are stored, because the traceback needs them.
+    The values are only stored in checkpoint rows and checkpoint columns (every checkpoint_interval-th one)
+    and in the last row and column. A change of sequence a at position i only changes the rows after row i,
+    so they are computed again from the values of row i, which are computed from the checkpoint row before it.
+    A change of sequence b changes the columns after column i in the same way
+    and appended characters only add new rows or columns.
+    """
+
+    CHECKPOINT_INTERVAL = 64
+
+    global sequence_a
+    global sequence_b
+
+    def __init__(self, cost_function, gap_cost, sequence_a, sequence_b, checkpoint_interval=CHECKPOINT_INTERVAL):
+        """
+        Computes the matrix of two sequences.
+
+        Args:
+            cost_function: initialized evaluation function used to evaluate alignment
+            gap_cost: costs for a gap
+            sequence_a: first sequence (rows of the matrix)
+            sequence_b: second sequence (columns of the matrix)
+            checkpoint_interval: distance of the rows and columns whose values are stored
+        """
+        self.__cost_function = cost_function
+        self.__gap_cost = gap_cost
+        self.__interval = checkpoint_interval
+        self.__directions = []
+        self.__rows = {}
+        self.__columns = {}
+        self.__set_sequences(sequence_a, sequence_b)
+        self.__fill_rows(0)
+
+    def get_score(self):
+        """
+        Returns the score of the optimal alignments of the current sequences.
+        """
+        return self.__rows[len(self.sequence_a)][len(self.sequence_b)]
+
+    def append_a(self, residues):
+        """
+        Appends characters to sequence a and computes only the new rows.
+
+        Args:
+            residues: the appended characters
+
+        Returns:
+            the new score
+        """
+        return self.replace_a(len(self.sequence_a), len(self.sequence_a), residues)
+
+    def append_b(self, residues):
+        """
+        Appends characters to sequence b and computes only the new columns.
+
+        Args:
+            residues: the appended characters
+
+        Returns:
+            the new score
+        """
+        return self.replace_b(len(self.sequence_b), len(self.sequence_b), residues)
+
+    def replace_a(self, start, end, residues):
+        """
+        Replaces the characters sequence_a[start:end] and computes only the rows after row start again.
+
+        Args:
+            start: position of the first replaced character
+            end: position after the last replaced character (start to insert the characters)
+            residues: the new characters (an empty string to delete the characters)
+
+        Returns:
+            the new score
+        """
+        self.__set_sequences(self.sequence_a[:start] + residues + self.sequence_a[end:], self.sequence_b)
+        self.__fill_rows(start + 1)
+        return self.get_score()
+
+    def replace_b(self, start, end, residues):
+        """
+        Replaces the characters sequence_b[start:end] and computes only the columns after column start again.
+
+        Args:
+            start: position of the first replaced character
+            end: position after the last replaced character (start to insert the characters)
+            residues: the new characters (an empty string to delete the characters)
+
+        Returns:
+            the new score
+        """
+        self.__set_sequences(self.sequence_a, self.sequence_b[:start] + residues + self.sequence_b[end:])
+        self.__fill_columns(start + 1)
+        return self.get_score()
+
+    def get_moves(self, max_alignments=None):
+        """
+        Returns the optimal alignments of the current sequences as move strings.
+        They are created lazily and have to be used before the sequences are changed again.
+
+        Args:
+            max_alignments: maximum number of alignments (None for all)
+
+        Returns:
+            iterator over the move strings of the alignments
+        """
+        output_data = AlignmentOutputData()
+        output_data.table_directions = self.__directions
+
+        path = [Vector(len(self.sequence_b), len(self.sequence_a))]
+        paths = itertools.islice(Backtracking(output_data).iterate_all(path, self.__data), max_alignments)
+
+        return (MoveString().from_path(path) for path in paths)
+
+    def get_alignments(self, max_alignments=None):
+        """
+        Returns the optimal alignments of the current sequences.
+        They are created lazily and have to be used before the sequences are changed again.
+
+        Args:
+            max_alignments: maximum number of alignments (None for all)
+
+        Returns:
+            iterator over the alignments [alignment_a, alignment_b]
+        """
+        return (moves.materialize(self.sequence_a, self.sequence_b) for moves in self.get_moves(max_alignments))
+
+    def __set_sequences(self, sequence_a, sequence_b):
+        """
+        Stores the changed sequences.
+
+        Args:
+            sequence_a: first sequence
+            sequence_b: second sequence
+        """
+        self.sequence_a = sequence_a
+        self.sequence_b = sequence_b
+        self.__data = AlignmentInputData().init_needleman(self.__cost_function, self.__gap_cost,
+                                                          sequence_a, sequence_b,
+                                                          ids=[strings.EMPTY, strings.EMPTY])
+
+    def __is_checkpoint(self, index, length):
+        """
+        Returns if the values of a row (or column) are stored.
+
+        Args:
+            index: the row (or column)
+            length: number of rows (or columns)
+        """
+        return index % self.__interval == 0 or index == length - 1
+
+    def __fill_rows(self, first_y):
+        """
+        Computes all rows from a row on and stores their direction bits and checkpoint values.
+
+        Args:
+            first_y: the first row which has to be computed
+        """
+        len_y = len(self.sequence_a) + 1
+        len_x = len(self.sequence_b) + 1
+        first_y = min(first_y, len_y)
+
+        previous = self.__get_row(first_y - 1) if first_y > 0 else None
+
+        del self.__directions[first_y:]
+        self.__rows = {y: row for (y, row) in self.__rows.items() if y < first_y}
+
+        if first_y == 0:
+            self.__columns = {x: [] for x in range(0, len_x) if self.__is_checkpoint(x, len_x)}
+        else:
+            self.__columns = {x: column[:first_y] for (x, column) in self.__columns.items()}
+
+        for y in range(first_y, len_y):
+            directions = bytearray([Backtracking.UP if y > 0 else 0])  # the first column only points upwards
+            previous = self.__compute_segment(y, 1, previous, y * self.__gap_cost, directions)
+            self.__directions.append(directions)
+
+            if self.__is_checkpoint(y, len_y):
+                self.__rows[y] = previous
+
+            for (x, column) in self.__columns.items():
+                column.append(previous[x])
+
+        if len_y - 1 not in self.__rows:  # rows were deleted
+            self.__rows[len_y - 1] = self.__get_row(len_y - 1)
+
+        self.__rows = {y: row for (y, row) in self.__rows.items() if self.__is_checkpoint(y, len_y)}
+
+    def __fill_columns(self, first_x):
+        """
+        Computes all columns from a column on and stores their direction bits and checkpoint values.
+
+        Args:
+            first_x: the first column which has to be computed
+        """
+        len_y = len(self.sequence_a) + 1
+        len_x = len(self.sequence_b) + 1
+        first_x = min(first_x, len_x)
+
+        left = self.__get_column(first_x - 1)
+
+        for directions in self.__directions:
+            del directions[first_x:]
+        self.__columns = {x: column for (x, column) in self.__columns.items() if x < first_x}
+        self.__rows = {y: row[:first_x] for (y, row) in self.__rows.items()}
+
+        columns = {x: [] for x in range(first_x, len_x) if self.__is_checkpoint(x, len_x)}
+        previous = None
+
+        for y in range(0, len_y):
+            previous = self.__compute_segment(y, first_x, previous, left[y], self.__directions[y])
+
+            if y in self.__rows:
+                self.__rows[y].extend(previous[1:])
+
+            for (x, column) in columns.items():
+                column.append(previous[x - first_x + 1])
+
+        self.__columns.update(columns)
+
+        if len_x - 1 not in self.__columns:  # columns were deleted
+            self.__columns[len_x - 1] = self.__get_column(len_x - 1)
+
+        self.__columns = {x: column for (x, column) in self.__columns.items() if self.__is_checkpoint(x, len_x)}
+
+    def __get_row(self, y):
+        """
+        Returns the values of a row, which are computed from the checkpoint row before it if they are not stored.
+
+        Args:
+            y: the row
+        """
+        if y in self.__rows:
+            return self.__rows[y]
+
+        checkpoint = y - y % self.__interval
+        row = self.__rows[checkpoint]
+
+        for y_x in range(checkpoint + 1, y + 1):
+            row = self.__compute_segment(y_x, 1, row, y_x * self.__gap_cost)
+
+        return row
+
+    def __get_column(self, x):
+        """
+        Returns the values of a column, which are computed from the checkpoint column before it if they are not stored.
+
+        Args:
+            x: the column
+        """
+        if x in self.__columns:
+            return self.__columns[x]
+
+        checkpoint = x - x % self.__interval
+        left = self.__columns[checkpoint]
+        column = []
+        segment = None
+
+        for y in range(0, len(left)):
+            segment = self.__compute_segment(y, checkpoint + 1, segment, left[y], length=x - checkpoint)
+            column.append(segment[-1])
+
+        return column
+
+    def __compute_segment(self, y, first_x, previous, left, directions=None, length=None):
+        """
+        Computes the values of a row from a column to the last column (or for a number of columns).
+
+        Args:
+            y: the row
+            first_x: the first computed column
+            previous: values of the row before from column first_x - 1 on (None for the first row)
+            left: value of the row in column first_x - 1
+            directions: if it is set, the direction bits of the computed cells are appended to it
+            length: number of computed columns (None for all columns up to the last one)
+
+        Returns:
+            the values of the row from column first_x - 1 on
+        """
+        gap_cost = self.__gap_cost
+        end_x = len(self.sequence_b) + 1 if length is None else first_x + length
+
+        if y == 0:  # the first row only points to the left
+            if directions is not None:
+                directions.extend([Backtracking.LEFT] * (end_x - first_x))
+            return [x * gap_cost for x in range(first_x - 1, end_x)]
+
+        scores_a = self.__cost_function.get_scores()[self.__data.codes_a[y - 1]]
+        codes_b = self.__data.codes_b
+        row = [left]
+        value = left
+
+        for x in range(first_x, end_x):
+            insertion = value + gap_cost
+            matching = previous[x - first_x] + scores_a[codes_b[x - 1]]
+            deletion = previous[x - first_x + 1] + gap_cost
+            value = max(insertion, matching, deletion)
+            row.append(value)
+
+            if directions is not None:
+                directions.append((Backtracking.DIAGONAL if matching == value else 0)
+                                  | (Backtracking.LEFT if insertion == value else 0)
+                                  | (Backtracking.UP if deletion == value else 0))
+
+        return row
@@ -0,0 +1,266 @@
+from system import messages
+
+import system.string_symbols as strings
+
+class MyersMiller:
+    """
+    Computes one optimal, global alignment with affine gap costs in linear space.
+    It is the affine version of Hirschberg's algorithm (Myers and Miller, 1988).
+    The computation uses costs instead of scores: a substitution costs -score
+    and a gap of length k costs g + h * k with g = -gap_alpha and h = -gap_beta.
+
+    Besides the row with the costs of the alignments (CC and RR)
+    one row with the costs of the alignments ending with a deletion (DD and SS) is kept.
+    A deletion gap may cross the middle row. Then its opening costs are counted only once
+    and the gap state is passed to both halves with the costs tb and te,
+    which are the opening costs of a deletion gap at the beginning and at the end of a sub-problem.
+    """
+
+    global _data
+    global _g
+    global _h
+
+    def align(self, input_data):
+        """
+        Returns one optimal alignment and its score.
+
+        Args:
+            input_data: the input for which you create the alignment
+
+        Returns:
+            tuple of (score, [alignment_a, alignment_b])
+        """
+        if input_data.gap_alpha > 0:
+            raise ValueError(messages.POSITIVE_GAP_ALPHA)
+
+        self._data = input_data
+        self._g = -input_data.gap_alpha
+        self._h = -input_data.gap_beta
+
+        alignment_a, alignment_b = self.__diff(0, len(input_data.sequence_a), 0, len(input_data.sequence_b),
+                                               self._g, self._g)
+
+        return self.__score(alignment_a, alignment_b), [alignment_a, alignment_b]
+
+    def __diff(self, start_a, end_a, start_b, end_b, tb, te):
+        """
+        Aligns the sub-sequences sequence_a[start_a:end_a] and sequence_b[start_b:end_b].
+
+        Args:
+            start_a: first position in sequence a
+            end_a: position after the last position in sequence a
+            start_b: first position in sequence b
+            end_b: position after the last position in sequence b
+            tb: opening costs of a deletion gap at the beginning (0 if a gap from the sub-problem before is continued)
+            te: opening costs of a deletion gap at the end (0 if a gap from the sub-problem after is continued)
+        """
+        sequence_a = self._data.sequence_a
+        sequence_b = self._data.sequence_b
+        length_a = end_a - start_a
+        length_b = end_b - start_b
+
+        if length_b == 0:
+            return sequence_a[start_a:end_a], strings.GAP * length_a
+
+        if length_a == 0:
+            return strings.GAP * length_b, sequence_b[start_b:end_b]
+
+        if length_a == 1:
+            return self.__diff_one(start_a, start_b, end_b, tb, te)
+
+        middle_a = length_a // 2
+        cc, dd = self.__forward(start_a, start_a + middle_a, start_b, end_b, tb)
+        rr, ss = self.__backward(start_a + middle_a, end_a, start_b, end_b, te)
+
+        # the optimal path either crosses the middle row in a cell (type 1) or with a deletion gap (type 2)
+        middle_cost = cc[0] + rr[0]
+        middle_b = 0
+        crossing_gap = False
+
+        for x in range(length_b, -1, -1):
+            cost = cc[x] + rr[x]
+            if cost < middle_cost:
+                middle_cost = cost
+                middle_b = x
+                crossing_gap = False
+
+            cost = dd[x] + ss[x] - self._g
+            if cost < middle_cost:
+                middle_cost = cost
+                middle_b = x
+                crossing_gap = True
+
+        if crossing_gap:
+            upper_a, upper_b = self.__diff(start_a, start_a + middle_a - 1, start_b, start_b + middle_b, tb, 0)
+            lower_a, lower_b = self.__diff(start_a + middle_a + 1, end_a, start_b + middle_b, end_b, 0, te)
+            gap_a = sequence_a[start_a + middle_a - 1:start_a + middle_a + 1]
+
+            return upper_a + gap_a + lower_a, upper_b + strings.GAP * 2 + lower_b
+
+        upper_a, upper_b = self.__diff(start_a, start_a + middle_a, start_b, start_b + middle_b, tb, self._g)
+        lower_a, lower_b = self.__diff(start_a + middle_a, end_a, start_b + middle_b, end_b, self._g, te)
+
+        return upper_a + lower_a, upper_b + lower_b
+
+    def __diff_one(self, position_a, start_b, end_b, tb, te):
+        """
+        Aligns a single character of sequence a with the sub-sequence sequence_b[start_b:end_b].
+
+        Args:
+            position_a: position of the character in sequence a
+            start_b: first position in sequence b
+            end_b: position after the last position in sequence b
+            tb: opening costs of a deletion gap at the beginning
+            te: opening costs of a deletion gap at the end
+        """
+        char_a = self._data.sequence_a[position_a]
+        sequence_b = self._data.sequence_b[start_b:end_b]
+        length_b = len(sequence_b)
+
+        # character a aligned with a gap
+        best_cost = min(tb, te) + self._h + self.__gap(length_b)
+        best_position = -1
+
+        for x in range(0, length_b):
+            cost = self.__gap(x) - self._data.cost_function.get_value(char_a, sequence_b[x]) \
+                   + self.__gap(length_b - x - 1)
+            if cost < best_cost:
+                best_cost = cost
+                best_position = x
+
+        if best_position == -1:
+            if tb <= te:  # the deletion continues the gap before
+                return char_a + strings.GAP * length_b, strings.GAP + sequence_b
+            return strings.GAP * length_b + char_a, sequence_b + strings.GAP
+
+        alignment_a = strings.GAP * best_position + char_a + strings.GAP * (length_b - best_position - 1)
+        return alignment_a, sequence_b
+
+    def __forward(self, start_a, end_a, start_b, end_b, tb):
+        """
+        Returns the costs of the last row of the alignment of two sub-sequences
+        and the costs of the alignments ending with a deletion in the last row.
+
+        Args:
+            start_a: first position in sequence a
+            end_a: position after the last position in sequence a
+            start_b: first position in sequence b
+            end_b: position after the last position in sequence b
+            tb: opening costs of a deletion gap at the beginning
+        """
+        codes_a = self._data.codes_a
+        codes_b = self._data.codes_b
+        scores = self._data.cost_function.get_scores()
+        g = self._g
+        h = self._h
+        length_b = end_b - start_b
+
+        cc = [0] * (length_b + 1)
+        dd = [0] * (length_b + 1)
+
+        t = g
+        for x in range(1, length_b + 1):
+            t += h
+            cc[x] = t
+            dd[x] = t + g
+
+        t = tb
+        for y in range(start_a, end_a):
+            scores_a = scores[codes_a[y]]
+            s = cc[0]
+            t += h
+            c = t
+            cc[0] = c
+            e = t + g
+
+            for x in range(1, length_b + 1):
+                e = min(e, c + g) + h
+                d = min(dd[x], cc[x] + g) + h
+                c = min(d, e, s - scores_a[codes_b[start_b + x - 1]])
+                s = cc[x]
+                cc[x] = c
+                dd[x] = d
+
+        dd[0] = cc[0]
+        return cc, dd
+
+    def __backward(self, start_a, end_a, start_b, end_b, te):
+        """
+        Returns the costs of the first row of the alignment of two sub-sequences computed from the end
+        and the costs of the alignments starting with a deletion in the first row.
+
+        Args:
+            start_a: first position in sequence a
+            end_a: position after the last position in sequence a
+            start_b: first position in sequence b
+            end_b: position after the last position in sequence b
+            te: opening costs of a deletion gap at the end
+        """
+        codes_a = self._data.codes_a
+        codes_b = self._data.codes_b
+        scores = self._data.cost_function.get_scores()
+        g = self._g
+        h = self._h
+        length_b = end_b - start_b
+
+        rr = [0] * (length_b + 1)
+        ss = [0] * (length_b + 1)
+
+        t = g
+        for x in range(length_b - 1, -1, -1):
+            t += h
+            rr[x] = t
+            ss[x] = t + g
+
+        t = te
+        for y in range(end_a - 1, start_a - 1, -1):
+            scores_a = scores[codes_a[y]]
+            s = rr[length_b]
+            t += h
+            c = t
+            rr[length_b] = c
+            e = t + g
+
+            for x in range(length_b - 1, -1, -1):
+                e = min(e, c + g) + h
+                d = min(ss[x], rr[x] + g) + h
+                c = min(d, e, s - scores_a[codes_b[start_b + x]])
+                s = rr[x]
+                rr[x] = c
+                ss[x] = d
+
+        ss[length_b] = rr[length_b]
+        return rr, ss
+
+    def __gap(self, length):
+        """
+        Returns the costs of a gap.
+
+        Args:
+            length: length of the gap
+        """
+        if length == 0:
+            return 0
+        return self._g + self._h * length
+
+    def __score(self, alignment_a, alignment_b):
+        """
+        Returns the affine score of an alignment.
+
+        Args:
+            alignment_a: first row of the alignment
+            alignment_b: second row of the alignment
+        """
+        score = 0
+
+        for i in range(0, len(alignment_a)):
+            if alignment_a[i] == strings.GAP:
+                extended = i > 0 and alignment_a[i - 1] == strings.GAP
+                score += self._data.gap_beta if extended else self._data.gap_opening
+            elif alignment_b[i] == strings.GAP:
+                extended = i > 0 and alignment_b[i - 1] == strings.GAP
+                score += self._data.gap_beta if extended else self._data.gap_opening
+            else:
+                score += self._data.cost_function.get_value(alignment_a[i], alignment_b[i])
+
+        return score
@@ -0,0 +1,95 @@
+from algorithms.alignment.vector_engine import VectorEngine, np
+from algorithms.backtracking.multi_table_backtracking import MultiTableBacktracking
+
+class RowEngine(VectorEngine):
+    """
+    Fills the Gotoh matrices row by row.
+    The vertical gaps and the diagonal only depend on the row before.
+    The horizontal gaps depend on the current row and are resolved with a prefix maximum:
+    Q[x] = max_{k < x} (D[k] + opening + beta * (x - 1 - k)) = beta * x + max_{k < x} (D[k] + opening - beta * (k + 1))
+    The direction bits of a row are computed as soon as all three matrices of the row are known.
+    """
+
+    def compute_gotoh(self, input_data):
+        """
+        Computes the Gotoh matrices.
+
+        Args:
+            input_data: the input for which you create the matrices
+
+        Returns:
+            tuple of two-dimensional arrays (main matrix, horizontal gaps matrix, vertical gaps matrix,
+            direction bits of the cells)
+        """
+        tbl_len_y = len(input_data.sequence_a) + 1
+        tbl_len_x = len(input_data.sequence_b) + 1
+        gap_beta = input_data.gap_beta
+        gap_opening = input_data.gap_opening
+
+        table_values = np.zeros((tbl_len_y, tbl_len_x), dtype=np.int64)
+        table_values[1:, 0] = input_data.gap_alpha + gap_beta * np.arange(1, tbl_len_y)
+        table_values[0, 1:] = input_data.gap_alpha + gap_beta * np.arange(1, tbl_len_x)
+
+        table_horizontal_gaps = np.full((tbl_len_y, tbl_len_x), self.NEGATIVE_INFINITY, dtype=np.int64)
+        table_vertical_gaps = np.full((tbl_len_y, tbl_len_x), self.NEGATIVE_INFINITY, dtype=np.int64)
+        table_horizontal_gaps[0][0] = 0
+        table_vertical_gaps[0][0] = 0
+        directions = np.zeros((tbl_len_y, tbl_len_x), dtype=np.uint8)
+
+        if tbl_len_x == 1:
+            return table_values, table_horizontal_gaps, table_vertical_gaps, directions
+
+        codes_a, codes_b, scores = self._encode(input_data)
+        extensions = gap_beta * np.arange(1, tbl_len_x)
+
+        for y in range(1, tbl_len_y):
+            table_vertical_gaps[y, 1:] = np.maximum(table_vertical_gaps[y - 1, 1:] + gap_beta,
+                                                    table_values[y - 1, 1:] + gap_opening)
+
+            diagonal = table_values[y - 1, :-1] + scores[codes_a[y - 1], codes_b]
+            without_horizontal = np.maximum(diagonal, table_vertical_gaps[y, 1:])
+
+            sources = without_horizontal
+            while True:
+                openings = np.concatenate(([table_values[y][0]], sources[:-1])) + gap_opening - extensions
+                horizontal_gaps = extensions + np.maximum.accumulate(openings)
+                values = np.maximum(without_horizontal, horizontal_gaps)
+
+                # with a non-positive gap_alpha, opening a gap after a horizontal gap is never better than
+                # extending it, so the values without horizontal gaps are already sufficient as sources
+                if input_data.gap_alpha <= 0 or np.array_equal(values, sources):
+                    break
+                sources = values
+
+            table_horizontal_gaps[y, 1:] = horizontal_gaps
+            table_values[y, 1:] = values
+            directions[y, 1:] = self.__get_directions(table_values, table_horizontal_gaps, table_vertical_gaps,
+                                                      diagonal, y, gap_beta, gap_opening)
+
+        return table_values, table_horizontal_gaps, table_vertical_gaps, directions
+
+    def __get_directions(self, table_values, table_horizontal_gaps, table_vertical_gaps, diagonal, y, gap_beta,
+                         gap_opening):
+        """
+        Returns the direction bits of the cells of a row without the first cell.
+
+        Args:
+            table_values: main matrix
+            table_horizontal_gaps: horizontal gaps matrix
+            table_vertical_gaps: vertical gaps matrix
+            diagonal: values of the row which are reached with a match or mismatch
+            y: the row
+            gap_beta: costs to extend a gap
+            gap_opening: costs to open a gap of length one
+        """
+        values = table_values[y, 1:]
+        horizontal_gaps = table_horizontal_gaps[y, 1:]
+        vertical_gaps = table_vertical_gaps[y, 1:]
+
+        return (diagonal == values) * MultiTableBacktracking.MAIN_DIAGONAL \
+            | (vertical_gaps == values) * MultiTableBacktracking.MAIN_TO_P \
+            | (horizontal_gaps == values) * MultiTableBacktracking.MAIN_TO_Q \
+            | (vertical_gaps == table_vertical_gaps[y - 1, 1:] + gap_beta) * MultiTableBacktracking.P_FROM_P \
+            | (vertical_gaps == table_values[y - 1, 1:] + gap_opening) * MultiTableBacktracking.P_FROM_MAIN \
+            | (horizontal_gaps == table_horizontal_gaps[y, :-1] + gap_beta) * MultiTableBacktracking.Q_FROM_Q \
+            | (horizontal_gaps == table_values[y, :-1] + gap_opening) * MultiTableBacktracking.Q_FROM_MAIN
@@ -0,0 +1,195 @@
+from algorithms.alignment.vector_engine import VectorEngine, np
+
+class StripedEngine(VectorEngine):
+    """
+    Computes the Gotoh scores of one query against many sequences with a striped query profile (Farrar, 2007).
+    The query positions of a column are distributed over LANES lanes:
+    lane l stores the positions l * segment_length to (l + 1) * segment_length - 1.
+    The vertical gaps inside of a lane are resolved with a prefix maximum
+    and the gaps which run over the border of a lane are added in a lazy correction loop.
+    With a non-positive gap_alpha the loop is left as soon as each gap which comes into a lane
+    was already added or is not better than D[y] + gap_alpha at the first position y of the lane,
+    because then it can not improve any value or any gap of the lane (most columns need only one pass).
+
+    The query profile stores the score of each query position for each character, so a column of
+    substitution scores is a single lookup. The sequences are sorted by length and up to BATCH_SIZE of them
+    are computed together, one column after another, so the costs of a NumPy call are shared by all of them.
+
+    The columns are computed with int16 values first. As long as all scores stay in the middle half
+    of the value range, the sums with the costs can not overflow and the small negative infinity stays below them.
+    If a score of a pair leaves it, the pair is computed again with the next larger integer type.
+    """
+
+    BATCH_SIZE = 64
+    LANES = 8  # 8 int16 values fit into a 128-bit register
+
+    def __init__(self):
+        """
+        Checks if NumPy is available and creates the integer types which are tried one after another.
+        """
+        super().__init__()
+        self.__types = [np.int16, np.int32, np.int64]
+
+    def compute_gotoh_scores(self, cost_function, gap_alpha, gap_beta, query, sequences):
+        """
+        Computes the scores of the optimal, affine, global alignments of a query with each of some sequences.
+
+        Args:
+            cost_function: initialized evaluation function used to evaluate alignments
+            gap_alpha: costs to open a gap
+            gap_beta: costs to extend a gap
+            query: the sequence which is aligned with all other sequences (first sequence of each alignment)
+            sequences: the sequences the query is aligned with (second sequence of each alignment)
+
+        Returns:
+            list with the optimal score for each of the sequences
+        """
+        scores = [0] * len(sequences)
+        remaining = []
+
+        for i in range(0, len(sequences)):
+            length = len(query) + len(sequences[i])
+
+            if len(query) == 0 or len(sequences[i]) == 0:
+                scores[i] = gap_alpha + gap_beta * length if length > 0 else 0
+            else:
+                remaining.append(i)
+
+        if len(remaining) == 0:
+            return scores
+
+        alphabet = sorted(set().union(*[sequences[i] for i in remaining]))
+        codes = {char: code for code, char in enumerate(alphabet)}
+
+        # the last row of the profile belongs to the positions after the end of a shorter sequence
+        profile = np.zeros((len(alphabet) + 1, len(query)), dtype=np.int64)
+        for char in alphabet:
+            profile[codes[char]] = [cost_function.get_value(char_a, char) for char_a in query]
+
+        remaining.sort(key=lambda i: len(sequences[i]))
+
+        for integer_type in self.__types:
+            saturated = []
+
+            for start in range(0, len(remaining), self.BATCH_SIZE):
+                batch = remaining[start:start + self.BATCH_SIZE]
+                codes_batch = np.full((len(batch), len(sequences[batch[-1]])), len(alphabet), dtype=np.intp)
+
+                for k in range(0, len(batch)):
+                    codes_batch[k, :len(sequences[batch[k]])] = [codes[char] for char in sequences[batch[k]]]
+
+                batch_scores = self.__compute_scores(profile, codes_batch, [len(sequences[i]) for i in batch],
+                                                     gap_alpha, gap_beta, integer_type)
+
+                for k in range(0, len(batch)):
+                    if batch_scores[k] is None:
+                        saturated.append(batch[k])
+                    else:
+                        scores[batch[k]] = batch_scores[k]
+
+            remaining = saturated
+
+        return scores
+
+    def __compute_scores(self, profile, codes_batch, lengths, gap_alpha, gap_beta, integer_type):
+        """
+        Computes the optimal scores of the alignments of the query with a batch of sequences column by column.
+
+        Args:
+            profile: two-dimensional array with the score of each query position for each character code
+            codes_batch: two-dimensional array with the character codes of the sequences
+            lengths: lengths of the sequences
+            gap_alpha: costs to open a gap
+            gap_beta: costs to extend a gap
+            integer_type: NumPy integer type of the values
+
+        Returns:
+            list with the optimal score for each sequence or None if a score left the safe range of the integer type
+        """
+        batch_size = len(lengths)
+        query_length = profile.shape[1]
+        gap_opening = gap_alpha + gap_beta
+        segment_length = -(-query_length // self.LANES)
+        padded_length = segment_length * self.LANES
+        shape = (batch_size, self.LANES, segment_length)
+
+        quarter = (int(np.iinfo(integer_type).max) + 1) // 4
+        lowest = -2 * quarter
+        highest = 2 * quarter
+        negative_infinity = -3 * quarter
+
+        scores = [None] * batch_size
+
+        # the costs themselves could overflow or the first column is already outside of the safe range
+        if abs(gap_beta) * (segment_length + 1) + abs(gap_opening) + int(np.abs(profile).max()) >= quarter \
+                or gap_alpha + gap_beta * padded_length < lowest:
+            return scores
+
+        striped_profile = np.zeros((profile.shape[0], padded_length), dtype=integer_type)
+        striped_profile[:, :query_length] = profile
+        striped_profile = striped_profile.reshape((profile.shape[0], self.LANES, segment_length))
+
+        # lanes after each other give the positions in the order of the query
+        values = np.empty(shape, dtype=integer_type)
+        values[:] = (gap_alpha + gap_beta * np.arange(1, padded_length + 1)).reshape(shape[1:])  # column 0
+        horizontal_gaps = np.full(shape, negative_infinity, dtype=integer_type)
+        openings = (gap_opening - gap_beta * np.arange(1, segment_length + 1)).astype(integer_type)
+        extensions = (gap_beta * np.arange(0, segment_length)).astype(integer_type)
+
+        diagonal = np.empty(shape, dtype=integer_type)
+        flat_diagonal = diagonal.reshape((batch_size, padded_length))
+        shifted = np.empty(shape, dtype=integer_type)
+        shifted[:, :, 0] = negative_infinity
+
+        failed = np.zeros(batch_size, dtype=bool)
+        ends = np.array(lengths)
+        position = query_length - 1
+        top = 0
+
+        for x in range(1, len(codes_batch[0]) + 1):
+            new_top = gap_alpha + gap_beta * x
+            if new_top < lowest:
+                break
+
+            flat_diagonal[:, 1:] = values.reshape((batch_size, padded_length))[:, :-1]
+            flat_diagonal[:, 0] = top
+            diagonal += striped_profile[codes_batch[:, x - 1]]
+
+            horizontal_gaps = np.maximum(horizontal_gaps + gap_beta, values + gap_opening)
+            without_vertical = np.maximum(diagonal, horizontal_gaps)
+
+            carries = np.full((batch_size, self.LANES), negative_infinity, dtype=integer_type)
+            carries[:, 0] = new_top + gap_opening
+            values = without_vertical
+
+            while True:  # lazy correction of the vertical gaps which run over lane borders
+                shifted[:, :, 1:] = np.maximum.accumulate(values + openings, axis=2)[:, :, :-1]
+                vertical_gaps = np.maximum(shifted, carries[:, :, None]) + extensions
+                new_values = np.maximum(without_vertical, vertical_gaps)
+
+                new_carries = carries.copy()
+                new_carries[:, 1:] = np.maximum(vertical_gaps[:, :-1, -1] + gap_beta,
+                                                new_values[:, :-1, -1] + gap_opening)
+
+                if gap_alpha <= 0:
+                    stable = np.all((new_carries[:, 1:] == carries[:, 1:])
+                                    | (new_carries[:, 1:] <= new_values[:, 1:, 0] + gap_alpha))
+                else:  # opening a gap after a vertical gap can be better than extending it
+                    stable = np.array_equal(new_carries, carries) and np.array_equal(new_values, values)
+
+                values = new_values
+                carries = new_carries
+
+                if stable:
+                    break
+
+            # sequences which already ended can leave the range without any effect
+            failed |= (ends >= x) & ((values.min(axis=(1, 2)) < lowest) | (values.max(axis=(1, 2)) >= highest))
+
+            for k in np.flatnonzero(ends == x):
+                if not failed[k]:
+                    scores[k] = int(values[k, position // segment_length, position % segment_length])
+
+            top = new_top
+
+        return scores
@@ -0,0 +1,326 @@
+from algorithms.alignment.vector_engine import VectorEngine, np
+from algorithms.backtracking.backtracking import Backtracking
+from algorithms.backtracking.multi_table_backtracking import MultiTableBacktracking
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import os
+
+class TiledEngine(VectorEngine):
+    """
+    Fills the alignment matrices tile by tile in parallel processes.
+    The matrix is split into tiles of tile_size x tile_size cells. A tile only depends on the last row
+    of the tile above it and on the last column of the tile on its left, so all tiles
+    on an anti-diagonal of tiles are computed at the same time.
+
+    The direction bits of all cells and the rows and columns on the borders of the tiles
+    are stored in shared memory, the other values of a tile only exist while it is computed.
+    Inside of a tile the rows are computed with vector operations and the gaps
+    which run along a row with a prefix maximum (see RowEngine).
+    The values and direction bits are the same as the ones of the other engines.
+    """
+
+    TILE_SIZE = 1024
+
+    global _tile_size
+    global _workers
+
+    def __init__(self, workers=None, tile_size=TILE_SIZE):
+        """
+        Checks if NumPy is available and stores how the matrix is split.
+
+        Args:
+            workers: number of processes (None for the number of processors)
+            tile_size: number of rows and columns of a tile
+        """
+        super().__init__()
+        self._workers = workers if workers is not None else os.cpu_count()
+        self._tile_size = tile_size
+
+    def compute_needleman(self, input_data):
+        """
+        Computes the direction bits of the Needleman-Wunsch matrix.
+
+        Args:
+            input_data: the input for which you create the matrix
+
+        Returns:
+            tuple (optimal score, two-dimensional array with the direction bits of the cells)
+        """
+        tbl_len_y = len(input_data.sequence_a) + 1
+        tbl_len_x = len(input_data.sequence_b) + 1
+
+        def initialize(arrays, row_positions, column_positions):
+            directions, rows, columns = arrays
+            directions[1:, 0] = Backtracking.UP
+            directions[0, 1:] = Backtracking.LEFT
+            rows[:, :] = np.arange(tbl_len_x) * input_data.gap_cost
+            rows[:, 0] = row_positions * input_data.gap_cost
+            columns[:, :] = np.arange(tbl_len_y) * input_data.gap_cost
+            columns[:, 0] = column_positions * input_data.gap_cost
+
+        return self.__compute(input_data, False, initialize)
+
+    def compute_gotoh(self, input_data):
+        """
+        Computes the direction bits of the Gotoh matrices.
+
+        Args:
+            input_data: the input for which you create the matrices
+
+        Returns:
+            tuple (optimal score, two-dimensional array with the direction bits of the cells)
+        """
+        tbl_len_y = len(input_data.sequence_a) + 1
+        tbl_len_x = len(input_data.sequence_b) + 1
+
+        def border(positions):
+            return np.where(positions > 0, input_data.gap_alpha + input_data.gap_beta * positions, 0)
+
+        def initialize(arrays, row_positions, column_positions):
+            directions, rows, columns, row_gaps, column_gaps = arrays
+            rows[:, :] = border(np.arange(tbl_len_x))
+            rows[:, 0] = border(row_positions)
+            columns[:, :] = border(np.arange(tbl_len_y))
+            columns[:, 0] = border(column_positions)
+            row_gaps[:, :] = self.NEGATIVE_INFINITY  # no vertical gap ends in the first row
+            column_gaps[:, :] = self.NEGATIVE_INFINITY  # no horizontal gap ends in the first column
+
+        return self.__compute(input_data, True, initialize)
+
+    def fill_tile(self, layout, tile_y, tile_x, codes_a, codes_b):
+        """
+        Computes one tile. It is called in the worker processes,
+        which find the direction bits and the borders of the tiles in shared memory.
+
+        Args:
+            layout: dictionary with the names and shapes of the shared arrays and the parameters of the alignment
+            tile_y: row of the tile
+            tile_x: column of the tile
+            codes_a: codes of the characters of the first sequence in the rows of the tile
+            codes_b: codes of the characters of the second sequence in the columns of the tile
+        """
+        memories = [shared_memory.SharedMemory(name=name) for name in layout["names"]]
+
+        try:
+            arrays = [np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+                      for (memory, (shape, dtype)) in zip(memories, layout["shapes"])]
+
+            if layout["gotoh"]:
+                self.__fill_gotoh_tile(arrays, layout, tile_y, tile_x, codes_a, codes_b)
+            else:
+                self.__fill_needleman_tile(arrays, layout, tile_y, tile_x, codes_a, codes_b)
+
+            del arrays  # the shared memory can only be closed without views on it
+        finally:
+            for memory in memories:
+                memory.close()
+
+    def __compute(self, input_data, gotoh, initialize):
+        """
+        Creates the shared arrays and computes the tiles anti-diagonal by anti-diagonal.
+
+        Args:
+            input_data: the input for which you create the matrices
+            gotoh: if True, the Gotoh matrices are computed, otherwise the Needleman-Wunsch matrix
+            initialize: function which sets the first row and column of the shared arrays
+
+        Returns:
+            tuple (optimal score, two-dimensional array with the direction bits of the cells)
+        """
+        tbl_len_y = len(input_data.sequence_a) + 1
+        tbl_len_x = len(input_data.sequence_b) + 1
+        tiles_y = -(-(tbl_len_y - 1) // self._tile_size)
+        tiles_x = -(-(tbl_len_x - 1) // self._tile_size)
+
+        # border i of the rows is the last row of the tiles in tile row i - 1 (the first row for i = 0)
+        row_positions = np.minimum(np.arange(tiles_y + 1) * self._tile_size, tbl_len_y - 1)
+        column_positions = np.minimum(np.arange(tiles_x + 1) * self._tile_size, tbl_len_x - 1)
+
+        shapes = [((tbl_len_y, tbl_len_x), np.uint8),
+                  ((tiles_y + 1, tbl_len_x), np.int64),
+                  ((tiles_x + 1, tbl_len_y), np.int64)]
+        if gotoh:
+            shapes += [((tiles_y + 1, tbl_len_x), np.int64), ((tiles_x + 1, tbl_len_y), np.int64)]
+
+        memories = [shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+                    for (shape, dtype) in shapes]
+
+        try:
+            arrays = [np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+                      for (memory, (shape, dtype)) in zip(memories, shapes)]
+            arrays[0][:, :] = 0
+            initialize(arrays, row_positions, column_positions)
+
+            codes_a, codes_b, scores = self._encode(input_data)
+            layout = {"names": [memory.name for memory in memories],
+                      "shapes": shapes,
+                      "gotoh": gotoh,
+                      "scores": scores,
+                      "gap_cost": input_data.gap_cost if not gotoh else None,
+                      "gap_alpha": input_data.gap_alpha if gotoh else None,
+                      "gap_beta": input_data.gap_beta if gotoh else None}
+
+            # the tiles of an anti-diagonal only depend on the tiles of the anti-diagonals before
+            tiles = [[(tile_y, diagonal - tile_y) for tile_y in range(0, tiles_y) if 0 <= diagonal - tile_y < tiles_x]
+                     for diagonal in range(0, tiles_y + tiles_x - 1)]
+
+            def arguments(tile_y, tile_x):
+                start_y = tile_y * self._tile_size
+                start_x = tile_x * self._tile_size
+                return (layout, tile_y, tile_x,
+                        codes_a[start_y:start_y + self._tile_size], codes_b[start_x:start_x + self._tile_size])
+
+            if self._workers <= 1 or tiles_y * tiles_x <= 1:
+                for diagonal_tiles in tiles:
+                    for (tile_y, tile_x) in diagonal_tiles:
+                        self.fill_tile(*arguments(tile_y, tile_x))
+            else:
+                with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                    for diagonal_tiles in tiles:
+                        futures = [executor.submit(self.fill_tile, *arguments(tile_y, tile_x))
+                                   for (tile_y, tile_x) in diagonal_tiles]
+
+                        for future in futures:
+                            future.result()
+
+            if tiles_x == 0:
+                score = int(arrays[2][0, tbl_len_y - 1])
+            else:
+                score = int(arrays[1][tiles_y, tbl_len_x - 1])
+
+            directions = np.array(arrays[0])
+            del arrays
+        finally:
+            for memory in memories:
+                memory.close()
+                memory.unlink()
+
+        return score, directions
+
+    def __get_tile(self, arrays, tile_y, tile_x):
+        """
+        Returns the rows and columns of a tile.
+
+        Args:
+            arrays: the shared arrays
+            tile_y: row of the tile
+            tile_x: column of the tile
+
+        Returns:
+            tuple (first row, row after the last row, first column, column after the last column)
+        """
+        start_y = tile_y * self._tile_size + 1
+        start_x = tile_x * self._tile_size + 1
+        return (start_y, min(start_y + self._tile_size, arrays[0].shape[0]),
+                start_x, min(start_x + self._tile_size, arrays[0].shape[1]))
+
+    def __fill_needleman_tile(self, arrays, layout, tile_y, tile_x, codes_a, codes_b):
+        """
+        Computes the Needleman-Wunsch values and direction bits of a tile row by row.
+        A value of a row is V[x] = max(C[x], V[x - 1] + gap_cost) with the candidates C from the row before,
+        so V[x] = gap_cost * x + max(V[-1] + gap_cost, max_{k <= x} (C[k] - gap_cost * k)).
+
+        Args:
+            arrays: the shared arrays (direction bits, border rows, border columns)
+            layout: dictionary with the parameters of the alignment
+            tile_y: row of the tile
+            tile_x: column of the tile
+            codes_a: codes of the characters of the first sequence in the rows of the tile
+            codes_b: codes of the characters of the second sequence in the columns of the tile
+        """
+        directions, rows, columns = arrays
+        start_y, end_y, start_x, end_x = self.__get_tile(arrays, tile_y, tile_x)
+        scores = layout["scores"]
+        gap_cost = layout["gap_cost"]
+
+        extensions = gap_cost * np.arange(0, end_x - start_x)
+        previous = rows[tile_y, start_x - 1:end_x].copy()  # with the cell of the column before the tile
+        left = columns[tile_x, start_y:end_y]
+        right = np.empty(end_y - start_y, dtype=np.int64)
+
+        for y in range(start_y, end_y):
+            left_value = left[y - start_y]
+            matching = previous[:-1] + scores[codes_a[y - start_y], codes_b]
+            deletion = previous[1:] + gap_cost
+            values = np.maximum(np.maximum.accumulate(np.maximum(matching, deletion) - extensions),
+                                left_value + gap_cost) + extensions
+            insertion = np.concatenate(([left_value], values[:-1])) + gap_cost
+
+            directions[y, start_x:end_x] = (matching == values) * Backtracking.DIAGONAL \
+                | (insertion == values) * Backtracking.LEFT \
+                | (deletion == values) * Backtracking.UP
+
+            right[y - start_y] = values[-1]
+            previous = np.concatenate(([left_value], values))
+
+        rows[tile_y + 1, start_x:end_x] = previous[1:]
+        columns[tile_x + 1, start_y:end_y] = right
+
+    def __fill_gotoh_tile(self, arrays, layout, tile_y, tile_x, codes_a, codes_b):
+        """
+        Computes the Gotoh values and direction bits of a tile row by row like the RowEngine,
+        but the horizontal gaps can also continue a gap of the tile on the left.
+
+        Args:
+            arrays: the shared arrays (direction bits, border rows, border columns,
+                vertical gaps of the border rows, horizontal gaps of the border columns)
+            layout: dictionary with the parameters of the alignment
+            tile_y: row of the tile
+            tile_x: column of the tile
+            codes_a: codes of the characters of the first sequence in the rows of the tile
+            codes_b: codes of the characters of the second sequence in the columns of the tile
+        """
+        directions, rows, columns, row_gaps, column_gaps = arrays
+        start_y, end_y, start_x, end_x = self.__get_tile(arrays, tile_y, tile_x)
+        scores = layout["scores"]
+        gap_alpha = layout["gap_alpha"]
+        gap_beta = layout["gap_beta"]
+        gap_opening = gap_alpha + gap_beta
+
+        extensions = gap_beta * np.arange(1, end_x - start_x + 1)
+        previous = rows[tile_y, start_x - 1:end_x].copy()
+        previous_vertical_gaps = row_gaps[tile_y, start_x:end_x].copy()
+        left = columns[tile_x, start_y:end_y]
+        left_horizontal_gaps = column_gaps[tile_x, start_y:end_y]
+        right = np.empty(end_y - start_y, dtype=np.int64)
+        right_horizontal_gaps = np.empty(end_y - start_y, dtype=np.int64)
+
+        for y in range(start_y, end_y):
+            left_value = left[y - start_y]
+            left_horizontal_gap = left_horizontal_gaps[y - start_y]
+
+            vertical_gaps = np.maximum(previous_vertical_gaps + gap_beta, previous[1:] + gap_opening)
+            diagonal = previous[:-1] + scores[codes_a[y - start_y], codes_b]
+            without_horizontal = np.maximum(diagonal, vertical_gaps)
+
+            sources = without_horizontal
+            while True:
+                openings = np.concatenate(([left_value], sources[:-1])) + gap_opening - extensions
+                horizontal_gaps = extensions + np.maximum(np.maximum.accumulate(openings), left_horizontal_gap)
+                values = np.maximum(without_horizontal, horizontal_gaps)
+
+                if gap_alpha <= 0 or np.array_equal(values, sources):
+                    break
+                sources = values
+
+            horizontal_gaps_before = np.concatenate(([left_horizontal_gap], horizontal_gaps[:-1]))
+            values_before = np.concatenate(([left_value], values[:-1]))
+
+            directions[y, start_x:end_x] = (diagonal == values) * MultiTableBacktracking.MAIN_DIAGONAL \
+                | (vertical_gaps == values) * MultiTableBacktracking.MAIN_TO_P \
+                | (horizontal_gaps == values) * MultiTableBacktracking.MAIN_TO_Q \
+                | (vertical_gaps == previous_vertical_gaps + gap_beta) * MultiTableBacktracking.P_FROM_P \
+                | (vertical_gaps == previous[1:] + gap_opening) * MultiTableBacktracking.P_FROM_MAIN \
+                | (horizontal_gaps == horizontal_gaps_before + gap_beta) * MultiTableBacktracking.Q_FROM_Q \
+                | (horizontal_gaps == values_before + gap_opening) * MultiTableBacktracking.Q_FROM_MAIN
+
+            right[y - start_y] = values[-1]
+            right_horizontal_gaps[y - start_y] = horizontal_gaps[-1]
+            previous = np.concatenate(([left_value], values))
+            previous_vertical_gaps = vertical_gaps
+
+        rows[tile_y + 1, start_x:end_x] = previous[1:]
+        row_gaps[tile_y + 1, start_x:end_x] = previous_vertical_gaps
+        columns[tile_x + 1, start_y:end_y] = right
+        column_gaps[tile_x + 1, start_y:end_y] = right_horizontal_gaps
@@ -0,0 +1,47 @@
+from system import messages
+
+import system.string_symbols as strings
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by the vectorized engines
+    np = None
+
+class VectorEngine:
+    """
+    Declares all functions which are shared by the vectorized (NumPy) fill engines.
+    """
+
+    NEGATIVE_INFINITY = strings.NEGATIVE_INFINITY // 2  # leaves room to add costs without an int64 overflow
+
+    def __init__(self):
+        """
+        Checks if NumPy is available.
+        """
+        if np is None:
+            raise ImportError(messages.NUMPY_MISSING)
+
+    def _encode(self, input_data):
+        """
+        Encodes both sequences as small integers and creates the dense score table for them,
+        so a substitution score becomes a single array lookup.
+
+        Args:
+            input_data: the input for which you create the encoding
+
+        Returns:
+            tuple of (codes of sequence a, codes of sequence b, score table indexed by two codes)
+        """
+        alphabet = sorted(set(input_data.codes_a) | set(input_data.codes_b))
+        codes = np.zeros(256, dtype=np.intp)
+        codes[alphabet] = np.arange(0, len(alphabet))
+
+        scores = np.zeros((max(len(alphabet), 1), max(len(alphabet), 1)), dtype=np.int64)
+        dense_scores = input_data.cost_function.get_scores()
+        for code_a in alphabet:
+            scores[codes[code_a], :len(alphabet)] = [dense_scores[code_a][code_b] for code_b in alphabet]
+
+        codes_a = codes[np.frombuffer(input_data.codes_a, dtype=np.uint8)]
+        codes_b = codes[np.frombuffer(input_data.codes_b, dtype=np.uint8)]
+
+        return codes_a, codes_b, scores
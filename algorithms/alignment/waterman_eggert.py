@@ -0,0 +1,181 @@
+from data.move_string import MoveString
+from maths.vector import Vector
+
+import heapq
+import system.string_symbols as strings
+
+class WatermanEggert:
+    """
+    Returns the best non-overlapping local alignments with affine gaps one after another (Waterman and Eggert, 1987).
+    The three local Gotoh matrices are filled once and each cell with a positive score is a candidate end
+    in a heap. The best candidate is traced back to a cell with zero (the start of its local alignment)
+    and all cells of this alignment get forbidden: no later alignment contains one of them.
+    Afterwards only the cells which depend on the forbidden cells are computed again (like in SIM):
+    a row is computed from the first column which can change, until the changed range of the row above ends
+    and a cell does not change anymore, so the recomputation stays in the shadow of the alignment.
+    The changed cells are pushed into the heap again and the old entries are skipped when they come out of it,
+    because their scores are not the scores of their cells anymore.
+    """
+
+    def iterate_alignments(self, input_data):
+        """
+        Yields the best non-overlapping local alignments, the best one first.
+        The alignments are only computed when they are needed, so you can stop after any number of them.
+        Of candidates with the same score the one which ends first (in the first sequence,
+        then in the second one) is chosen.
+
+        Args:
+            input_data: the input with the sequences, the cost function and the gap costs (see init_gotoh)
+
+        Yields:
+            tuples (score, MoveString of the local alignment), the scores are positive and never increase
+        """
+        self.__data = input_data
+        self.__scores = input_data.cost_function.get_scores()
+        self.__fill()
+
+        while len(self.__heap) > 0:
+            negative_score, y, x = heapq.heappop(self.__heap)
+
+            if self.__forbidden[y][x] or self.__values[y][x] != -negative_score:
+                continue  # an old entry of a cell which was computed again
+
+            path = self.__traceback(y, x)
+            yield -negative_score, MoveString().from_path([Vector(x, y) for (y, x) in path])
+
+            for (y, x) in path[:-1]:  # the start cell is not part of the alignment
+                self.__forbidden[y][x] = True
+            self.__recompute(path[:-1])
+
+    def __fill(self):
+        """
+        Fills the three local Gotoh matrices and creates the heap with all cells which have a positive score.
+        """
+        negative_infinity = strings.NEGATIVE_INFINITY
+        len_y = len(self.__data.codes_a) + 1
+        len_x = len(self.__data.codes_b) + 1
+
+        self.__values = [[0] * len_x for y in range(0, len_y)]
+        self.__horizontal_gaps = [[negative_infinity] * len_x for y in range(0, len_y)]
+        self.__vertical_gaps = [[negative_infinity] * len_x for y in range(0, len_y)]
+        self.__forbidden = [bytearray(len_x) for y in range(0, len_y)]
+        self.__heap = []
+
+        for y in range(1, len_y):
+            for x in range(1, len_x):
+                self.__compute_cell(y, x)
+
+                if self.__values[y][x] > 0:
+                    self.__heap.append((-self.__values[y][x], y, x))
+
+        heapq.heapify(self.__heap)
+
+    def __compute_cell(self, y, x):
+        """
+        Computes a cell of all three matrices.
+        A forbidden cell gets zero and its gaps negative infinity, so no alignment can go through it.
+
+        Args:
+            y: row of the cell
+            x: column of the cell
+
+        Returns:
+            True if a value of the cell has changed
+        """
+        if self.__forbidden[y][x]:
+            value = 0
+            horizontal_gap = vertical_gap = strings.NEGATIVE_INFINITY
+        else:
+            horizontal_gap = max(self.__horizontal_gaps[y][x - 1] + self.__data.gap_beta,
+                                 self.__values[y][x - 1] + self.__data.gap_opening)
+            vertical_gap = max(self.__vertical_gaps[y - 1][x] + self.__data.gap_beta,
+                               self.__values[y - 1][x] + self.__data.gap_opening)
+            matching = self.__values[y - 1][x - 1] + \
+                self.__scores[self.__data.codes_a[y - 1]][self.__data.codes_b[x - 1]]
+            value = max(0, matching, horizontal_gap, vertical_gap)
+
+        changed = value != self.__values[y][x] or horizontal_gap != self.__horizontal_gaps[y][x] \
+            or vertical_gap != self.__vertical_gaps[y][x]
+
+        self.__values[y][x] = value
+        self.__horizontal_gaps[y][x] = horizontal_gap
+        self.__vertical_gaps[y][x] = vertical_gap
+        return changed
+
+    def __recompute(self, cells):
+        """
+        Computes the cells again which depend on newly forbidden cells.
+        A changed cell can change the next cell of its row and two cells of the next row,
+        so the range of each row begins at the first and ends after the last changed cell of the row above
+        (or a forbidden cell) and goes on to the right as long as the cells change.
+
+        Args:
+            cells: the newly forbidden cells (y, x)
+        """
+        len_x = len(self.__values[0])
+        forbidden_columns = {}
+
+        for (y, x) in cells:
+            forbidden_columns.setdefault(y, []).append(x)
+
+        last_forbidden_row = max(forbidden_columns)
+        y = min(forbidden_columns)
+        changed_columns = []  # first and last column of the row above which have to be computed again
+
+        while y < len(self.__values) and (len(changed_columns) > 0 or y <= last_forbidden_row):
+            columns = changed_columns + forbidden_columns.get(y, [])
+            changed_columns = []
+            last = max(columns)
+            x = min(columns)
+            changed = False
+
+            while x < len_x and (x <= last or changed):
+                changed = self.__compute_cell(y, x)
+
+                if changed:
+                    changed_columns = [changed_columns[0] if len(changed_columns) > 0 else x, min(x + 1, len_x - 1)]
+
+                    if self.__values[y][x] > 0:
+                        heapq.heappush(self.__heap, (-self.__values[y][x], y, x))
+                x += 1
+
+            y += 1
+
+    def __traceback(self, y, x):
+        """
+        Follows the best scores from a cell back to a cell with zero, where the local alignment begins.
+        Of all optimal paths the first one with the order substitution, vertical gap, horizontal gap is chosen.
+
+        Args:
+            y: row of the end
+            x: column of the end
+
+        Returns:
+            path of cells (y, x) from the end to the start of the local alignment
+        """
+        path = [(y, x)]
+        matrix = self.__values
+
+        while matrix is not self.__values or self.__values[y][x] > 0:
+            if matrix is self.__vertical_gaps:
+                if self.__vertical_gaps[y][x] == self.__values[y - 1][x] + self.__data.gap_opening:
+                    matrix = self.__values
+                y -= 1
+            elif matrix is self.__horizontal_gaps:
+                if self.__horizontal_gaps[y][x] == self.__values[y][x - 1] + self.__data.gap_opening:
+                    matrix = self.__values
+                x -= 1
+            elif self.__values[y][x] == self.__values[y - 1][x - 1] + \
+                    self.__scores[self.__data.codes_a[y - 1]][self.__data.codes_b[x - 1]]:
+                y -= 1
+                x -= 1
+            elif self.__values[y][x] == self.__vertical_gaps[y][x]:
+                matrix = self.__vertical_gaps
+                continue
+            else:
+                matrix = self.__horizontal_gaps
+                continue
+
+            path.append((y, x))
+
+        return path
@@ -0,0 +1,53 @@
+from algorithms.alignment.vector_engine import VectorEngine, np
+from algorithms.backtracking.backtracking import Backtracking
+
+class WavefrontEngine(VectorEngine):
+    """
+    Fills the Needleman-Wunsch matrix anti-diagonal by anti-diagonal.
+    All cells of an anti-diagonal only depend on the two anti-diagonals before,
+    so a whole anti-diagonal is computed with one vector operation.
+    The direction bits of the cells are computed together with their values.
+    """
+
+    def compute_needleman(self, input_data):
+        """
+        Computes the Needleman-Wunsch matrix.
+
+        Args:
+            input_data: the input for which you create the matrix
+
+        Returns:
+            tuple of two-dimensional arrays (matrix with the same values as the list based matrix,
+            direction bits of the cells)
+        """
+        tbl_len_y = len(input_data.sequence_a) + 1
+        tbl_len_x = len(input_data.sequence_b) + 1
+        gap_cost = input_data.gap_cost
+
+        table = np.zeros((tbl_len_y, tbl_len_x), dtype=np.int64)
+        table[:, 0] = np.arange(tbl_len_y) * gap_cost
+        table[0, :] = np.arange(tbl_len_x) * gap_cost
+
+        directions = np.zeros((tbl_len_y, tbl_len_x), dtype=np.uint8)
+        directions[1:, 0] = Backtracking.UP
+        directions[0, 1:] = Backtracking.LEFT
+
+        codes_a, codes_b, scores = self._encode(input_data)
+        cells = table.reshape(-1)  # flat view: cell (y, x) is at y * tbl_len_x + x
+        cell_directions = directions.reshape(-1)
+
+        for diagonal in range(2, tbl_len_y + tbl_len_x - 1):
+            ys = np.arange(max(1, diagonal - tbl_len_x + 1), min(tbl_len_y - 1, diagonal - 1) + 1)
+            positions = ys * (tbl_len_x - 1) + diagonal
+
+            matching = cells[positions - tbl_len_x - 1] + scores[codes_a[ys - 1], codes_b[diagonal - ys - 1]]
+            insertion = cells[positions - 1] + gap_cost
+            deletion = cells[positions - tbl_len_x] + gap_cost
+
+            values = np.maximum(np.maximum(insertion, matching), deletion)
+            cells[positions] = values
+            cell_directions[positions] = (matching == values) * Backtracking.DIAGONAL \
+                | (insertion == values) * Backtracking.LEFT \
+                | (deletion == values) * Backtracking.UP
+
+        return table, directions
@@ -0,0 +1,260 @@
+from data.move_string import MoveString
+from maths.vector import Vector
+from system import messages
+
+class WfaEngine:
+    """
+    Computes one optimal, global alignment with affine gap costs with the wavefront algorithm
+    (WFA, Marco-Sola et al., 2021). Instead of the cells it computes the scores:
+    the wavefront of a penalty s stores for each diagonal k = x - y the furthest column x
+    which an alignment with penalty s reaches on this diagonal. Matches cost nothing,
+    so each wavefront is extended along the matches of its diagonals, before the next one is computed.
+    The alignment is found with the smallest penalty s after O((n + m) * s) steps,
+    so near-identical sequences are aligned fast and with little memory.
+
+    The penalties are computed from the scores with a match score M, a mismatch score X < M,
+    gap_alpha and gap_beta (Eizenga and Paten, 2022): a mismatch costs 2 * (M - X)
+    and a gap of length k costs -2 * gap_alpha + k * (M - 2 * gap_beta).
+    Then each alignment has the score (M * (n + m) - penalty) / 2, so the same alignments are optimal.
+    """
+
+    def align(self, input_data):
+        """
+        Returns one optimal alignment and its score.
+
+        Args:
+            input_data: the input for which you create the alignment (see init_gotoh),
+                its substitution matrix needs one match and one smaller mismatch score for the characters
+                of the sequences and its gaps have to cost more than half of a match
+
+        Returns:
+            tuple (score, MoveString of the alignment)
+        """
+        self.__codes_a = input_data.codes_a
+        self.__codes_b = input_data.codes_b
+        match, mismatch = self.__get_scheme(input_data)
+
+        self.__mismatch = 2 * (match - mismatch)
+        self.__gap_opening = -2 * input_data.gap_alpha
+        self.__gap_extension = match - 2 * input_data.gap_beta
+
+        if self.__gap_opening < 0 or self.__gap_extension <= 0:
+            raise ValueError(messages.WFA_SCHEME)
+
+        penalty = self.__compute_wavefronts()
+        score = (match * (len(self.__codes_a) + len(self.__codes_b)) - penalty) // 2
+        return score, MoveString().from_path(self.__traceback(penalty))
+
+    def __get_scheme(self, input_data):
+        """
+        Returns the match and the mismatch score of the characters in the sequences.
+
+        Args:
+            input_data: the input with the cost function and the encoded sequences
+
+        Returns:
+            tuple (match score, mismatch score), a missing score is replaced by one which fits the other one
+        """
+        scores = input_data.cost_function.get_scores()
+        codes = set(self.__codes_a) | set(self.__codes_b)
+        matches = set(scores[code][code] for code in codes)
+        mismatches = set(scores[code_a][code_b] for code_a in codes for code_b in codes if code_a != code_b)
+
+        if len(matches) > 1 or len(mismatches) > 1 or None in matches or None in mismatches:
+            raise ValueError(messages.WFA_SCHEME)
+
+        match = matches.pop() if len(matches) > 0 else 0
+        mismatch = mismatches.pop() if len(mismatches) > 0 else match - 1
+
+        if mismatch >= match:
+            raise ValueError(messages.WFA_SCHEME)
+
+        return match, mismatch
+
+    def __compute_wavefronts(self):
+        """
+        Computes the wavefronts of the increasing penalties until one reaches the end of both sequences.
+        A wavefront is stored as a tuple (first diagonal, list of columns) with None for unreached diagonals,
+        or as None if no alignment has its penalty.
+
+        Returns:
+            the penalty of an optimal alignment
+        """
+        length_a = len(self.__codes_a)
+        length_b = len(self.__codes_b)
+        end_diagonal = length_b - length_a
+
+        # wavefronts of the alignments ending with a substitution or match, a vertical or a horizontal gap
+        self.__values = [(0, [self.__extend(0, 0)])]
+        self.__vertical_gaps = [None]
+        self.__horizontal_gaps = [None]
+        penalty = 0
+
+        while self.__get(self.__values[penalty], end_diagonal) != length_b:
+            penalty += 1
+            gap_source = penalty - self.__gap_opening - self.__gap_extension
+            extension_source = penalty - self.__gap_extension
+
+            vertical_gaps = self.__combine([(self.__at(self.__values, gap_source), 1, 0),
+                                            (self.__at(self.__vertical_gaps, extension_source), 1, 0)])
+            horizontal_gaps = self.__combine([(self.__at(self.__values, gap_source), -1, 1),
+                                              (self.__at(self.__horizontal_gaps, extension_source), -1, 1)])
+            values = self.__combine([(self.__at(self.__values, penalty - self.__mismatch), 0, 1),
+                                     (vertical_gaps, 0, 0),
+                                     (horizontal_gaps, 0, 0)])
+
+            if values is not None:
+                first, columns = values
+                for i in range(0, len(columns)):
+                    if columns[i] is not None:
+                        columns[i] = self.__extend(first + i, columns[i])
+
+            self.__values.append(values)
+            self.__vertical_gaps.append(vertical_gaps)
+            self.__horizontal_gaps.append(horizontal_gaps)
+
+        return penalty
+
+    def __combine(self, sources):
+        """
+        Computes a wavefront with the furthest columns of other wavefronts.
+
+        Args:
+            sources: list of tuples (wavefront, shift of the diagonal, shift of the column):
+                diagonal k of the new wavefront is computed from diagonal k + shift of the source
+
+        Returns:
+            the new wavefront (columns which are outside of the matrix are removed)
+        """
+        length_a = len(self.__codes_a)
+        length_b = len(self.__codes_b)
+        sources = [source for source in sources if source[0] is not None]
+
+        if len(sources) == 0:
+            return None
+
+        first = max(min([wavefront[0] - shift for (wavefront, shift, step) in sources]), -length_a)
+        last = min(max([wavefront[0] + len(wavefront[1]) - 1 - shift for (wavefront, shift, step) in sources]),
+                   length_b)
+        columns = []
+
+        for diagonal in range(first, last + 1):
+            column = None
+
+            for (wavefront, shift, step) in sources:
+                source_column = self.__get(wavefront, diagonal + shift)
+
+                if source_column is not None and (column is None or source_column + step > column):
+                    column = source_column + step
+
+            if column is not None and (column > length_b or column - diagonal > length_a):
+                column = None
+
+            columns.append(column)
+
+        return (first, columns)
+
+    def __extend(self, diagonal, column):
+        """
+        Follows the matches on a diagonal.
+
+        Args:
+            diagonal: the diagonal x - y
+            column: the column where the matches begin
+
+        Returns:
+            the column after the last match
+        """
+        codes_a = self.__codes_a
+        codes_b = self.__codes_b
+        row = column - diagonal
+
+        while row < len(codes_a) and column < len(codes_b) and codes_a[row] == codes_b[column]:
+            row += 1
+            column += 1
+
+        return column
+
+    def __traceback(self, penalty):
+        """
+        Follows the wavefronts from the end of both sequences back to their beginning.
+        Of all sources of a column the first one with the order substitution, vertical gap, horizontal gap is chosen
+        and a gap is closed as soon as possible.
+
+        Args:
+            penalty: the penalty of the optimal alignment
+
+        Returns:
+            path of cells as vectors (x, y) from the end to the beginning of the alignment
+        """
+        diagonal = len(self.__codes_b) - len(self.__codes_a)
+        column = len(self.__codes_b)
+        path = [Vector(column, column - diagonal)]
+        wavefronts = self.__values
+
+        while column > 0 or column - diagonal > 0:
+            if wavefronts is self.__vertical_gaps:
+                gap_source = penalty - self.__gap_opening - self.__gap_extension
+
+                if self.__get(self.__at(self.__values, gap_source), diagonal + 1) == column:
+                    wavefronts = self.__values
+                    penalty = gap_source
+                else:
+                    penalty -= self.__gap_extension
+
+                diagonal += 1
+            elif wavefronts is self.__horizontal_gaps:
+                gap_source = penalty - self.__gap_opening - self.__gap_extension
+
+                if self.__get(self.__at(self.__values, gap_source), diagonal - 1) == column - 1:
+                    wavefronts = self.__values
+                    penalty = gap_source
+                else:
+                    penalty -= self.__gap_extension
+
+                diagonal -= 1
+                column -= 1
+            else:
+                substitution = self.__get(self.__at(self.__values, penalty - self.__mismatch), diagonal)
+                substitution = substitution + 1 if substitution is not None else None
+                vertical_gap = self.__get(self.__vertical_gaps[penalty], diagonal)
+                horizontal_gap = self.__get(self.__horizontal_gaps[penalty], diagonal)
+                origin = 0 if penalty == 0 else None
+                sources = [substitution, vertical_gap, horizontal_gap, origin]
+                start = max([source for source in sources if source is not None])
+
+                while column > start:  # matches
+                    column -= 1
+                    path.append(Vector(column, column - diagonal))
+
+                if penalty == 0:
+                    break
+                elif start == substitution:
+                    penalty -= self.__mismatch
+                    column -= 1
+                elif start == vertical_gap:
+                    wavefronts = self.__vertical_gaps
+                    continue
+                else:
+                    wavefronts = self.__horizontal_gaps
+                    continue
+
+            path.append(Vector(column, column - diagonal))
+
+        return path
+
+    def __at(self, wavefronts, penalty):
+        """
+        Returns the wavefront of a penalty or None if it does not exist.
+        """
+        if penalty < 0 or penalty >= len(wavefronts):
+            return None
+        return wavefronts[penalty]
+
+    def __get(self, wavefront, diagonal):
+        """
+        Returns the column of a wavefront on a diagonal or None if it is not reached.
+        """
+        if wavefront is None or diagonal < wavefront[0] or diagonal >= wavefront[0] + len(wavefront[1]):
+            return None
+        return wavefront[1][diagonal - wavefront[0]]
@@ -0,0 +1,214 @@
+from algorithms.backtracking.multi_table_backtracking import MultiTableBacktracking
+from data.move_string import MoveString
+from maths.vector import Vector
+from system import messages
+
+import system.string_symbols as strings
+
+class XDropEngine:
+    """
+    Extends a seed of two sequences to both sides with affine gaps (Gotoh recurrence),
+    but stops exploring a side as soon as the scores fall more than x_drop below the best score seen (X-drop).
+    Each side is an alignment which begins at the seed and may end in each cell, so its best cell is its end.
+    The matrices are filled by anti-diagonals (cells with the same i + j) and of each anti-diagonal
+    only the range between the first and the last live cell is computed. A cell is live if its score is at most
+    x_drop below the best score, the other cells get negative infinity and can not be reached anymore.
+    The range of the next anti-diagonal contains the cells which can be reached from the live ranges
+    of the two anti-diagonals before it, so the side ends when two anti-diagonals have no live cells.
+    Only the values of the last two anti-diagonals are kept and the direction bits of the live ranges
+    for the traceback, so runtime and memory depend on the explored region and not on the sequence lengths.
+    """
+
+    def extend(self, input_data, seed_a, seed_b, x_drop, seed_length=1):
+        """
+        Extends a seed to both sides.
+        The seed contains at least one pair of characters, so a gap at the end of the left side
+        and a gap at the start of the right side are never one gap and the scores of both sides can be added.
+
+        Args:
+            input_data: the input with the sequences, the cost function and the gap costs (see init_gotoh)
+            seed_a: position of the seed in the first sequence
+            seed_b: position of the seed in the second sequence
+            x_drop: largest difference between the best score and the score of a live cell
+            seed_length: number of characters of the seed, they are aligned without gaps
+
+        Returns:
+            tuple (score of the extended alignment, MoveString of the extended alignment)
+        """
+        if seed_length < 1:
+            raise ValueError(messages.EMPTY_SEED)
+
+        scores = input_data.cost_function.get_scores()
+        codes_a = input_data.codes_a
+        codes_b = input_data.codes_b
+        end_a = seed_a + seed_length
+        end_b = seed_b + seed_length
+
+        seed_score = sum([scores[codes_a[seed_a + k]][codes_b[seed_b + k]] for k in range(0, seed_length)])
+        right_score, right_path = self.__extend_side(input_data, codes_a[end_a:], codes_b[end_b:], x_drop)
+        left_score, left_path = self.__extend_side(input_data, codes_a[:seed_a][::-1], codes_b[:seed_b][::-1],
+                                                   x_drop)
+
+        # the path goes from the end of the right side over the seed to the start of the left side
+        path = [Vector(end_b + x, end_a + y) for (y, x) in right_path]
+        path.extend([Vector(end_b - k, end_a - k) for k in range(1, seed_length + 1)])
+        path.extend([Vector(seed_b - x, seed_a - y) for (y, x) in reversed(left_path[:-1])])
+
+        return left_score + seed_score + right_score, MoveString().from_path(path)
+
+    def __extend_side(self, input_data, codes_a, codes_b, x_drop):
+        """
+        Computes the best alignment of prefixes of two sequences with the X-drop rule.
+
+        Args:
+            input_data: the input with the cost function and the gap costs
+            codes_a: character codes of the first sequence (the left side is reversed)
+            codes_b: character codes of the second sequence (the left side is reversed)
+            x_drop: largest difference between the best score and the score of a live cell
+
+        Returns:
+            tuple (best score, path of cells (y, x) from the best cell to the seed)
+        """
+        negative_infinity = strings.NEGATIVE_INFINITY
+        gap_beta = input_data.gap_beta
+        gap_opening = input_data.gap_opening
+        scores = input_data.cost_function.get_scores()
+        length_a = len(codes_a)
+        length_b = len(codes_b)
+
+        best = (0, 0, 0)  # score, y and x of the best cell
+
+        # the live ranges as (first y, values, vertical gaps, horizontal gaps) and the direction bits of each range
+        previous = (0, [0], [negative_infinity], [negative_infinity])
+        before_previous = (0, [], [], [])
+        directions = [(0, bytearray(1))]
+
+        for diagonal in range(1, length_a + length_b + 1):
+            first_1, values_1, vertical_gaps_1, horizontal_gaps_1 = previous
+            first_2, values_2 = before_previous[0], before_previous[1]
+
+            if len(values_1) == 0 and len(values_2) == 0:
+                break
+
+            last_1 = first_1 + len(values_1) - 1
+            last_2 = first_2 + len(values_2) - 1
+            firsts = []
+            lasts = []
+
+            if len(values_1) > 0:  # a gap goes one row down or stays in the row
+                firsts.append(first_1)
+                lasts.append(last_1 + 1)
+
+            if len(values_2) > 0:  # a substitution goes one row down
+                firsts.append(first_2 + 1)
+                lasts.append(last_2 + 1)
+
+            first = max(min(firsts), diagonal - length_b)
+            last = min(max(lasts), length_a, diagonal)
+
+            values = []
+            vertical_gaps = []
+            horizontal_gaps = []
+            bits = bytearray()
+
+            for y in range(first, last + 1):
+                x = diagonal - y
+
+                if first_1 <= y <= last_1:  # from the cell on the left
+                    horizontal_extension = horizontal_gaps_1[y - first_1] + gap_beta
+                    horizontal_opening = values_1[y - first_1] + gap_opening
+                else:
+                    horizontal_extension = horizontal_opening = negative_infinity
+
+                if first_1 <= y - 1 <= last_1:  # from the cell above
+                    vertical_extension = vertical_gaps_1[y - 1 - first_1] + gap_beta
+                    vertical_opening = values_1[y - 1 - first_1] + gap_opening
+                else:
+                    vertical_extension = vertical_opening = negative_infinity
+
+                if first_2 <= y - 1 <= last_2:
+                    matching = values_2[y - 1 - first_2] + scores[codes_a[y - 1]][codes_b[x - 1]]
+                else:
+                    matching = negative_infinity
+
+                horizontal_gap = max(horizontal_extension, horizontal_opening)
+                vertical_gap = max(vertical_extension, vertical_opening)
+                value = max(horizontal_gap, matching, vertical_gap)
+
+                if value > best[0]:
+                    best = (value, y, x)
+
+                values.append(value)
+                vertical_gaps.append(vertical_gap)
+                horizontal_gaps.append(horizontal_gap)
+                bits.append((MultiTableBacktracking.MAIN_DIAGONAL if matching == value else 0)
+                            | (MultiTableBacktracking.MAIN_TO_P if vertical_gap == value else 0)
+                            | (MultiTableBacktracking.MAIN_TO_Q if horizontal_gap == value else 0)
+                            | (MultiTableBacktracking.P_FROM_P if vertical_extension == vertical_gap else 0)
+                            | (MultiTableBacktracking.P_FROM_MAIN if vertical_opening == vertical_gap else 0)
+                            | (MultiTableBacktracking.Q_FROM_Q if horizontal_extension == horizontal_gap else 0)
+                            | (MultiTableBacktracking.Q_FROM_MAIN if horizontal_opening == horizontal_gap else 0))
+
+            # the dead cells are removed at both ends of the range and get negative infinity inside of it
+            threshold = best[0] - x_drop
+            live = [k for k in range(0, len(values)) if values[k] >= threshold]
+
+            if len(live) == 0:
+                before_previous = previous
+                previous = (first, [], [], [])
+                directions.append((first, bytearray()))
+                continue
+
+            start, end = live[0], live[-1] + 1
+
+            for k in range(start, end):
+                if values[k] < threshold:
+                    values[k] = vertical_gaps[k] = horizontal_gaps[k] = negative_infinity
+
+            before_previous = previous
+            previous = (first + start, values[start:end], vertical_gaps[start:end], horizontal_gaps[start:end])
+            directions.append((first + start, bits[start:end]))
+
+        return best[0], self.__traceback(directions, best[1], best[2])
+
+    def __traceback(self, directions, y, x):
+        """
+        Follows the direction bits from the best cell back to the seed.
+        Of all optimal paths the first one with the order diagonal, vertical gap, horizontal gap is chosen.
+
+        Args:
+            directions: list with the first y and the direction bits of the live range of each anti-diagonal
+            y: row of the best cell
+            x: column of the best cell
+
+        Returns:
+            path of cells (y, x) from the best cell to the seed
+        """
+        path = [(y, x)]
+        matrix = MultiTableBacktracking.MATRIX_LBL_MAIN
+
+        while y > 0 or x > 0:
+            first, bits = directions[y + x]
+            cell = bits[y - first]
+
+            if matrix == MultiTableBacktracking.MATRIX_LBL_VERTICAL_GAPS:
+                if not cell & MultiTableBacktracking.P_FROM_P:
+                    matrix = MultiTableBacktracking.MATRIX_LBL_MAIN
+                y -= 1
+            elif matrix == MultiTableBacktracking.MATRIX_LBL_HORIZONTAL_GAPS:
+                if not cell & MultiTableBacktracking.Q_FROM_Q:
+                    matrix = MultiTableBacktracking.MATRIX_LBL_MAIN
+                x -= 1
+            elif cell & MultiTableBacktracking.MAIN_DIAGONAL:
+                y -= 1
+                x -= 1
+            elif cell & MultiTableBacktracking.MAIN_TO_P:
+                matrix = MultiTableBacktracking.MATRIX_LBL_VERTICAL_GAPS
+                continue
+            else:
+                matrix = MultiTableBacktracking.MATRIX_LBL_HORIZONTAL_GAPS
+                continue
+
+            path.append((y, x))
+
+        return path
@@ -1,8 +1,9 @@
 # stores all available algorithms
-PROCEDURES = ["feng_doolittle", "gotoh", "needleman_wunsch", "needleman_wunsch_3d", "nussinov"]
+PROCEDURES = ["feng_doolittle", "gotoh", "needleman_wunsch", "needleman_wunsch_3d", "nussinov", "smith_waterman"]
 
 FENG_DOOLITTLE = PROCEDURES[0]
 GOTOH = PROCEDURES[1]
 NEEDLEMAN_WUNSCH = PROCEDURES[2]
 NEEDLEMAN_WUNSCH_3D = PROCEDURES[3]
-NUSSINOV = PROCEDURES[4]
\ No newline at end of file
+NUSSINOV = PROCEDURES[4]
+SMITH_WATERMAN = PROCEDURES[5]
\ No newline at end of file
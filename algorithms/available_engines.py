@@ -0,0 +1,14 @@
+# stores all available engines to fill the alignment matrices
+ENGINES = ["python", "numpy", "linear", "banded", "tiled", "wfa"]
+
+PYTHON = ENGINES[0]
+NUMPY = ENGINES[1]
+LINEAR = ENGINES[2]
+BANDED = ENGINES[3]
+TILED = ENGINES[4]
+WFA = ENGINES[5]
+
+# engines of the command line, WFA needs a substitution matrix with one match and one mismatch score
+# and neither BLOSUM62 nor PAM250 is one, so it is only available in Gotoh.run
+GOTOH_ENGINES = [PYTHON, NUMPY, LINEAR, BANDED, TILED]
+NEEDLEMAN_WUNSCH_ENGINES = [PYTHON, NUMPY, LINEAR, BANDED, TILED]
@@ -0,0 +1,114 @@
+import random
+
+class AlignmentGraph:
+    """
+    Represents all co-optimal alignments as a directed acyclic graph.
+    Its nodes are the matrix cells (for Gotoh together with the matrix) which are reachable
+    from the start of the traceback and its edges are the allowed traceback steps.
+    For each node the number of paths to the upper left corner is stored,
+    so the alignments can be counted without creating them and drawn uniformly at random:
+    a successor is chosen with a probability proportional to its number of paths.
+    The graph holds lists of neighbours for all reachable cells, so it is only created
+    when the alignments are counted or drawn for the first time.
+    """
+
+    def __init__(self, start, backtracking, input_data):
+        """
+        Prepares the graph of all traceback paths which begin at a position.
+
+        Args:
+            start: position from which the traceback begins
+            backtracking: a Backtracking instance which returns the neighbours of a position
+            input_data: the input for which you create the traceback
+        """
+        self.__backtracking = backtracking
+        self.__counts = None
+        self.__input_data = input_data
+        self.__neighbours = None
+        self.__start = start
+
+    def __build(self):
+        """
+        Creates the nodes and edges of the graph and counts the paths of each node.
+        """
+        self.__counts = {}
+        self.__neighbours = {}
+
+        stack = [self.__start]
+
+        while len(stack) > 0:
+            vec = stack[-1]
+            key = self.__key(vec)
+
+            if key in self.__counts:
+                stack.pop()
+            elif key not in self.__neighbours:  # first visit: the successors are counted first
+                self.__neighbours[key] = self.__backtracking._get_neighbours(vec, self.__input_data)
+
+                for neighbour in self.__neighbours[key]:
+                    if self.__key(neighbour) not in self.__counts:
+                        stack.append(neighbour)
+            else:  # second visit: all successors are counted
+                stack.pop()
+
+                if vec.x == 0 and vec.y == 0 and vec.z == 0:
+                    self.__counts[key] = 1
+                else:
+                    self.__counts[key] = sum([self.__counts[self.__key(neighbour)]
+                                              for neighbour in self.__neighbours[key]])
+
+    def count(self):
+        """
+        Returns the number of co-optimal alignments.
+        """
+        if self.__counts is None:
+            self.__build()
+
+        return self.__counts[self.__key(self.__start)]
+
+    def sample(self, k, seed=None):
+        """
+        Returns k traceback paths which are drawn uniformly and independently from all co-optimal paths.
+
+        Args:
+            k: number of paths
+            seed: seed of the random number generator (None for a random seed)
+
+        Returns:
+            list of paths from the start position to the upper left corner
+        """
+        generator = random.Random(seed)
+        paths = []
+
+        if self.count() == 0:
+            return paths
+
+        for i in range(0, k):
+            vec = self.__start
+            path = [vec]
+
+            while not (vec.x == 0 and vec.y == 0 and vec.z == 0):
+                number = generator.randrange(self.__counts[self.__key(vec)])
+
+                for neighbour in self.__neighbours[self.__key(vec)]:
+                    count = self.__counts[self.__key(neighbour)]
+
+                    if number < count:
+                        vec = neighbour
+                        break
+                    number -= count
+
+                path.append(vec)
+
+            paths.append(path)
+
+        return paths
+
+    def __key(self, vec):
+        """
+        Returns the key of a node.
+
+        Args:
+            vec: the position of the node
+        """
+        return vec.x, vec.y, vec.z, vec.matrix_label
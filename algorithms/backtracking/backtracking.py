@@ -1,18 +1,33 @@
+from algorithms.backtracking.alignment_graph import AlignmentGraph
 from data.alignment_output_data import AlignmentOutputData
 from maths.vector import Vector
 
 import copy
-import random
-import system.string_symbols as strings
 
 class Backtracking:
     """
     Allows you to do a traceback.
+    The traceback only follows the direction bits which were stored in a byte for each cell during the fill,
+    so it does not need the score matrix or the cost function.
     """
+
+    # direction bits of a cell in table_directions
+    DIAGONAL = 1
+    LEFT = 2
+    UP = 4
+
+    global _output_data
     global paths
 
-    def __init__(self):
-        """Initializes backtracking variables."""
+    def __init__(self, output_data=AlignmentOutputData):
+        """
+        Initializes backtracking variables.
+
+        Args:
+            output_data: output data of the run whose tables are traced back
+                (by default the class attributes of AlignmentOutputData)
+        """
+        self._output_data = output_data
         self.paths = []
 
     def traceback_all(self, path, input_data):
@@ -25,18 +40,39 @@ class Backtracking:
             path: list in which you store the traceback
             input_data: the input for which you create the traceback
         """
-        current = path[-1]
-        neighbours = self._get_neighbours(current, input_data)
+        self.paths.extend(self.iterate_all(path, input_data))
+
+    def iterate_all(self, path, input_data):
+        """
+        Yields all tracebacks for given input one after another
+        by going through all allowed paths from the bottom right corner
+        to the left upper corner of the matrix.
+        The paths are searched with an explicit stack of neighbour iterators instead of recursion,
+        so long sequences do not reach the recursion limit and a path is only copied when it is yielded.
+
+        Args:
+            path: list in which you store the traceback
+            input_data: the input for which you create the traceback
 
-        for vec in neighbours:
-            if (vec.x == 0 and vec.y == 0 and vec.z == 0):
+        Yields:
+            the paths in the same order as the recursive traceback
+        """
+        stack = [iter(self._get_neighbours(path[-1], input_data))]
+
+        while len(stack) > 0:
+            vec = next(stack[-1], None)
+
+            if vec is None:  # all paths through the last position were yielded
+                stack.pop()
+                if len(stack) > 0:
+                    path.pop()
+            elif vec.x == 0 and vec.y == 0 and vec.z == 0:
                 path.append(vec)
-                self.paths.append(copy.deepcopy(path))
+                yield copy.copy(path)
                 path.pop()
             else:
                 path.append(vec)
-                self.traceback_all(path, input_data)
-                path.pop()
+                stack.append(iter(self._get_neighbours(vec, input_data)))
 
     def _get_neighbours(self, pos, input_data):
         """
@@ -52,61 +88,30 @@ class Backtracking:
             neighbours of the cell at position pos
         """
         neighbours = []
+        directions = self._output_data.table_directions[pos.y][pos.x]
 
-        start = AlignmentOutputData.table_values[pos.y][pos.x]
-        diagonal = float(strings.NAN)
-        up = float(strings.NAN)
-        left = float(strings.NAN)
-
-        cur_char_seq_1 = strings.EMPTY
-        cur_char_seq_2 = strings.EMPTY
-
-        if pos.y - 1 >= 0 and pos.x - 1 >= 0:
-            diagonal = AlignmentOutputData.table_values[pos.y - 1][pos.x - 1]
-
-        if pos.y - 1 >= 0:
-            up = AlignmentOutputData.table_values[pos.y - 1][pos.x]
-
-        if pos.x - 1 >= 0:
-            left = AlignmentOutputData.table_values[pos.y][pos.x - 1]
-
-        if pos.y - 1 >= 0:
-            cur_char_seq_1 = input_data.sequence_a[pos.y - 1]
-        if pos.x - 1 >= 0:
-            cur_char_seq_2 = input_data.sequence_b[pos.x - 1]
-
-        matching = start == diagonal + input_data.cost_function.get_value(cur_char_seq_1, cur_char_seq_2)
-        deletion = start == up + input_data.gap_cost
-        insertion = start == left + input_data.gap_cost
-
-        if matching:
+        if directions & self.DIAGONAL:
             neighbours.append(Vector(pos.x - 1, pos.y - 1))
 
-        if insertion:
+        if directions & self.LEFT:
             neighbours.append(Vector(pos.x - 1, pos.y))
 
-        if deletion:
+        if directions & self.UP:
             neighbours.append(Vector(pos.x, pos.y - 1))
 
         return neighbours
 
-    def traceback_one(self, path, input_data):
+    def traceback_one(self, path, input_data, seed=None):
         """
-        Returns randomly one traceback for given input
-        by randomly choosing a successor for given node.
+        Returns randomly one traceback for given input.
+        Each of the co-optimal tracebacks is chosen with the same probability (see AlignmentGraph).
 
         Args:
             path: list in which you store the traceback
             input_data: the input for which you create the traceback
+            seed: seed of the random number generator (None for a random seed)
         """
-        current = path[-1]
-        neighbours = self._get_neighbours(current, input_data)
-
-        if len(neighbours) != 0:
-            random_number = int(random.random() * len(neighbours))
-            successor = neighbours[random_number]
+        for sampled_path in AlignmentGraph(path[-1], self, input_data).sample(1, seed):
+            path.extend(sampled_path[1:])
 
-            path.append(successor)
-            self.traceback_one(path, input_data)
-        elif len(neighbours) == 0:
-            self.paths.append(path)
\ No newline at end of file
+        self.paths.append(path)
\ No newline at end of file
@@ -2,16 +2,34 @@ from algorithms.backtracking.backtracking import Backtracking
 from data.alignment_output_data import AlignmentOutputData
 from maths.vector import Vector
 
-import system.string_symbols as strings
-
 class MultiTableBacktracking(Backtracking):
+    """
+    Allows you to do a traceback through the three Gotoh matrices.
+    The direction bits of all three matrices are stored in the same byte of a cell.
+    """
 
     MATRIX_LBL_MAIN = "S"
     MATRIX_LBL_HORIZONTAL_GAPS = "-Q"
     MATRIX_LBL_VERTICAL_GAPS = "-P"
 
-    def __init__(self):
-        """Initializes multi table backtracking variables."""
+    # direction bits of a cell in table_directions
+    MAIN_DIAGONAL = 1
+    MAIN_TO_P = 2
+    MAIN_TO_Q = 4
+    P_FROM_P = 8
+    P_FROM_MAIN = 16
+    Q_FROM_Q = 32
+    Q_FROM_MAIN = 64
+
+    def __init__(self, output_data=AlignmentOutputData):
+        """
+        Initializes multi table backtracking variables.
+
+        Args:
+            output_data: output data of the run whose tables are traced back
+                (by default the class attributes of AlignmentOutputData)
+        """
+        self._output_data = output_data
         self.paths = []
 
     def _get_neighbours(self, pos, input_data):
@@ -34,72 +52,26 @@ class MultiTableBacktracking(Backtracking):
         elif pos.matrix_label == self.MATRIX_LBL_VERTICAL_GAPS:
             return self.__get_neighbours_in_P(pos, input_data)
 
-        start = AlignmentOutputData.table_values[pos.y][pos.x]
-        diagonal = float(strings.NAN)
-        matrix_p = float(strings.NAN)
-        matrix_q = float(strings.NAN)
-        up = float(strings.NAN)
-        left = float(strings.NAN)
-
-        cur_char_seq_1 = strings.EMPTY
-        cur_char_seq_2 = strings.EMPTY
-
-        if pos.y - 1 >= 0 and pos.x - 1 >= 0:
-            diagonal = AlignmentOutputData.table_values[pos.y - 1][pos.x - 1]
-
-        if pos.y > 0:
-            matrix_p = AlignmentOutputData.table_vertical_gaps[pos.y][pos.x]
-
-        if pos.x > 0:
-            matrix_q = AlignmentOutputData.table_horizontal_gaps[pos.y][pos.x]
-
-        # marginal case
-        if pos.y - 1 >= 0 and pos.x == 0:
-            up = AlignmentOutputData.table_values[pos.y - 1][pos.x]
-
-        # marginal case
-        if pos.x - 1 >= 0 and pos.y == 0:
-            left = AlignmentOutputData.table_values[pos.y][pos.x - 1]
-
-        if pos.y - 1 >= 0:
-            cur_char_seq_1 = input_data.sequence_a[pos.y - 1]
-        if pos.x - 1 >= 0:
-            cur_char_seq_2 = input_data.sequence_b[pos.x - 1]
-
-        if cur_char_seq_1 != strings.EMPTY and cur_char_seq_2 != strings.EMPTY:
-            matching = start == diagonal + input_data.cost_function.get_value(cur_char_seq_1, cur_char_seq_2)
-        else:
-            matching = False
+        # marginal cases
+        if pos.y == 0 and pos.x > 0:
+            neighbours.append(Vector(pos.x - 1, pos.y).create(self.MATRIX_LBL_MAIN))
+            return neighbours
 
-        #matching = start == diagonal + (0 if cur_char_seq_1 == cur_char_seq_2 else -1)
-        change_to_p = start == matrix_p
-        change_to_q = start == matrix_q
+        if pos.x == 0 and pos.y > 0:
+            neighbours.append(Vector(pos.x, pos.y - 1).create(self.MATRIX_LBL_MAIN))
+            return neighbours
 
-        # marginal cases
-        deletion = start == up + input_data.gap_beta
-        insertion = start == left + input_data.gap_beta
+        directions = self._output_data.table_directions[pos.y][pos.x]
 
-        if matching:
+        if directions & self.MAIN_DIAGONAL:
             neighbours.append(Vector(pos.x - 1, pos.y - 1).create(self.MATRIX_LBL_MAIN))
 
-        if change_to_p:
+        if directions & self.MAIN_TO_P:
             neighbours.append(Vector(pos.x, pos.y).create(self.MATRIX_LBL_VERTICAL_GAPS))
 
-        if change_to_q:
+        if directions & self.MAIN_TO_Q:
             neighbours.append(Vector(pos.x, pos.y).create(self.MATRIX_LBL_HORIZONTAL_GAPS))
 
-        # marginal case
-        if insertion:
-            neighbours.append(Vector(pos.x - 1, pos.y).create(self.MATRIX_LBL_MAIN))
-
-        # marginal case
-        if deletion:
-            neighbours.append(Vector(pos.x, pos.y - 1).create(self.MATRIX_LBL_MAIN))
-
-        # marginal case
-        if not (matching or change_to_p or change_to_q or insertion or deletion) and (pos.x != 0 or pos.y != 0):
-            neighbours.append(Vector(0, 0).create(self.MATRIX_LBL_MAIN))
-
         return neighbours
 
     def __get_neighbours_in_P(self, pos, input_data):
@@ -116,20 +88,12 @@ class MultiTableBacktracking(Backtracking):
             neighbours of the cell at position pos
         """
         neighbours = []
+        directions = self._output_data.table_directions[pos.y][pos.x]
 
-        start = AlignmentOutputData.table_vertical_gaps[pos.y][pos.x]
-
-        if pos.y >= 0:
-            matrix_p = AlignmentOutputData.table_vertical_gaps[pos.y - 1][pos.x]
-            matrix_d = AlignmentOutputData.table_values[pos.y - 1][pos.x]
-
-        up_in_p = start == matrix_p + input_data.gap_beta
-        up_in_d = start == matrix_d + input_data.gap_opening
-
-        if up_in_p:
+        if directions & self.P_FROM_P:
             neighbours.append(Vector(pos.x, pos.y - 1).create(self.MATRIX_LBL_VERTICAL_GAPS))
 
-        if up_in_d:
+        if directions & self.P_FROM_MAIN:
             neighbours.append(Vector(pos.x, pos.y - 1).create(self.MATRIX_LBL_MAIN))
 
         return neighbours
@@ -148,20 +112,12 @@ class MultiTableBacktracking(Backtracking):
             neighbours of the cell at position pos
         """
         neighbours = []
+        directions = self._output_data.table_directions[pos.y][pos.x]
 
-        start = AlignmentOutputData.table_horizontal_gaps[pos.y][pos.x]
-
-        if pos.y >= 0:
-            matrix_q = AlignmentOutputData.table_horizontal_gaps[pos.y][pos.x - 1]
-            matrix_d = AlignmentOutputData.table_values[pos.y][pos.x - 1]
-
-        left_in_q = start == matrix_q + input_data.gap_beta
-        left_in_d = start == matrix_d + input_data.gap_opening
-
-        if left_in_q:
+        if directions & self.Q_FROM_Q:
             neighbours.append(Vector(pos.x - 1, pos.y).create(self.MATRIX_LBL_HORIZONTAL_GAPS))
 
-        if left_in_d:
+        if directions & self.Q_FROM_MAIN:
             neighbours.append(Vector(pos.x - 1, pos.y).create(self.MATRIX_LBL_MAIN))
 
         return neighbours
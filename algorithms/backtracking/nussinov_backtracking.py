@@ -2,17 +2,24 @@ from data.prediction_output_data import PredictionOutputData as Output
 from maths.vector import Vector
 
 import algorithms.prediction.base_pairs as pairs
-import copy
 
 class NussinovBacktracking:
     """
     Performs the traceback in the Nussinov algorithm.
     """
 
+    global _output_data
     global base_pairs
 
-    def __init__(self):
-        """Initializes Nussinov backtracking variables."""
+    def __init__(self, output_data=Output):
+        """
+        Initializes Nussinov backtracking variables.
+
+        Args:
+            output_data: output data of the run whose matrix is traced back
+                (by default the class attributes of PredictionOutputData)
+        """
+        self._output_data = output_data
         self.base_pairs = []
 
     def traceback_one(self, path, input_data):
@@ -21,20 +28,27 @@ class NussinovBacktracking:
         It is based on the pseudo-code of Prof. Dr. Backofen
         http://www.bioinf.uni-freiburg.de//Lehre/Courses/2013_SS/V_RNA/slides/nussinov.pdf (slide 13)
         The code is just reversing the Nussinov recursion function.
+        The positions which still have to be traced back are kept on an explicit stack instead of
+        recursive calls, so long sequences do not reach the recursion limit.
 
         Args:
             path: list in which you store the traceback
             input_data: the input for which you create the traceback
         """
-        current = path[-1]
-
-        if current.x <= current.y+1:  # case 1: j<=i -> checking if already at inner diagonal or further
-            return
-        elif Output.table_values[current.y][current.x] == Output.table_values[current.y][current.x-1]:  # case 2
-            path.append(Vector(current.x - 1, current.y))  # going one step to the left
-            self.traceback_one(path, input_data)
-            return
-        else:  # case 3: checks for complementary bases on the left
+        stack = [path[-1]]
+
+        while len(stack) > 0:
+            current = stack.pop()
+
+            if current.x <= current.y+1:  # case 1: j<=i -> checking if already at inner diagonal or further
+                continue
+            elif self._output_data.table_values[current.y][current.x] == self._output_data.table_values[current.y][current.x-1]:  # case 2
+                left = Vector(current.x - 1, current.y)  # going one step to the left
+                path.append(left)
+                stack.append(left)
+                continue
+
+            # case 3: checks for complementary bases on the left
             current_base = input_data.sequence[current.x-1]  # -1 because width of table is: len(sequence) + 1
 
             # for all k: i<=k<j
@@ -43,8 +57,8 @@ class NussinovBacktracking:
 
                 # S_k and S_j complementary
                 if pairs.complementary(base, current_base):
-                    current_value = Output.table_values[current.y][current.x]
-                    value_sum = Output.table_values[current.y][k] + Output.table_values[k+1][current.x-1] + 1
+                    current_value = self._output_data.table_values[current.y][current.x]
+                    value_sum = self._output_data.table_values[current.y][k] + self._output_data.table_values[k+1][current.x-1] + 1
 
                     # if N_{i,j} = N_{i,k-1} + N_{k+1,j-1} + 1
                     if current_value == value_sum:
@@ -54,13 +68,10 @@ class NussinovBacktracking:
                         left = Vector(k, current.y)
                         bottom = Vector(current.x-1, k+1)
 
-                        left_path = copy.copy(path)
-                        bottom_path = copy.copy(path)
-
-                        left_path.append(left)
-                        bottom_path.append(bottom)
+                        path.append(left)
+                        path.append(bottom)
 
-                        # jump to new positions
-                        self.traceback_one(left_path, input_data)
-                        self.traceback_one(bottom_path, input_data)
-                        return
\ No newline at end of file
+                        # jump to new positions (the left one first)
+                        stack.append(bottom)
+                        stack.append(left)
+                        break
@@ -11,9 +11,29 @@ class StructurePredictionAlgorithm:
     """
 
     global _data
+    global _publish_output
+    global _result
     global _tbl_len_x
     global _tbl_len_y
 
+    def __init__(self, publish_output=True):
+        """
+        Initializes parameters used by structure prediction algorithms.
+        The tables and results of a run are stored in an own PredictionOutputData instance.
+
+        Args:
+            publish_output: if True, the results of each run are also copied into the class attributes
+                of PredictionOutputData (set it to False if predictions run in parallel threads)
+        """
+        self._publish_output = publish_output
+        self._result = PredictionOutputData()
+
+    def get_output_data(self):
+        """
+        Returns the output data (matrix and structures) of the last run of this instance.
+        """
+        return self._result
+
     def compute(self, input_data):
         """
         Abstract function which has to be overriden to avoid an error message.
@@ -32,13 +52,13 @@ class StructurePredictionAlgorithm:
         for i in range(0, self._tbl_len_x - 1):
             #print("---")
             for x, y in zip(range(2, self._tbl_len_x), range(0, self._tbl_len_y-1 - i)):
-                PredictionOutputData.table_values[y][x + i] = self._value(x + i, y)
+                self._result.table_values.rows[y][x + i] = self._value(x + i, y)
                 #print((y, x + i))
 
     def _create_structures(self):
         """Creates the structures by going through the traceback paths."""
-        structures_data = PredictionOutputData.structures[0]
-        PredictionOutputData.dot_bracket_structures = []
+        structures_data = self._result.structures[0]
+        self._result.dot_bracket_structures = []
 
         self._create_structure(structures_data)
 
@@ -58,7 +78,14 @@ class StructurePredictionAlgorithm:
             dot_structure[points[1]-1] = symbols.BRACKET_RIGHT
 
         string_dot_structure = symbols.EMPTY.join(dot_structure)
-        PredictionOutputData.dot_bracket_structures.append(string_dot_structure)
+        self._result.dot_bracket_structures.append(string_dot_structure)
+
+    def _publish(self):
+        """
+        Copies the results of the run into the class attributes of PredictionOutputData if this is wanted.
+        """
+        if self._publish_output:
+            self._result.publish()
 
     def _traceback(self, vec, backtracking):
         """
@@ -72,8 +99,8 @@ class StructurePredictionAlgorithm:
         path.append(vec)
 
         backtracking.traceback_one(path, self._data)
-        if len(PredictionOutputData.table_values) > 0:
-            return [backtracking.base_pairs, PredictionOutputData.table_values[0][self._tbl_len_x - 1]]
+        if len(self._result.table_values) > 0:
+            return [backtracking.base_pairs, self._result.table_values[0][self._tbl_len_x - 1]]
         else:
             return [backtracking.base_pairs, 0]
 
@@ -81,13 +108,13 @@ class StructurePredictionAlgorithm:
         """
         Outputs a nice string on the console.
         """
-        if len(PredictionOutputData.table_values) > 0:
-            print(words.OPTIMAL_BASEPAIRS_NUMBER + str(PredictionOutputData.table_values[0][self._tbl_len_x - 1]))
+        if len(self._result.table_values) > 0:
+            print(words.OPTIMAL_BASEPAIRS_NUMBER + str(self._result.table_values[0][self._tbl_len_x - 1]))
         else:
             print(words.OPTIMAL_BASEPAIRS_NUMBER + str(0))
 
         print(words.OPTIMAL_STRUCTURE)
-        formatted_lines = CharacterFormat().lines_output(PredictionOutputData.dot_bracket_structures,
+        formatted_lines = CharacterFormat().lines_output(self._result.dot_bracket_structures,
                                                          self._data.sequence)
 
         for structure in formatted_lines:
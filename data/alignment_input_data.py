@@ -1,11 +1,18 @@
+from data.end_gaps import EndGaps
+
 import system.string_symbols as strings
 import system.defaults as d
 
 class AlignmentInputData:
     '''
     Stores the input data of an alignment algorithm to give easy access on it.
+    The sequences are also stored as character codes of the cost function (see CostFunction.encode).
     '''
+    global codes_a
+    global codes_b
+    global codes_c
     global cost_function
+    global end_gaps
     global gap_cost
     global gap_alpha
     global gap_beta
@@ -21,7 +28,8 @@ class AlignmentInputData:
                        sequence_a,
                        sequence_b,
                        sequence_c = strings.EMPTY,
-                       ids = [d.SEQ_1, d.SEQ_2, d.SEQ_3]):
+                       ids = [d.SEQ_1, d.SEQ_2, d.SEQ_3],
+                       end_gaps = None):
         '''
         Initializes the input data with values you need to use Needleman-Wunsch algorithm.
 
@@ -31,6 +39,8 @@ class AlignmentInputData:
             sequence_a: first string you want to align with another string
             sequence_b: second string you want to align with another string
             sequence_c: third string you want to align with another string
+            ids: ids of the sequences
+            end_gaps: EndGaps which are free in a pairwise alignment (None for a global alignment)
 
         Returns:
             object of that class
@@ -42,7 +52,12 @@ class AlignmentInputData:
         self.sequence_b = sequence_b
         self.sequence_c = sequence_c
 
+        self.codes_a = cost_function.encode(sequence_a)
+        self.codes_b = cost_function.encode(sequence_b)
+        self.codes_c = cost_function.encode(sequence_c)
+
         self.ids = ids
+        self.end_gaps = EndGaps() if end_gaps is None else end_gaps
         return self
 
     def init_gotoh(self,
@@ -51,7 +66,8 @@ class AlignmentInputData:
                    gap_beta,
                    sequence_a,
                    sequence_b,
-                   ids = [d.SEQ_1, d.SEQ_2]):
+                   ids = [d.SEQ_1, d.SEQ_2],
+                   end_gaps = None):
         '''
         Initializes the input data with values you need to use Gotoh algorithm.
 
@@ -61,6 +77,8 @@ class AlignmentInputData:
             gap_beta: costs for gap extension
             sequence_a: first string you want to align with another string
             sequence_b: second string you want to align with another string
+            ids: ids of the sequences
+            end_gaps: EndGaps which are free (None for a global alignment)
 
         Returns:
             object of that class
@@ -71,5 +89,8 @@ class AlignmentInputData:
         self.gap_opening = gap_alpha + gap_beta
         self.sequence_a = sequence_a
         self.sequence_b = sequence_b
+        self.codes_a = cost_function.encode(sequence_a)
+        self.codes_b = cost_function.encode(sequence_b)
         self.ids = ids
+        self.end_gaps = EndGaps() if end_gaps is None else end_gaps
         return self
\ No newline at end of file
@@ -1,13 +1,48 @@
 class AlignmentOutputData:
     '''
     Stores the output data of an alignment algorithm to give easy access on it.
+    Each run of an algorithm stores its results in its own instance, so alignments can run in parallel threads.
+    The class attributes are only a copy of the results of the last published run (see publish)
+    and exist for code which still reads them from the class.
     '''
     global alignments
+    global graph
+    global moves
     global paths
+    global score
+    global table_directions
+    global table_directions_3d
     global table_values
     global table_values_3d
     global table_values_xy
     global table_values_xz
     global table_values_yz
     global table_horizontal_gaps
-    global table_vertical_gaps
\ No newline at end of file
+    global table_vertical_gaps
+
+    def __init__(self):
+        '''
+        Creates empty output data for one run of an algorithm.
+        '''
+        self.alignments = []
+        self.graph = None
+        self.moves = []
+        self.paths = []
+        self.score = None
+        self.table_directions = None
+        self.table_directions_3d = None
+        self.table_values = None
+        self.table_values_3d = None
+        self.table_values_xy = None
+        self.table_values_xz = None
+        self.table_values_yz = None
+        self.table_horizontal_gaps = None
+        self.table_vertical_gaps = None
+
+    def publish(self):
+        '''
+        Copies the results of this run into the class attributes,
+        where they were stored by all algorithms before.
+        '''
+        for name, value in vars(self).items():
+            setattr(AlignmentOutputData, name, value)
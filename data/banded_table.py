@@ -0,0 +1,112 @@
+import system.string_symbols as strings
+
+class BandedTable:
+    '''
+    Stores only a diagonal band of a matrix.
+    Row y stores the cells of the columns offsets[y] to offsets[y] + width - 1
+    one after another in a flat list. All other cells have the value empty (NEGATIVE_INFINITY by default).
+    Rows can be accessed like the rows of a list based matrix (table[y][x]).
+    '''
+
+    global empty
+    global len_x
+    global offsets
+    global values
+    global width
+
+    def __init__(self, len_y, len_x, lowest_diagonal, highest_diagonal, empty=strings.NEGATIVE_INFINITY):
+        '''
+        Creates a band which contains all cells (y, x) with lowest_diagonal <= x - y <= highest_diagonal.
+
+        Args:
+            len_y: number of rows of the matrix
+            len_x: number of columns of the matrix
+            lowest_diagonal: lowest diagonal x - y in the band
+            highest_diagonal: highest diagonal x - y in the band
+            empty: value of the cells which are not set or not in the band
+        '''
+        self.empty = empty
+        self.len_x = len_x
+        self.width = highest_diagonal - lowest_diagonal + 1
+        self.offsets = [y + lowest_diagonal for y in range(0, len_y)]
+        self.values = [empty] * (len_y * self.width)
+
+    def get(self, y, x):
+        '''
+        Returns the value of a cell.
+
+        Args:
+            y: row of the cell
+            x: column of the cell
+        '''
+        position = x - self.offsets[y]
+
+        if 0 <= position < self.width and 0 <= x < self.len_x:
+            return self.values[y * self.width + position]
+        return self.empty
+
+    def set(self, y, x, value):
+        '''
+        Sets the value of a cell in the band.
+
+        Args:
+            y: row of the cell
+            x: column of the cell
+            value: the new value
+        '''
+        self.values[y * self.width + x - self.offsets[y]] = value
+
+    def columns(self, y):
+        '''
+        Returns the columns of a row which are in the band.
+
+        Args:
+            y: the row
+        '''
+        return range(max(0, self.offsets[y]), min(self.len_x, self.offsets[y] + self.width))
+
+    def __getitem__(self, y):
+        '''
+        Returns a row of the matrix.
+
+        Args:
+            y: the row
+        '''
+        return BandedRow(self, y)
+
+    def __len__(self):
+        '''Returns the number of rows.'''
+        return len(self.offsets)
+
+class BandedRow:
+    '''
+    Gives access to one row of a banded table.
+    '''
+
+    def __init__(self, table, y):
+        '''
+        Args:
+            table: the banded table
+            y: the row
+        '''
+        self.__table = table
+        self.__y = y
+
+    def __getitem__(self, x):
+        '''
+        Returns the value in a column.
+
+        Args:
+            x: the column
+        '''
+        return self.__table.get(self.__y, x)
+
+    def __setitem__(self, x, value):
+        '''
+        Sets the value in a column.
+
+        Args:
+            x: the column
+            value: the new value
+        '''
+        self.__table.set(self.__y, x, value)
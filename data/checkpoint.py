@@ -0,0 +1,181 @@
+import hashlib
+import os
+import pickle
+import queue
+import threading
+import time
+
+from system import messages
+
+class Checkpoint:
+    '''
+    Stores the progress of a matrix fill in a file, so a fill which is killed can be continued (resumed).
+    The file begins with a hash of the parameters of the fill, followed by one record per checkpoint.
+    A record contains the direction bits of the rows (or layers) which are completed since the checkpoint before,
+    because the traceback needs all of them, and the values of the last completed row (or layer),
+    because the fill only needs them to continue. The values of the rows before are not restored.
+
+    The records are only appended to the file, so a fill which is killed while a record is written
+    only loses this record. They are written by a thread, so the fill only copies the rows
+    and does not wait for the file, unless the records before are still being written.
+    Only resume from files you have written yourself, because the records are pickled.
+    '''
+
+    INTERVAL_SECONDS = 600
+
+    __QUEUE_SIZE = 2
+
+    global cells
+    global path
+    global seconds
+
+    def __init__(self, path, seconds=None, cells=None):
+        '''
+        Creates a checkpoint which is written after a number of seconds or a number of computed cells.
+
+        Args:
+            path: path of the checkpoint file
+            seconds: minimal number of seconds between two checkpoints
+            cells: minimal number of computed cells between two checkpoints
+                (if both are None, a checkpoint is written every INTERVAL_SECONDS seconds)
+        '''
+        self.path = path
+        self.seconds = self.INTERVAL_SECONDS if seconds is None and cells is None else seconds
+        self.cells = cells
+        self.__computed_cells = 0
+        self.__last_time = time.monotonic()
+        self.__queue = None
+        self.__thread = None
+        self.__error = None
+
+    def open(self, parameters, resume):
+        '''
+        Starts the writing of the checkpoints and returns the records of the last fill with the same parameters.
+
+        Args:
+            parameters: all parameters which have an influence on the matrices
+            resume: if True, the records of the existing file are returned and new records are appended,
+                otherwise the file is replaced
+
+        Returns:
+            list of records (first completed row, last completed row, rows with direction bits, rows with values)
+        '''
+        parameters_hash = hashlib.sha256(repr(parameters).encode()).hexdigest()
+        records = None
+
+        if resume and os.path.isfile(self.path):
+            records, end = self.__read(parameters_hash)
+
+        if records is not None:
+            file = open(self.path, "r+b")
+            file.seek(end)
+            file.truncate()
+        else:
+            records = []
+            file = open(self.path, "wb")
+            self.__append(file, parameters_hash)
+
+        self.__computed_cells = 0
+        self.__last_time = time.monotonic()
+        self.__queue = queue.Queue(self.__QUEUE_SIZE)
+        self.__thread = threading.Thread(target=self.__write_records, args=(file,), daemon=True)
+        self.__thread.start()
+
+        return records
+
+    def is_due(self, cells):
+        '''
+        Counts computed cells and returns if a checkpoint has to be written.
+
+        Args:
+            cells: number of cells computed since the last call
+        '''
+        self.__computed_cells += cells
+
+        return (self.cells is not None and self.__computed_cells >= self.cells) \
+            or (self.seconds is not None and time.monotonic() - self.__last_time >= self.seconds)
+
+    def write(self, first, last, directions, values):
+        '''
+        Passes a record to the thread which writes it.
+
+        Args:
+            first: first row (or layer) which is completed since the last checkpoint
+            last: last completed row (or layer)
+            directions: copies of the rows with the direction bits of the completed rows (or layers)
+            values: copies of the rows with the values of the last completed row (or layer)
+        '''
+        self.__queue.put((first, last, directions, values))
+        self.__computed_cells = 0
+        self.__last_time = time.monotonic()
+
+    def close(self):
+        '''
+        Waits until all records are written and closes the file.
+        '''
+        self.__queue.put(None)
+        self.__thread.join()
+
+        if self.__error is not None:
+            raise self.__error
+
+    def __read(self, parameters_hash):
+        '''
+        Reads the complete records of the checkpoint file.
+
+        Args:
+            parameters_hash: hash of the parameters of the fill
+
+        Returns:
+            tuple (list of records or None if the file has no complete hash, position after the last complete record)
+        '''
+        records = []
+
+        with open(self.path, "rb") as file:
+            try:
+                if pickle.load(file) != parameters_hash:
+                    raise ValueError(messages.CHECKPOINT_MISMATCH)
+            except (EOFError, pickle.UnpicklingError):  # the fill was killed before the hash was written
+                return None, 0
+
+            end = file.tell()
+            try:
+                while True:
+                    records.append(pickle.load(file))
+                    end = file.tell()
+            except (EOFError, pickle.UnpicklingError):  # end of the file or a record which was not completed
+                pass
+
+        return records, end
+
+    def __write_records(self, file):
+        '''
+        Appends the records of the queue to the file until the queue contains None.
+
+        Args:
+            file: the opened checkpoint file
+        '''
+        with file:
+            while True:
+                record = self.__queue.get()
+
+                if record is None:
+                    return
+
+                if self.__error is None:
+                    try:
+                        self.__append(file, record)
+                    except OSError as error:  # raised by close, so the fill is not stopped
+                        self.__error = error
+
+    def __append(self, file, record):
+        '''
+        Appends a record to the file and waits until it is stored on the disk.
+
+        Args:
+            file: the opened checkpoint file
+            record: the record
+        '''
+        pickle.dump(record, file)
+        file.flush()
+        os.fsync(file.fileno())
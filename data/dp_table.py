@@ -0,0 +1,216 @@
+from array import array
+
+import system.string_symbols as strings
+
+class DPTable:
+    '''
+    Stores a two- or three-dimensional dynamic programming matrix in one flat array of machine integers
+    instead of lists of Python integers, so a cell needs 2, 4 or 8 bytes instead of about 36.
+    The list rows contains the rows of the table (with three dimensions a list of lists of rows)
+    and each row is a memoryview of the flat array, so the cells are accessed like the cells
+    of a list based matrix (table[y][x] or table[z][y][x]).
+    Loops over many cells should use table.rows[y][x], because indexing a list is faster.
+
+    The integer type is the smallest one whose values are at least four times larger
+    than the largest absolute value a cell can get (bound). Cells which are not reachable
+    can so be set to negative_infinity, because it stays below all values after adding some costs.
+    If no integer type is large enough, the rows are lists of Python integers.
+
+    A list is still faster to access than a memoryview, so a row which is filled cell by cell
+    can be turned into a list (unpack_row) and be copied back into the array afterwards (pack_row).
+
+    A triangular table only stores the cells with x >= y (Nussinov). Its rows still begin at column 0,
+    but the cells left of the diagonal belong to the rows above and must not be used.
+
+    The flat array can also be a file of a scratch space (see ScratchSpace) for tables larger than the memory.
+    Then each packed row is registered as written, so the scratch space can drop it from memory.
+    '''
+
+    TYPE_CODES = ["h", "i", "q"]  # signed integers with 2, 4 and 8 bytes
+
+    global negative_infinity
+    global rows
+    global shape
+    global type_code
+    global values
+
+    def __init__(self, shape, bound, fill=0, triangular=False, type_code=None, space=None):
+        '''
+        Creates a table in which all cells have the same value.
+
+        Args:
+            shape: (len_y, len_x) or (len_z, len_y, len_x)
+            bound: largest absolute value of a cell
+            fill: initial value of the cells
+            triangular: if True, only the cells with x >= y of a two-dimensional table are stored
+            type_code: type code of the cells (None for the smallest integer type which fits to the bound)
+            space: scratch space in which the array is stored (None to store it in memory)
+        '''
+        self.shape = tuple(shape)
+        self.__triangular = triangular
+        self.__space = space
+        self.type_code = type_code if type_code is not None else self.__get_type_code(bound)
+        len_x = self.shape[-1]
+
+        if self.type_code is None:
+            self.negative_infinity = strings.NEGATIVE_INFINITY
+            self.values = None
+            rows = [[fill] * len_x for i in range(0, self.__count_rows())]
+        else:
+            self.negative_infinity = -2 * self.__get_quarter(self.type_code)
+
+            if triangular:
+                starts = self.__get_triangle_starts()
+                size = starts[-1]
+                self.__starts = [starts[y] - y for y in range(0, self.shape[0])]
+            else:
+                size = self.__count_rows() * len_x
+                self.__starts = [i * len_x for i in range(0, self.__count_rows())]
+
+            if space is None:
+                self.values = array(self.type_code, [fill]) * size
+                self.__view = memoryview(self.values)
+            else:
+                self.__buffer = space.allocate(size * array(self.type_code).itemsize)
+                self.__view = memoryview(self.__buffer).cast(self.type_code)[:size]
+                self.values = self.__view
+
+                if fill != 0:  # a new file only contains zeros
+                    for start in range(0, size, len_x):
+                        end = min(start + len_x, size)
+                        self.__view[start:end] = array(self.type_code, [fill]) * (end - start)
+
+            rows = [self.__view[start:start + len_x] for start in self.__starts]
+
+        if len(self.shape) == 3:
+            len_y = self.shape[1]
+            self.rows = [rows[z * len_y:(z + 1) * len_y] for z in range(0, self.shape[0])]
+        else:
+            self.rows = rows
+
+    def unpack_row(self, y, z=None):
+        '''
+        Replaces a row by a list with its values.
+
+        Args:
+            y: the row
+            z: the layer of the row in a three-dimensional table
+        '''
+        rows = self.rows if z is None else self.rows[z]
+
+        if self.values is not None and not isinstance(rows[y], list):
+            rows[y] = rows[y].tolist()
+
+    def pack_row(self, y, z=None):
+        '''
+        Copies the values of an unpacked row back into the array and replaces the list by the view on them.
+
+        Args:
+            y: the row
+            z: the layer of the row in a three-dimensional table
+        '''
+        rows = self.rows if z is None else self.rows[z]
+
+        if self.values is not None and isinstance(rows[y], list):
+            start = self.__starts[y if z is None else z * self.shape[1] + y]
+            row = self.__view[start:start + self.shape[-1]]
+            first = y if self.__triangular else 0  # the cells left of the diagonal belong to other rows
+            row[first:] = array(self.type_code, rows[y][first:])
+            rows[y] = row
+
+            if self.__space is not None:
+                self.__space.written(self.__buffer, start * row.itemsize, (start + len(row)) * row.itemsize)
+
+    def get_row(self, y, z=None):
+        '''
+        Returns a copy of a row which can be stored (bytes or, if no integer type is large enough, a list).
+
+        Args:
+            y: the row
+            z: the layer of the row in a three-dimensional table
+        '''
+        rows = self.rows if z is None else self.rows[z]
+
+        if self.values is None:
+            return list(rows[y])
+        if isinstance(rows[y], list):
+            return array(self.type_code, rows[y]).tobytes()
+        return rows[y].tobytes()
+
+    def set_row(self, y, row, z=None):
+        '''
+        Sets the values of a row to the values of a copy (see get_row).
+
+        Args:
+            y: the row
+            row: the copy
+            z: the layer of the row in a three-dimensional table
+        '''
+        rows = self.rows if z is None else self.rows[z]
+
+        if self.values is None:
+            rows[y] = list(row)
+        elif isinstance(rows[y], list):
+            rows[y] = memoryview(row).cast(self.type_code).tolist()
+        else:
+            rows[y][:] = memoryview(row).cast(self.type_code)
+
+    def release(self):
+        '''
+        Writes a table of a scratch space into its file and drops it from memory,
+        e.g. after its borders have been set. A table in memory is not changed.
+        '''
+        if self.__space is not None and self.values is not None:
+            self.__space.written(self.__buffer, 0, self.__view.nbytes)
+            self.__space.release()
+
+    def __getitem__(self, y):
+        '''
+        Returns a row (with three dimensions the list of rows of a layer).
+
+        Args:
+            y: the row
+        '''
+        return self.rows[y]
+
+    def __len__(self):
+        '''Returns the number of rows (with three dimensions the number of layers).'''
+        return len(self.rows)
+
+    def __count_rows(self):
+        '''Returns the number of rows of all layers.'''
+        count = 1
+        for length in self.shape[:-1]:
+            count *= length
+        return count
+
+    def __get_triangle_starts(self):
+        '''
+        Returns the position of the diagonal cell of each row of a triangular table in the flat array
+        and the length of the array as last element.
+        '''
+        starts = [0]
+        for y in range(0, self.shape[0]):
+            starts.append(starts[-1] + max(0, self.shape[1] - y))
+        return starts
+
+    def __get_type_code(self, bound):
+        '''
+        Returns the type code of the smallest integer type which can store all values and negative infinity.
+
+        Args:
+            bound: largest absolute value of a cell
+        '''
+        for type_code in self.TYPE_CODES:
+            if abs(bound) < self.__get_quarter(type_code):
+                return type_code
+        return None
+
+    def __get_quarter(self, type_code):
+        '''
+        Returns a quarter of the number of non-negative values of an integer type.
+
+        Args:
+            type_code: type code of the integer type
+        '''
+        return 2 ** (8 * array(type_code).itemsize - 1) // 4
@@ -0,0 +1,67 @@
+class EndGaps:
+    '''
+    Stores which end gaps of a pairwise alignment are free.
+    The end gaps of a sequence are the gaps before its first and after its last character.
+    In the matrix they are the first and the last row for the first sequence
+    and the first and the last column for the second sequence.
+    Free end gaps are still shown in the alignment, but they do not change its score.
+    '''
+
+    GLOBAL = "global"
+    GLOCAL = "glocal"
+    OVERLAP = "overlap"
+    SEMI_GLOBAL = "semi_global"
+
+    MODES = [GLOBAL, GLOCAL, OVERLAP, SEMI_GLOBAL]
+
+    global end_a
+    global end_b
+    global start_a
+    global start_b
+
+    def __init__(self, start_a=False, end_a=False, start_b=False, end_b=False):
+        '''
+        Creates the end gaps of an alignment.
+
+        Args:
+            start_a: if True, the gaps before the first sequence are free
+            end_a: if True, the gaps after the first sequence are free
+            start_b: if True, the gaps before the second sequence are free
+            end_b: if True, the gaps after the second sequence are free
+        '''
+        self.start_a = start_a
+        self.end_a = end_a
+        self.start_b = start_b
+        self.end_b = end_b
+
+    def from_mode(self, mode):
+        '''
+        Sets the free end gaps of an alignment mode:
+        global (no free end gaps),
+        glocal (the first sequence is aligned completely with a part of the second one, e.g. a read with a reference),
+        overlap (a suffix of the first sequence is aligned with a prefix of the second one, e.g. overlapping contigs)
+        and semi_global (all end gaps are free).
+
+        Args:
+            mode: one of the MODES
+
+        Returns:
+            object of that class
+        '''
+        self.start_a = mode in [self.GLOCAL, self.SEMI_GLOBAL]
+        self.end_a = mode in [self.GLOCAL, self.OVERLAP, self.SEMI_GLOBAL]
+        self.start_b = mode in [self.OVERLAP, self.SEMI_GLOBAL]
+        self.end_b = mode == self.SEMI_GLOBAL
+        return self
+
+    def is_global(self):
+        '''
+        Returns True if no end gap is free.
+        '''
+        return not (self.start_a or self.end_a or self.start_b or self.end_b)
+
+    def __repr__(self):
+        '''
+        Returns a string which only depends on the free end gaps, e.g. for the parameters of a checkpoint.
+        '''
+        return "EndGaps(%s, %s, %s, %s)" % (self.start_a, self.end_a, self.start_b, self.end_b)
@@ -0,0 +1,176 @@
+import re
+import system.string_symbols as strings
+
+class MoveString:
+    '''
+    Stores a pairwise alignment as a run-length encoded string of moves like a CIGAR string (e.g. b"3M1I2M").
+    M stands for a column with a character of both sequences, D for a character of the first sequence
+    and a gap and I for a gap and a character of the second sequence.
+    A run needs only a few bytes instead of one Vector per column and the aligned strings
+    are only created when they are needed (see materialize).
+    '''
+
+    MATCH = "M"
+    DELETION = "D"
+    INSERTION = "I"
+
+    __RUN = re.compile(rb"(\d+)([MDI])")
+
+    __slots__ = ("runs", "start_a", "start_b")
+
+    global runs
+    global start_a
+    global start_b
+
+    def __init__(self, runs=b"", start_a=0, start_b=0):
+        '''
+        Creates a move string.
+
+        Args:
+            runs: the encoded runs
+            start_a: position in the first sequence at which the alignment starts
+            start_b: position in the second sequence at which the alignment starts
+        '''
+        self.runs = runs
+        self.start_a = start_a
+        self.start_b = start_b
+
+    def from_path(self, path):
+        '''
+        Encodes a traceback path. Steps which do not change the cell (changes of the matrix) are skipped.
+
+        Args:
+            path: list of positions from the end of the alignment to its start (like the traceback creates it)
+
+        Returns:
+            object of that class
+        '''
+        moves = []
+
+        for i in range(len(path) - 1, 0, -1):
+            step_x = path[i - 1].x - path[i].x
+            step_y = path[i - 1].y - path[i].y
+
+            if step_x > 0 and step_y > 0:
+                moves.append(self.MATCH)
+            elif step_y > 0:
+                moves.append(self.DELETION)
+            elif step_x > 0:
+                moves.append(self.INSERTION)
+
+        self.start_a = path[-1].y
+        self.start_b = path[-1].x
+        return self.__encode(moves)
+
+    def from_alignment(self, alignment_a, alignment_b, start_a=0, start_b=0):
+        '''
+        Encodes the aligned strings of an alignment.
+
+        Args:
+            alignment_a: first row of the alignment
+            alignment_b: second row of the alignment
+            start_a: position in the first sequence at which the alignment starts
+            start_b: position in the second sequence at which the alignment starts
+
+        Returns:
+            object of that class
+        '''
+        moves = []
+
+        for i in range(0, len(alignment_a)):
+            if alignment_a[i] == strings.GAP:
+                moves.append(self.INSERTION)
+            elif alignment_b[i] == strings.GAP:
+                moves.append(self.DELETION)
+            else:
+                moves.append(self.MATCH)
+
+        self.start_a = start_a
+        self.start_b = start_b
+        return self.__encode(moves)
+
+    def materialize(self, sequence_a, sequence_b):
+        '''
+        Creates the aligned strings.
+
+        Args:
+            sequence_a: first sequence
+            sequence_b: second sequence
+
+        Returns:
+            [alignment_a, alignment_b]
+        '''
+        parts_a = []
+        parts_b = []
+        position_a = self.start_a
+        position_b = self.start_b
+
+        for move, length in self:
+            if move == self.INSERTION:
+                parts_a.append(strings.GAP * length)
+            else:
+                parts_a.append(sequence_a[position_a:position_a + length])
+                position_a += length
+
+            if move == self.DELETION:
+                parts_b.append(strings.GAP * length)
+            else:
+                parts_b.append(sequence_b[position_b:position_b + length])
+                position_b += length
+
+        return [strings.EMPTY.join(parts_a), strings.EMPTY.join(parts_b)]
+
+    def count_gaps(self):
+        '''
+        Returns the number of columns with a gap.
+        '''
+        return sum([length for (move, length) in self if move != self.MATCH])
+
+    def __encode(self, moves):
+        '''
+        Stores a list of moves as runs.
+
+        Args:
+            moves: list with one move for each column
+        '''
+        runs = []
+        length = 0
+
+        for i in range(0, len(moves)):
+            length += 1
+
+            if i == len(moves) - 1 or moves[i + 1] != moves[i]:
+                runs.append(str(length) + moves[i])
+                length = 0
+
+        self.runs = strings.EMPTY.join(runs).encode()
+        return self
+
+    def __iter__(self):
+        '''
+        Returns the runs as tuples (move, length).
+        '''
+        return ((move.decode(), int(length)) for (length, move) in self.__RUN.findall(self.runs))
+
+    def __len__(self):
+        '''Returns the number of columns.'''
+        return sum([length for (move, length) in self])
+
+    def __eq__(self, other):
+        '''
+        Defines when two move strings are equal.
+
+        Args:
+            other: second object
+        '''
+        if isinstance(other, MoveString):
+            return self.runs == other.runs and self.start_a == other.start_a and self.start_b == other.start_b
+        return False
+
+    def __hash__(self):
+        '''Returns the hash value, which is the same for equal move strings.'''
+        return hash((self.runs, self.start_a, self.start_b))
+
+    def __str__(self):
+        '''Returns the runs as string.'''
+        return self.runs.decode()
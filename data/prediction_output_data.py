@@ -1,7 +1,25 @@
 class PredictionOutputData:
     '''
     Stores the output data of an prediction algorithm to give easy access on it.
+    Each run of an algorithm stores its results in its own instance, so predictions can run in parallel threads.
+    The class attributes are only a copy of the results of the last published run (see publish).
     '''
     global dot_bracket_structures
     global structures
-    global table_values
\ No newline at end of file
+    global table_values
+
+    def __init__(self):
+        '''
+        Creates empty output data for one run of an algorithm.
+        '''
+        self.dot_bracket_structures = []
+        self.structures = None
+        self.table_values = None
+
+    def publish(self):
+        '''
+        Copies the results of this run into the class attributes,
+        where they were stored by all algorithms before.
+        '''
+        for name, value in vars(self).items():
+            setattr(PredictionOutputData, name, value)
@@ -0,0 +1,82 @@
+import mmap
+import tempfile
+
+class ScratchSpace:
+    '''
+    Stores the arrays of dynamic programming matrices in files of a scratch directory instead of in memory,
+    so matrices which are larger than the memory can be filled and traced back.
+    Each array is a memory mapped temporary file, which is deleted as soon as the array is not used anymore.
+
+    The rows of a matrix are written one after another (see DPTable.pack_row).
+    When the bytes written since the last release exceed the memory budget,
+    they are written into the files and dropped from memory, so the memory of the process
+    is bounded by the budget instead of by the size of the matrices.
+    Cells which are read again (traceback) are loaded by the operating system from the files
+    and can be dropped again by it at any time, because they are not changed anymore.
+    '''
+
+    MEMORY_BUDGET = 2 ** 28  # bytes
+
+    global directory
+    global memory_budget
+
+    def __init__(self, directory=None, memory_budget=MEMORY_BUDGET):
+        '''
+        Creates a scratch space without arrays.
+
+        Args:
+            directory: directory of the files (None for the temporary directory of the system)
+            memory_budget: number of written bytes which are kept in memory before they are released
+        '''
+        self.directory = directory
+        self.memory_budget = memory_budget
+        self.__written = {}  # the buffer and the range of bytes written since the last release for each buffer
+        self.__unreleased = 0
+
+    def allocate(self, size):
+        '''
+        Returns a new writable buffer of zeros which is stored in a temporary file.
+
+        Args:
+            size: number of bytes (the buffer is rounded up to a multiple of the page size)
+        '''
+        size = max(1, -(-size // mmap.PAGESIZE)) * mmap.PAGESIZE
+
+        # the file is deleted when it is closed, but its content stays available until the buffer is unmapped
+        with tempfile.TemporaryFile(dir=self.directory) as file:
+            file.truncate(size)
+            return mmap.mmap(file.fileno(), size)
+
+    def written(self, buffer, start, end):
+        '''
+        Registers written bytes of a buffer and releases all written bytes if they exceed the memory budget.
+
+        Args:
+            buffer: a buffer of this scratch space
+            start: position of the first written byte
+            end: position after the last written byte
+        '''
+        entry = self.__written.setdefault(id(buffer), [buffer, end, start])
+        entry[1] = min(entry[1], start)
+        entry[2] = max(entry[2], end)
+        self.__unreleased += end - start
+
+        if self.__unreleased > self.memory_budget:
+            self.release()
+
+    def release(self):
+        '''
+        Writes the written bytes of all buffers into their files and drops them from memory.
+        '''
+        for entry in self.__written.values():
+            buffer, start, end = entry
+            start -= start % mmap.PAGESIZE  # a range must begin at a page
+
+            if end > start:
+                buffer.flush(start, end - start)
+
+                if hasattr(mmap, "MADV_DONTNEED"):  # not available on all systems
+                    buffer.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+        self.__written = {}
+        self.__unreleased = 0
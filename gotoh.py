@@ -1,11 +1,23 @@
 from prakt.gt import GotohBase
 
 import system.string_symbols as strings
+from algorithms import available_engines as engines
 from algorithms.alignment.alignment_algorithm import AlignmentAlgorithm
+from algorithms.alignment.banded_engine import BandedEngine
+from algorithms.alignment.batch_engine import BatchEngine
+from algorithms.alignment.myers_miller import MyersMiller
+from algorithms.alignment.row_engine import RowEngine
+from algorithms.alignment.striped_engine import StripedEngine
+from algorithms.alignment.tiled_engine import TiledEngine
+from algorithms.alignment.wfa_engine import WfaEngine
+from algorithms.alignment.xdrop_engine import XDropEngine
 from algorithms.backtracking.multi_table_backtracking import MultiTableBacktracking
 from data.alignment_input_data import AlignmentInputData
-from data.alignment_output_data import AlignmentOutputData
+from data.dp_table import DPTable
+from data.end_gaps import EndGaps
+from data.move_string import MoveString
 from formats.fasta import Fasta
+from formats.multi_fasta_format import MultiFasta
 from maths.cost_function import CostFunction
 from maths.matrix_types import MATRICES
 from maths.vector import Vector
@@ -16,7 +28,7 @@ import os
 @GotohBase.register
 class Gotoh(GotohBase, AlignmentAlgorithm):
     """
-    Computes optimal, affine, global alignment.
+    Computes optimal, affine, global alignment, optionally with free end gaps (see EndGaps).
     """
 
     def compute(self, input):
@@ -27,7 +39,7 @@ class Gotoh(GotohBase, AlignmentAlgorithm):
         Args:
             input: input from console
         """
-        if self.__input_ok(input):
+        if self._input_ok(input):
             gap_alpha = input[2]
             gap_beta = input[3]
             sequence_a_path = input[4]
@@ -38,16 +50,34 @@ class Gotoh(GotohBase, AlignmentAlgorithm):
             else:
                 traceback_mode = strings.EMPTY
 
+            if len(input) >= 8:
+                engine = input[7]
+            else:
+                engine = engines.PYTHON
+
+            if len(input) >= 9:
+                max_alignments = input[8]
+            else:
+                max_alignments = None
+
+            if len(input) >= 10:
+                end_gaps = EndGaps().from_mode(input[9])
+            else:
+                end_gaps = None
+
             self.run(sequence_a_path,
                      sequence_b_path,
                      CostFunction(input[1]).get_path(),
                      gap_alpha,
                      gap_beta,
-                     traceback_mode == self.TRACEBACK_ALL)
+                     traceback_mode == self.TRACEBACK_ALL,
+                     engine,
+                     max_alignments,
+                     end_gaps=end_gaps)
         else:
             print(messages.WRONG_PATHS)
 
-    def __input_ok(self, input):
+    def _input_ok(self, input):
         """
         Checks whether the input is correct
         or not.
@@ -70,9 +100,10 @@ class Gotoh(GotohBase, AlignmentAlgorithm):
             return False
 
     def run(self, seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, affine_cost_gap_open, affine_cost_gap_extend,
-            complete_traceback):
+            complete_traceback, engine=engines.PYTHON, max_alignments=None, seed=None, checkpoint=None, resume=False,
+            end_gaps=None):
         """
-        Calculate optimal alignment(s) with Needleman-Wunsch algorithm.
+        Calculate optimal alignment(s) with the Gotoh algorithm.
 
         Args:
             seq1_fasta_fn: path to fasta file containing first sequence
@@ -81,6 +112,16 @@ class Gotoh(GotohBase, AlignmentAlgorithm):
             cost_gap_open: cost to open a gap
             cost_gap_extend: cost to extend a gap
             complete_traceback: If True, return all optimal alignments. Otherwise choose a random alignment.
+            engine: engine which fills the matrices (see available_engines), the results do not depend on it,
+                except for the linear space and the wavefront engine which only return one optimal alignment,
+                the wavefront engine needs a substitution matrix with one match and one mismatch score
+            max_alignments: maximum number of optimal alignments returned with complete_traceback (None for all),
+                otherwise number of randomly chosen optimal alignments (None for one)
+            seed: seed for the random choice of optimal alignments (each one is chosen with the same probability)
+            checkpoint: Checkpoint which stores the progress of the fill (None for no checkpoints),
+                only the Python engine supports them and only without free end gaps
+            resume: if True, the fill continues after the last checkpoint of a fill with the same parameters
+            end_gaps: EndGaps which are free (None for a global alignment), only the Python engine supports them
 
         Returns:
             tuple of
@@ -92,46 +133,239 @@ class Gotoh(GotohBase, AlignmentAlgorithm):
              [(aln_string_seq1, aln_string_seq2), ...]: list of tuples containing optimal alignments)
         """
 
-        self.__evaluate_parameters(seq1_fasta_fn,
-                                   seq2_fasta_fn,
-                                   subst_matrix_fn,
-                                   affine_cost_gap_open,
-                                   affine_cost_gap_extend,
-                                   complete_traceback)
-        self.__initialize_tables()
-        self._compute_alignments()
-        # print(self._data.cost_function.get_value("O", "Z"))
-
-        backtracking = MultiTableBacktracking()
-        main_lbl = backtracking.MATRIX_LBL_MAIN
-
-        if self._traceback_mode == self.TRACEBACK_ALL:
-            AlignmentOutputData.paths = \
-                self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1).create(main_lbl), True, backtracking)
-            self._create_alignments()
+        self._evaluate_parameters(seq1_fasta_fn,
+                                  seq2_fasta_fn,
+                                  subst_matrix_fn,
+                                  affine_cost_gap_open,
+                                  affine_cost_gap_extend,
+                                  complete_traceback,
+                                  end_gaps)
+        self._checkpoint = checkpoint
+        self._resume = resume
+
+        if not self._data.end_gaps.is_global() and engine != engines.PYTHON:
+            raise ValueError(messages.END_GAPS_ENGINE)
+
+        if checkpoint is not None and engine != engines.PYTHON:
+            raise ValueError(messages.CHECKPOINT_ENGINE)
+
+        if checkpoint is not None and not self._data.end_gaps.is_global():
+            raise ValueError(messages.CHECKPOINT_END_GAPS)
+
+        if engine == engines.LINEAR:
+            self._result.score, alignment = MyersMiller().align(self._data)
+            self._result.moves = [MoveString().from_alignment(alignment[0], alignment[1])]
+            self._result.graph = None
+        elif engine == engines.WFA:
+            self._result.score, moves = WfaEngine().align(self._data)
+            self._result.moves = [moves]
+            self._result.graph = None
         else:
-            AlignmentOutputData.paths = \
-                self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1).create(main_lbl), False, backtracking)
-            self._create_alignments()
+            self._align_with_tables(engine, max_alignments, seed)
 
         self._output()
+        self._publish()
 
         return (self._data.ids[0],
                 self._data.sequence_a,
                 self._data.ids[1],
                 self._data.sequence_b,
-                AlignmentOutputData.table_values[self._tbl_len_y - 1][self._tbl_len_x - 1],
-                AlignmentOutputData.alignments)
+                self._result.score,
+                self._result.alignments)
+
+    def run_batch(self, pairs, subst_matrix_fn, affine_cost_gap_open, affine_cost_gap_extend, with_alignments=False):
+        """
+        Calculate the optimal scores of many pairs of sequences with the batch engine (needs NumPy).
+        The substitution matrix is read only once and the pairs are aligned together in buckets of similar length.
+
+        Args:
+            pairs: list of tuples (sequence_a, sequence_b)
+            subst_matrix_fn: path to substitution matrix
+            affine_cost_gap_open: cost to open a gap
+            affine_cost_gap_extend: cost to extend a gap
+            with_alignments: If True, one optimal alignment of each pair is created.
+
+        Returns:
+            list with a tuple (score, [aln_string_seq1, aln_string_seq2]) for each pair,
+            the alignment is None if with_alignments is False
+        """
+        cost_function = CostFunction()
+        cost_function.set_matrix(subst_matrix_fn)
+
+        return BatchEngine().align_gotoh(cost_function, affine_cost_gap_open, affine_cost_gap_extend, pairs,
+                                         with_alignments)
+
+    def score_all(self, query_fasta_fn, database_fasta_fn, subst_matrix_fn, affine_cost_gap_open,
+                  affine_cost_gap_extend):
+        """
+        Calculate the optimal scores of a query with each sequence of a database
+        with the striped engine (needs NumPy). The scores are the same as the scores of run.
+
+        Args:
+            query_fasta_fn: path to fasta file containing the query (first sequence of each alignment)
+            database_fasta_fn: path to multi fasta file containing the other sequences
+            subst_matrix_fn: path to substitution matrix
+            affine_cost_gap_open: cost to open a gap
+            affine_cost_gap_extend: cost to extend a gap
 
-    def __evaluate_parameters(self,
-                              seq1_fasta_fn,
-                              seq2_fasta_fn,
-                              subst_matrix_fn,
-                              affine_cost_gap_open,
-                              affine_cost_gap_extend,
-                              complete_traceback):
+        Returns:
+            list of tuples (id of the database sequence, score of optimal alignment with the query)
         """
-        Calculate optimal alignment(s) with Needleman-Wunsch algorithm.
+        cost_function = CostFunction()
+        cost_function.set_matrix(subst_matrix_fn)
+
+        query = Fasta().get_sequence(query_fasta_fn)
+        database = MultiFasta().get_all_sequences(database_fasta_fn)
+        sequences = [Fasta().get_sequence_from_string(sequence_text) for sequence_text in database]
+        sequence_ids = [Fasta().get_id(sequence_text) for sequence_text in database]
+
+        scores = StripedEngine().compute_gotoh_scores(cost_function, affine_cost_gap_open, affine_cost_gap_extend,
+                                                       query, sequences)
+
+        return list(zip(sequence_ids, scores))
+
+    def extend_seed(self, sequence_a, sequence_b, subst_matrix_fn, affine_cost_gap_open, affine_cost_gap_extend,
+                    seed_a, seed_b, x_drop, seed_length=1):
+        """
+        Extends a seed of two sequences to both sides with the X-drop engine: each side ends in its best cell
+        and the exploration of a side stops when all scores are more than x_drop below the best score of this side.
+
+        Args:
+            sequence_a: first sequence
+            sequence_b: second sequence
+            subst_matrix_fn: path to substitution matrix
+            affine_cost_gap_open: cost to open a gap
+            affine_cost_gap_extend: cost to extend a gap
+            seed_a: position of the seed in the first sequence
+            seed_b: position of the seed in the second sequence
+            x_drop: largest difference between the best score and the score of an explored cell
+            seed_length: number of characters of the seed (at least one), they are aligned without gaps
+
+        Returns:
+            tuple (score of the extended alignment, start in the first sequence, start in the second sequence,
+            [aln_string_seq1, aln_string_seq2])
+        """
+        cost_function = CostFunction()
+        cost_function.set_matrix(subst_matrix_fn)
+        input_data = AlignmentInputData().init_gotoh(cost_function, affine_cost_gap_open, affine_cost_gap_extend,
+                                                     sequence_a, sequence_b)
+
+        score, moves = XDropEngine().extend(input_data, seed_a, seed_b, x_drop, seed_length)
+        return score, moves.start_a, moves.start_b, moves.materialize(sequence_a, sequence_b)
+
+    def get_score(self, cost_function, affine_cost_gap_open, affine_cost_gap_extend, sequence_a, sequence_b,
+                  end_gaps=None):
+        """
+        Returns the optimal score without a traceback, only one row of each matrix is kept.
+        With free gaps after a sequence, its alignment can end in each cell of the last row or column
+        and the remaining characters are aligned with free gaps, so only these cells are compared.
+
+        Args:
+            cost_function: initialized evaluation function used to evaluate alignment
+            affine_cost_gap_open: cost to open a gap
+            affine_cost_gap_extend: cost to extend a gap
+            sequence_a: first sequence
+            sequence_b: second sequence
+            end_gaps: EndGaps which are free (None for a global alignment)
+
+        Returns:
+            score of an optimal alignment
+        """
+        self._set_parameters(cost_function, affine_cost_gap_open, affine_cost_gap_extend, sequence_a, sequence_b,
+                             strings.EMPTY, strings.EMPTY, end_gaps)
+        gap_alpha = self._data.gap_alpha
+        gap_beta = self._data.gap_beta
+        gap_opening = self._data.gap_opening
+        end_gaps = self._data.end_gaps
+        scores = self._data.cost_function.get_scores()
+        codes_b = self._data.codes_b
+
+        row = [0] + [0 if end_gaps.start_a else gap_alpha + gap_beta * x for x in range(1, self._tbl_len_x)]
+        vertical_gaps_row = [strings.NEGATIVE_INFINITY] * self._tbl_len_x
+        best_in_column = row[-1]
+
+        for y in range(1, self._tbl_len_y):
+            scores_a = scores[self._data.codes_a[y - 1]]
+            diagonal = row[0]
+            value = row[0] = 0 if end_gaps.start_b else gap_alpha + gap_beta * y
+            horizontal_gap = strings.NEGATIVE_INFINITY
+
+            for x in range(1, self._tbl_len_x):
+                horizontal_gap = max(horizontal_gap + gap_beta, value + gap_opening)
+                vertical_gap = max(vertical_gaps_row[x] + gap_beta, row[x] + gap_opening)
+                value = max(diagonal + scores_a[codes_b[x - 1]], horizontal_gap, vertical_gap)
+
+                diagonal = row[x]
+                row[x] = value
+                vertical_gaps_row[x] = vertical_gap
+
+            best_in_column = max(best_in_column, row[-1])
+
+        ends = [row[-1]]
+
+        if end_gaps.end_b:
+            ends.append(best_in_column)
+
+        if end_gaps.end_a:
+            ends.extend(row)
+
+        return max(ends)
+
+    def _align_with_tables(self, engine, max_alignments, seed):
+        """
+        Fills the three Gotoh matrices and creates the alignments with a traceback.
+
+        Args:
+            engine: engine which fills the matrices
+            max_alignments: maximum number of optimal alignments of a complete traceback (None for all),
+                otherwise number of randomly chosen optimal alignments (None for one)
+            seed: seed for the random choice of optimal alignments
+        """
+        if engine == engines.NUMPY:
+            (self._result.table_values,
+             self._result.table_horizontal_gaps,
+             self._result.table_vertical_gaps,
+             self._result.table_directions) = RowEngine().compute_gotoh(self._data)
+        elif engine == engines.BANDED:
+            (self._result.table_values,
+             self._result.table_horizontal_gaps,
+             self._result.table_vertical_gaps,
+             self._result.table_directions) = BandedEngine().compute_gotoh(self._data)
+        elif engine == engines.TILED:
+            self._result.score, self._result.table_directions = TiledEngine().compute_gotoh(self._data)
+        else:
+            self.__initialize_tables()
+            self._compute_alignments()
+            self.__fill_end_gaps()
+        # print(self._data.cost_function.get_value("O", "Z"))
+
+        backtracking = MultiTableBacktracking(self._result)
+        main_lbl = backtracking.MATRIX_LBL_MAIN
+
+        if self._traceback_mode == self.TRACEBACK_ALL:
+            self._result.paths = \
+                self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1).create(main_lbl), True, backtracking,
+                                max_alignments)
+            self._create_alignments()
+        else:
+            self._result.paths = \
+                self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1).create(main_lbl), False, backtracking,
+                                max_alignments, seed)
+            self._create_alignments()
+
+        if self._result.table_values is not None:  # the tiled engine only keeps the direction bits
+            self._result.score = int(self._result.table_values[self._tbl_len_y - 1][self._tbl_len_x - 1])
+
+    def _evaluate_parameters(self,
+                             seq1_fasta_fn,
+                             seq2_fasta_fn,
+                             subst_matrix_fn,
+                             affine_cost_gap_open,
+                             affine_cost_gap_extend,
+                             complete_traceback,
+                             end_gaps=None):
+        """
+        Evaluates the parameters of the Gotoh algorithm.
 
         Args:
             seq1_fasta_fn: path to fasta file containing first sequence
@@ -140,6 +374,7 @@ class Gotoh(GotohBase, AlignmentAlgorithm):
             affine_cost_gap_open: cost to open a gap
             affine_cost_gap_extend: cost to extend a gap
             complete_traceback: If True, return all optimal alignments. Otherwise choose a random alignment.
+            end_gaps: EndGaps which are free (None for a global alignment)
         """
         cost_function = CostFunction()
         cost_function.set_matrix(subst_matrix_fn)
@@ -153,15 +388,18 @@ class Gotoh(GotohBase, AlignmentAlgorithm):
 
         if complete_traceback:
             self._traceback_mode = self.TRACEBACK_ALL
+        else:
+            self._traceback_mode = strings.EMPTY
 
-        self.__set_parameters(cost_function, cost_gap_open, cost_gap_extend, sequence_a, sequence_b, sequence_id_a,
-                              sequence_id_b)
+        self._set_parameters(cost_function, cost_gap_open, cost_gap_extend, sequence_a, sequence_b, sequence_id_a,
+                             sequence_id_b, end_gaps)
 
-    def __set_parameters(self, cost_function, affine_cost_gap_open, affine_cost_gap_extend, sequence_a, sequence_b,
-                         sequence_id_a,
-                         sequence_id_b):
+    def _set_parameters(self, cost_function, affine_cost_gap_open, affine_cost_gap_extend, sequence_a, sequence_b,
+                        sequence_id_a,
+                        sequence_id_b,
+                        end_gaps=None):
         """
-        Sets the parameters needed for the calculation with the  Needleman-Wunsch algorithm.
+        Sets the parameters needed for the calculation with the Gotoh algorithm.
 
         Args:
                cost_function: initialized evaluation function used to evaluate alignment
@@ -171,87 +409,200 @@ class Gotoh(GotohBase, AlignmentAlgorithm):
                sequence_b: second sequence
                sequence_id_a: first sequence id
                sequence_id_b: second sequence id
+               end_gaps: EndGaps which are free (None for a global alignment)
         """
         self._tbl_len_x = len(sequence_b) + 1
         self._tbl_len_y = len(sequence_a) + 1
+        self._new_output_data()
         self._data = AlignmentInputData().init_gotoh(cost_function, affine_cost_gap_open, affine_cost_gap_extend,
                                                      sequence_a,
                                                      sequence_b,
-                                                     ids=[sequence_id_a, sequence_id_b])
+                                                     ids=[sequence_id_a, sequence_id_b],
+                                                     end_gaps=end_gaps)
 
     def __initialize_tables(self):
         """
         Initializes the Gotoh matrices.
         """
-        self.__init_similarity_table()
-        self.__init_horizontal_gap_cost_table()
-        self.__init_vertical_gap_cost_table()
+        bound = self._score_bound(abs(self._data.gap_alpha) + abs(self._data.gap_beta),
+                                  self._data.codes_a, self._data.codes_b)
 
-    def __init_similarity_table(self):
+        self.__init_similarity_table(bound)
+        self.__init_horizontal_gap_cost_table(bound)
+        self.__init_vertical_gap_cost_table(bound)
+        self.__init_direction_table()
+
+    def __init_similarity_table(self, bound):
         """
         Initializes the Gotoh main matrix.
+        If the gaps before a sequence are free, its row or column of gaps gets only zeros
+        (like all its gaps if the other sequence is empty and the gaps after it are free).
+
+        Args:
+            bound: largest absolute value of a cell
         """
-        AlignmentOutputData.table_values = [[0 for x in range(self._tbl_len_x)] for x in range(self._tbl_len_y)]
+        self._result.table_values = DPTable((self._tbl_len_y, self._tbl_len_x), bound, space=self._scratch_space)
+        end_gaps = self._data.end_gaps
+        free_column = end_gaps.start_b or (end_gaps.end_b and self._tbl_len_x == 1)
+        free_row = end_gaps.start_a or (end_gaps.end_a and self._tbl_len_y == 1)
 
         for k in range(1, self._tbl_len_y):
-            for y in range(0, k):
-                AlignmentOutputData.table_values[k][0] = self._data.gap_alpha + self._data.gap_beta * k
+            self._result.table_values[k][0] = 0 if free_column else self._data.gap_alpha + self._data.gap_beta * k
 
         for k in range(1, self._tbl_len_x):
-            for x in range(0, k):
-                AlignmentOutputData.table_values[0][k] = self._data.gap_alpha + self._data.gap_beta * k
+            self._result.table_values[0][k] = 0 if free_row else self._data.gap_alpha + self._data.gap_beta * k
 
-    def __init_horizontal_gap_cost_table(self):
+    def __init_horizontal_gap_cost_table(self, bound):
         """
         Initializes the Gotoh matrix for horizontal costs.
+        The cells of the first row are never used, so like the first column they get negative infinity.
+
+        Args:
+            bound: largest absolute value of a cell
         """
-        AlignmentOutputData.table_horizontal_gaps = [[0 for x in range(self._tbl_len_x)] for x in
-                                                     range(self._tbl_len_y)]
+        table = DPTable((self._tbl_len_y, self._tbl_len_x), bound, space=self._scratch_space)
+        self._result.table_horizontal_gaps = table
 
         for x in range(1, self._tbl_len_x):
-            AlignmentOutputData.table_horizontal_gaps[0][x] = strings.GAP
+            table[0][x] = table.negative_infinity
 
         for y in range(1, self._tbl_len_y):
-            AlignmentOutputData.table_horizontal_gaps[y][0] = strings.NEGATIVE_INFINITY
+            table[y][0] = table.negative_infinity
 
-    def __init_vertical_gap_cost_table(self):
+    def __init_vertical_gap_cost_table(self, bound):
         """
         Initializes the Gotoh matrix for vertical costs.
+        The cells of the first column are never used, so like the first row they get negative infinity.
+
+        Args:
+            bound: largest absolute value of a cell
         """
-        AlignmentOutputData.table_vertical_gaps = [[0 for x in range(self._tbl_len_x)] for x in range(self._tbl_len_y)]
+        table = DPTable((self._tbl_len_y, self._tbl_len_x), bound, space=self._scratch_space)
+        self._result.table_vertical_gaps = table
 
         for x in range(1, self._tbl_len_x):
-            AlignmentOutputData.table_vertical_gaps[0][x] = strings.NEGATIVE_INFINITY
+            table[0][x] = table.negative_infinity
 
         for y in range(1, self._tbl_len_y):
-            AlignmentOutputData.table_vertical_gaps[y][0] = strings.GAP
+            table[y][0] = table.negative_infinity
 
-    def _value(self, char_a, char_b, x, y):
+    def __init_direction_table(self):
         """
-        Maximum scoring function which returns the score of a specific position.
+        Initializes the direction bits of the Gotoh matrices.
+        The cells of the first row and column need no bits, because they only point in one direction.
+        """
+        self._result.table_directions = DPTable((self._tbl_len_y, self._tbl_len_x), 0, type_code="B",
+                                                space=self._scratch_space)
+
+    def _get_filled_tables(self):
+        """
+        Returns the tables which are filled by the scoring-function.
+        """
+        return [self._result.table_values, self._result.table_horizontal_gaps, self._result.table_vertical_gaps,
+                self._result.table_directions]
+
+    def _value(self, substitution, x, y):
+        """
+        Maximum scoring function which returns the score of a specific position
+        and stores from which cells the scores of all three matrices can be reached.
 
         Args:
-            char_a: char from string a at position x, y
-            char_b: char from string b at position x, y
+            substitution: matrix value of the chars from string a and string b at position x, y
             x: current position x in the Gotoh matrix
             y: current position y in the Gotoh matrix
         """
-        AlignmentOutputData.table_horizontal_gaps[y][x] = max(
-            AlignmentOutputData.table_horizontal_gaps[y][x - 1] + self._data.gap_beta,
-            AlignmentOutputData.table_values[y][x - 1] + self._data.gap_opening)
+        horizontal_extension = self._result.table_horizontal_gaps.rows[y][x - 1] + self._data.gap_beta
+        horizontal_opening = self._result.table_values.rows[y][x - 1] + self._data.gap_opening
+        horizontal_gap = max(horizontal_extension, horizontal_opening)
+
+        vertical_extension = self._result.table_vertical_gaps.rows[y - 1][x] + self._data.gap_beta
+        vertical_opening = self._result.table_values.rows[y - 1][x] + self._data.gap_opening
+        vertical_gap = max(vertical_extension, vertical_opening)
+
+        matching = self._result.table_values.rows[y - 1][x - 1] + substitution
+        value = max(horizontal_gap, matching, vertical_gap)
+
+        self._result.table_horizontal_gaps.rows[y][x] = horizontal_gap
+        self._result.table_vertical_gaps.rows[y][x] = vertical_gap
+        self._result.table_directions.rows[y][x] = \
+            (MultiTableBacktracking.MAIN_DIAGONAL if matching == value else 0) \
+            | (MultiTableBacktracking.MAIN_TO_P if vertical_gap == value else 0) \
+            | (MultiTableBacktracking.MAIN_TO_Q if horizontal_gap == value else 0) \
+            | (MultiTableBacktracking.P_FROM_P if vertical_extension == vertical_gap else 0) \
+            | (MultiTableBacktracking.P_FROM_MAIN if vertical_opening == vertical_gap else 0) \
+            | (MultiTableBacktracking.Q_FROM_Q if horizontal_extension == horizontal_gap else 0) \
+            | (MultiTableBacktracking.Q_FROM_MAIN if horizontal_opening == horizontal_gap else 0)
+
+        return value
+
+    def __fill_end_gaps(self):
+        """
+        Fills the last column and the last row again if the gaps after their sequence are free.
+        In them opening and extending a gap costs nothing, so the last cell gets the optimal score
+        and the traceback begins and ends in the corners like for a global alignment.
+        Only the last column and the last row depend on these cells, so no other cell changes.
+        """
+        end_gaps = self._data.end_gaps
+        last_x = self._tbl_len_x - 1
+        last_y = self._tbl_len_y - 1
 
-        AlignmentOutputData.table_vertical_gaps[y][x] = max(
-            AlignmentOutputData.table_vertical_gaps[y - 1][x] + self._data.gap_beta,
-            AlignmentOutputData.table_values[y - 1][x] + self._data.gap_opening)
+        if end_gaps.end_b and last_x > 0:
+            for y in range(1, self._tbl_len_y):
+                self.__fill_end_gap_cell(last_x, y, False, True)
 
-        value = max(AlignmentOutputData.table_horizontal_gaps[y][x],
-                    AlignmentOutputData.table_values[y - 1][x - 1] + self._data.cost_function.get_value(char_a, char_b),
-                    AlignmentOutputData.table_vertical_gaps[y][x])
+        if end_gaps.end_a and last_y > 0:
+            for x in range(1, self._tbl_len_x):
+                self.__fill_end_gap_cell(x, last_y, True, end_gaps.end_b and x == last_x)
 
-        return value
+    def __fill_end_gap_cell(self, x, y, free_horizontal_gaps, free_vertical_gaps):
+        """
+        Fills a cell of all three matrices like the scoring-function, but with free gaps.
+        A free gap is not extended, but opened again for each character, because both cost nothing
+        and otherwise the traceback would find the same alignment on several paths.
+
+        Args:
+            x: position x in the Gotoh matrices
+            y: position y in the Gotoh matrices
+            free_horizontal_gaps: if True, a horizontal gap costs nothing
+            free_vertical_gaps: if True, a vertical gap costs nothing
+        """
+        horizontal_opening_cost = 0 if free_horizontal_gaps else self._data.gap_opening
+        vertical_opening_cost = 0 if free_vertical_gaps else self._data.gap_opening
+        substitution = self._data.cost_function.get_scores()[self._data.codes_a[y - 1]][self._data.codes_b[x - 1]]
+
+        if free_horizontal_gaps:
+            horizontal_extension = strings.NEGATIVE_INFINITY
+        else:
+            horizontal_extension = self._result.table_horizontal_gaps[y][x - 1] + self._data.gap_beta
+
+        horizontal_opening = self._result.table_values[y][x - 1] + horizontal_opening_cost
+        horizontal_gap = max(horizontal_extension, horizontal_opening)
+
+        if free_vertical_gaps:
+            vertical_extension = strings.NEGATIVE_INFINITY
+        else:
+            vertical_extension = self._result.table_vertical_gaps[y - 1][x] + self._data.gap_beta
+
+        vertical_opening = self._result.table_values[y - 1][x] + vertical_opening_cost
+        vertical_gap = max(vertical_extension, vertical_opening)
+
+        matching = self._result.table_values[y - 1][x - 1] + substitution
+        value = max(horizontal_gap, matching, vertical_gap)
+
+        self._result.table_values[y][x] = value
+        self._result.table_horizontal_gaps[y][x] = horizontal_gap
+        self._result.table_vertical_gaps[y][x] = vertical_gap
+        self._result.table_directions[y][x] = \
+            (MultiTableBacktracking.MAIN_DIAGONAL if matching == value else 0) \
+            | (MultiTableBacktracking.MAIN_TO_P if vertical_gap == value else 0) \
+            | (MultiTableBacktracking.MAIN_TO_Q if horizontal_gap == value else 0) \
+            | (MultiTableBacktracking.P_FROM_P if vertical_extension == vertical_gap else 0) \
+            | (MultiTableBacktracking.P_FROM_MAIN if vertical_opening == vertical_gap else 0) \
+            | (MultiTableBacktracking.Q_FROM_Q if horizontal_extension == horizontal_gap else 0) \
+            | (MultiTableBacktracking.Q_FROM_MAIN if horizontal_opening == horizontal_gap else 0)
 
 if __name__ == '__main__':
-    # run Needleman-Wunsch with some parameters
+    # run Gotoh with some parameters
     gt = Gotoh()
     gt.run("INPUT/sequence1.fasta", "INPUT/sequence2.fasta", "INPUT/pam250.txt", -8, -1, True)
     '''
@@ -7,8 +7,13 @@ import system.words as words
 class CostFunction:
     """
     Returns the cost for the alignment of two amino acids.
+    The matrix is parsed once into a dense table with a row for each of the 256 byte values,
+    so with encoded sequences (see encode) a lookup is a single index: get_scores()[code_a][code_b].
     """
 
+    __ALPHABET_SIZE = 256
+    __ENCODING = "latin-1"
+
     A = "A"
     R = "R"
     N = "N"
@@ -32,6 +37,7 @@ class CostFunction:
 
     global __matrix_type
     global __matrix
+    global __scores
 
     class AminoAcids:
         """
@@ -81,6 +87,7 @@ class CostFunction:
 
         if type != words.UNDEFINED:
             self.__matrix = MatrixReader().get_matrix(type)
+            self.__create_scores()
 
     def get_value(self, a, b):
         """
@@ -91,14 +98,63 @@ class CostFunction:
             b: scond amino acid
         """
         if a != strings.EMPTY and b != strings.EMPTY:
-            x = self.__get_position(a)
-            y = self.__get_position(b)
-
-            return int(self.__matrix[x][y])
+            return self.__scores[self.__get_code(a)][self.__get_code(b)]
         elif a == strings.EMPTY and b == strings.EMPTY:
             return 0
         return strings.NEGATIVE_INFINITY
 
+    def get_scores(self):
+        """
+        Returns the dense table with the matrix values of two character codes (see encode).
+        A value is None if the matrix has no value for the characters.
+        """
+        return self.__scores
+
+    def encode(self, sequence):
+        """
+        Returns the character codes of a sequence which are used as positions in the dense table.
+
+        Args:
+            sequence: the sequence you want to encode
+        """
+        return bytes(self.__get_code(char) for char in sequence)
+
+    def __get_code(self, value):
+        """
+        Returns the code of a character, characters without a code get the code of a star.
+
+        Args:
+            value: amino acid or base from which you want to know the code
+        """
+        if len(value) == 1 and ord(value) < self.__ALPHABET_SIZE:
+            return ord(value)
+        return ord(strings.STAR)
+
+    def __create_scores(self):
+        """
+        Creates the dense table with the parsed matrix values for all pairs of character codes.
+        """
+        positions = []
+        for code in range(0, self.__ALPHABET_SIZE):
+            try:
+                positions.append(self.__get_position(bytes([code]).decode(self.__ENCODING)))
+            except AttributeError:  # nucleotide matrices have no positions for amino acids
+                positions.append(None)
+
+        # characters with the same position share their row
+        rows = {}
+        for x in set(positions):
+            row = [None] * self.__ALPHABET_SIZE
+
+            for code in range(0, self.__ALPHABET_SIZE):
+                y = positions[code]
+                if x is not None and y is not None and x < len(self.__matrix) and y < len(self.__matrix[x]):
+                    row[code] = int(self.__matrix[x][y])
+
+            rows[x] = row
+
+        self.__scores = tuple(rows[x] for x in positions)
+
     def __get_position(self, value):
         """
         Returns the position of an amino acid in the matrix.
@@ -185,3 +241,4 @@ class CostFunction:
     def set_matrix(self, matrix_path):
         """Sets the matrix which is used for evaluation."""
         self.__matrix = MatrixReader().read_in(matrix_path)
+        self.__create_scores()
@@ -4,6 +4,8 @@ class Vector:
     """
     __DEFAULT_VALUE = "S"
 
+    __slots__ = ("x", "y", "z", "matrix_label")  # a traceback creates many vectors
+
     global x
     global y
     global z
@@ -41,7 +43,13 @@ class Vector:
         Args:
             other: second object
         """
-        if other is Vector:
+        if isinstance(other, Vector):
             return self.x == other.x and self.y == other.y and self.z == other.z \
                    and self.matrix_label == other.matrix_label
         return False
+
+    def __hash__(self):
+        """
+        Returns the hash value, which is the same for equal vectors.
+        """
+        return hash((self.x, self.y, self.z, self.matrix_label))
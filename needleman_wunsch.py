@@ -1,22 +1,30 @@
 from prakt.nw import NeedlemanWunschBase
 
+from algorithms import available_engines as engines
 from algorithms.alignment.alignment_algorithm import AlignmentAlgorithm
+from algorithms.alignment.banded_engine import BandedEngine
+from algorithms.alignment.batch_engine import BatchEngine
+from algorithms.alignment.bit_vector_engine import BitVectorEngine
+from algorithms.alignment.hirschberg import Hirschberg
+from algorithms.alignment.tiled_engine import TiledEngine
+from algorithms.alignment.wavefront_engine import WavefrontEngine
 from algorithms.backtracking.backtracking import Backtracking
 from data.alignment_input_data import AlignmentInputData
-from data.alignment_output_data import AlignmentOutputData
+from data.dp_table import DPTable
+from data.end_gaps import EndGaps
+from data.move_string import MoveString
 from formats.fasta import Fasta
 from maths.cost_function import CostFunction
 from maths.vector import Vector
 from system import messages
 
-import copy
 import os
 import system.string_symbols as strings
 
 @NeedlemanWunschBase.register
 class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
     """
-    Computes optimal, global alignment.
+    Computes optimal, global alignment, optionally with free end gaps (see EndGaps).
     """
 
     def compute(self, input):
@@ -37,10 +45,28 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
             else:
                 traceback_mode = strings.EMPTY
 
+            if len(input) >= 7:
+                engine = input[6]
+            else:
+                engine = engines.PYTHON
+
+            if len(input) >= 8:
+                max_alignments = input[7]
+            else:
+                max_alignments = None
+
+            if len(input) >= 9:
+                end_gaps = EndGaps().from_mode(input[8])
+            else:
+                end_gaps = None
+
             self.run(sequence_a_path,
                      sequence_b_path,
                      CostFunction(input[1]).get_path(), gap_cost,
-                     traceback_mode == self.TRACEBACK_ALL)
+                     traceback_mode == self.TRACEBACK_ALL,
+                     engine,
+                     max_alignments,
+                     end_gaps=end_gaps)
         else:
             print(messages.WRONG_PATHS)
 
@@ -65,7 +91,8 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
 
         return False
 
-    def run(self, seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, cost_gap_open, complete_traceback):
+    def run(self, seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, cost_gap_open, complete_traceback,
+            engine=engines.PYTHON, max_alignments=None, seed=None, checkpoint=None, resume=False, end_gaps=None):
         """
         Calculate optimal alignment(s) with Needleman-Wunsch algorithm and returns outputs of this algorithm
         for testing purposes.
@@ -76,6 +103,15 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
             subst_matrix_fn: path to substitution matrix
             cost_gap_open: cost to open a gap
             complete_traceback: If True, return all optimal alignments. Otherwise choose a random alignment.
+            engine: engine which fills the matrix (see available_engines), the results do not depend on it,
+                except for the linear space engine which only returns one optimal alignment
+            max_alignments: maximum number of optimal alignments returned with complete_traceback (None for all),
+                otherwise number of randomly chosen optimal alignments (None for one)
+            seed: seed for the random choice of optimal alignments (each one is chosen with the same probability)
+            checkpoint: Checkpoint which stores the progress of the fill (None for no checkpoints),
+                only the Python engine supports them and only without free end gaps
+            resume: if True, the fill continues after the last checkpoint of a fill with the same parameters
+            end_gaps: EndGaps which are free (None for a global alignment), only the Python engine supports them
 
         Returns:
             tuple of
@@ -86,30 +122,134 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
             score: score of optimal alignment,
             [(aln_string_seq1, aln_string_seq2), ...]: list of tuples containing optimal alignments)
         """
-        self.__evaluate_parameters(seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, cost_gap_open, complete_traceback)
-        self.__initialize_global()
-        self._compute_alignments()
+        self.__evaluate_parameters(seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, cost_gap_open, complete_traceback,
+                                   end_gaps)
+        self._checkpoint = checkpoint
+        self._resume = resume
 
-        backtracking = Backtracking()
-        if self._traceback_mode == self.TRACEBACK_ALL:
-            AlignmentOutputData.paths = self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1), True,
-                                                        backtracking)
-            self._create_alignments()
+        if not self._data.end_gaps.is_global() and engine != engines.PYTHON:
+            raise ValueError(messages.END_GAPS_ENGINE)
+
+        if checkpoint is not None and engine != engines.PYTHON:
+            raise ValueError(messages.CHECKPOINT_ENGINE)
+
+        if checkpoint is not None and not self._data.end_gaps.is_global():
+            raise ValueError(messages.CHECKPOINT_END_GAPS)
+
+        if engine == engines.LINEAR:
+            self._result.score, alignment = Hirschberg().align(self._data)
+            self._result.moves = [MoveString().from_alignment(alignment[0], alignment[1])]
+            self._result.graph = None
         else:
-            AlignmentOutputData.paths = self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1), False,
-                                                        backtracking)
-            self._create_alignments()
+            self.__align_with_table(engine, max_alignments, seed)
 
         self._output()
+        self._publish()
 
         return (self._data.ids[0],
                 self._data.sequence_a,
                 self._data.ids[1],
                 self._data.sequence_b,
-                AlignmentOutputData.table_values[self._tbl_len_y - 1][self._tbl_len_x - 1],
-                AlignmentOutputData.alignments)
+                self._result.score,
+                self._result.alignments)
 
-    def __evaluate_parameters(self, seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, cost_gap_open, complete_traceback):
+    def run_batch(self, pairs, subst_matrix_fn, cost_gap_open, with_alignments=False):
+        """
+        Calculate the optimal scores of many pairs of sequences with the batch engine (needs NumPy).
+        The substitution matrix is read only once and the pairs are aligned together in buckets of similar length.
+
+        Args:
+            pairs: list of tuples (sequence_a, sequence_b)
+            subst_matrix_fn: path to substitution matrix
+            cost_gap_open: cost to open a gap
+            with_alignments: If True, one optimal alignment of each pair is created.
+
+        Returns:
+            list with a tuple (score, [aln_string_seq1, aln_string_seq2]) for each pair,
+            the alignment is None if with_alignments is False
+        """
+        cost_function = CostFunction()
+        cost_function.set_matrix(subst_matrix_fn)
+
+        return BatchEngine().align_needleman(cost_function, cost_gap_open, pairs, with_alignments)
+
+    def edit_distance(self, seq1_fasta_fn, seq2_fasta_fn, max_distance=None, block_size=None):
+        """
+        Calculate the edit distance of two sequences with the bit-vector engine:
+        each substitution, insertion and deletion costs one, so no substitution matrix is needed.
+
+        Args:
+            seq1_fasta_fn: path to fasta file containing first sequence
+            seq2_fasta_fn: path to fasta file containing second sequence
+            max_distance: largest distance of interest (None for no cutoff)
+            block_size: number of characters of the first sequence in a bit-vector (None for all)
+
+        Returns:
+            the edit distance or None if it is larger than max_distance
+        """
+        sequence_a = Fasta().get_sequence(seq1_fasta_fn)
+        sequence_b = Fasta().get_sequence(seq2_fasta_fn)
+
+        return BitVectorEngine().get_distance(sequence_a, sequence_b, max_distance, block_size)
+
+    def search_pattern(self, pattern_fasta_fn, text_fasta_fn, max_distance, block_size=None):
+        """
+        Find all occurrences of a pattern with at most max_distance substitutions, insertions and deletions
+        in a text with the bit-vector engine.
+
+        Args:
+            pattern_fasta_fn: path to fasta file containing the pattern
+            text_fasta_fn: path to fasta file containing the text
+            max_distance: largest number of errors of an occurrence
+            block_size: number of characters of the pattern in a bit-vector (None for all)
+
+        Returns:
+            list of tuples (end, distance) where end is the position after the last character of the occurrence
+            in the text and distance the smallest number of errors of an occurrence with this end
+        """
+        pattern = Fasta().get_sequence(pattern_fasta_fn)
+        text = Fasta().get_sequence(text_fasta_fn)
+
+        return BitVectorEngine().search(pattern, text, max_distance, block_size)
+
+    def __align_with_table(self, engine, max_alignments, seed):
+        """
+        Fills the whole Needleman-Wunsch matrix and creates the alignments with a traceback.
+
+        Args:
+            engine: engine which fills the matrix
+            max_alignments: maximum number of optimal alignments of a complete traceback (None for all),
+                otherwise number of randomly chosen optimal alignments (None for one)
+            seed: seed for the random choice of optimal alignments
+        """
+        if engine == engines.NUMPY:
+            self._result.table_values, self._result.table_directions = \
+                WavefrontEngine().compute_needleman(self._data)
+        elif engine == engines.BANDED:
+            self._result.table_values, self._result.table_directions = \
+                BandedEngine().compute_needleman(self._data)
+        elif engine == engines.TILED:
+            self._result.score, self._result.table_directions = TiledEngine().compute_needleman(self._data)
+        else:
+            self.__initialize_global()
+            self._compute_alignments()
+            self.__fill_end_gaps()
+
+        backtracking = Backtracking(self._result)
+        if self._traceback_mode == self.TRACEBACK_ALL:
+            self._result.paths = self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1), True,
+                                                        backtracking, max_alignments)
+            self._create_alignments()
+        else:
+            self._result.paths = self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1), False,
+                                                        backtracking, max_alignments, seed)
+            self._create_alignments()
+
+        if self._result.table_values is not None:  # the tiled engine only keeps the direction bits
+            self._result.score = int(self._result.table_values[self._tbl_len_y - 1][self._tbl_len_x - 1])
+
+    def __evaluate_parameters(self, seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, cost_gap_open, complete_traceback,
+                              end_gaps=None):
         """
         Stores parameters needed to run the algorithm.
 
@@ -119,6 +259,7 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
             subst_matrix_fn: path to substitution matrix
             cost_gap_open: cost to open a gap
             complete_traceback: If True, return all optimal alignments. Otherwise choose a random alignment.
+            end_gaps: EndGaps which are free (None for a global alignment)
         """
         cost_function = CostFunction()
         cost_function.set_matrix(subst_matrix_fn)
@@ -131,10 +272,13 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
 
         if complete_traceback:
             self._traceback_mode = self.TRACEBACK_ALL
+        else:
+            self._traceback_mode = strings.EMPTY
 
-        self.__set_parameters(cost_function, gap_cost, sequence_a, sequence_b, sequence_id_a, sequence_id_b)
+        self.__set_parameters(cost_function, gap_cost, sequence_a, sequence_b, sequence_id_a, sequence_id_b, end_gaps)
 
-    def __set_parameters(self, cost_function, gap_cost, sequence_a, sequence_b, sequence_id_a, sequence_id_b):
+    def __set_parameters(self, cost_function, gap_cost, sequence_a, sequence_b, sequence_id_a, sequence_id_b,
+                         end_gaps=None):
         """
         Sets the parameters needed for the calculation with the  Needleman-Wunsch algorithm.
 
@@ -145,46 +289,116 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
                sequence_b: second sequence
                sequence_id_a: first sequence id
                sequence_id_b: second sequence id
+               end_gaps: EndGaps which are free (None for a global alignment)
         """
         self._tbl_len_x = len(sequence_b) + 1
         self._tbl_len_y = len(sequence_a) + 1
+        self._new_output_data()
         self._data = AlignmentInputData().init_needleman(cost_function,
                                                          gap_cost,
                                                          sequence_a,
                                                          sequence_b,
-                                                         ids=[sequence_id_a, sequence_id_b])
+                                                         ids=[sequence_id_a, sequence_id_b],
+                                                         end_gaps=end_gaps)
 
     def __initialize_global(self):
         """
         Initializes the Needleman-Wunsch matrix.
+        If the gaps before a sequence are free, its row or column of gaps gets only zeros
+        (like all its gaps if the other sequence is empty and the gaps after it are free).
         """
-        AlignmentOutputData.table_values = [[0 for x in range(self._tbl_len_x)] for x in range(self._tbl_len_y)]
+        self._result.table_values = DPTable((self._tbl_len_y, self._tbl_len_x),
+                                            self._score_bound(self._data.gap_cost,
+                                                              self._data.codes_a, self._data.codes_b),
+                                            space=self._scratch_space)
+        end_gaps = self._data.end_gaps
+        column_gap_cost = 0 if end_gaps.start_b or (end_gaps.end_b and self._tbl_len_x == 1) else self._data.gap_cost
+        row_gap_cost = 0 if end_gaps.start_a or (end_gaps.end_a and self._tbl_len_y == 1) else self._data.gap_cost
 
         for k in range(1, self._tbl_len_y):
-            for y in range(0, k):
-                AlignmentOutputData.table_values[k][0] = AlignmentOutputData.table_values[y][0] + self._data.gap_cost
+            self._result.table_values[k][0] = self._result.table_values[k - 1][0] + column_gap_cost
 
         for k in range(1, self._tbl_len_x):
-            for x in range(0, k):
-                AlignmentOutputData.table_values[0][k] = AlignmentOutputData.table_values[0][x] + self._data.gap_cost
+            self._result.table_values[0][k] = self._result.table_values[0][k - 1] + row_gap_cost
+
+        self.__init_direction_table()
+
+    def __init_direction_table(self):
+        """
+        Initializes the direction bits of the Needleman-Wunsch matrix.
+        The cells of the first row only point to the left and the cells of the first column only upwards.
+        """
+        table = DPTable((self._tbl_len_y, self._tbl_len_x), 0, type_code="B", space=self._scratch_space)
+        self._result.table_directions = table
+
+        for x in range(1, self._tbl_len_x):
+            table[0][x] = Backtracking.LEFT
 
-    def _value(self, char_a, char_b, x, y):
+        for y in range(1, self._tbl_len_y):
+            table[y][0] = Backtracking.UP
+
+    def _value(self, substitution, x, y):
         """
-        Maximum scoring function which returns the score of a specific position.
+        Maximum scoring function which returns the score of a specific position
+        and stores from which cells the score can be reached.
 
         Args:
-            char_a: char from string a at position x, y
-            char_b: char from string b at position x, y
+            substitution: matrix value of the chars from string a and string b at position x, y
             x: current position x in the Needleman-Wunsch matrix
             y: current position y in the Needleman-Wunsch matrix
         """
 
-        value = max(AlignmentOutputData.table_values[y][x - 1] + self._data.gap_cost,
-                    AlignmentOutputData.table_values[y - 1][x - 1] + self._data.cost_function.get_value(char_a, char_b),
-                    AlignmentOutputData.table_values[y - 1][x] + self._data.gap_cost)
+        insertion = self._result.table_values.rows[y][x - 1] + self._data.gap_cost
+        matching = self._result.table_values.rows[y - 1][x - 1] + substitution
+        deletion = self._result.table_values.rows[y - 1][x] + self._data.gap_cost
+        value = max(insertion, matching, deletion)
+
+        self._result.table_directions.rows[y][x] = (Backtracking.DIAGONAL if matching == value else 0) \
+            | (Backtracking.LEFT if insertion == value else 0) \
+            | (Backtracking.UP if deletion == value else 0)
 
         return value
 
+    def __fill_end_gaps(self):
+        """
+        Fills the last column and the last row again if the gaps after their sequence are free.
+        In them a step upwards or to the left costs nothing, so the last cell gets the optimal score
+        and the traceback begins and ends in the corners like for a global alignment.
+        Only the last column and the last row depend on these cells, so no other cell changes.
+        """
+        end_gaps = self._data.end_gaps
+        last_x = self._tbl_len_x - 1
+        last_y = self._tbl_len_y - 1
+
+        if end_gaps.end_b and last_x > 0:
+            for y in range(1, self._tbl_len_y):
+                self.__fill_end_gap_cell(last_x, y, self._data.gap_cost, 0)
+
+        if end_gaps.end_a and last_y > 0:
+            for x in range(1, self._tbl_len_x):
+                self.__fill_end_gap_cell(x, last_y, 0, 0 if end_gaps.end_b and x == last_x else self._data.gap_cost)
+
+    def __fill_end_gap_cell(self, x, y, insertion_cost, deletion_cost):
+        """
+        Fills a cell like the scoring-function, but with other gap costs.
+
+        Args:
+            x: position x in the Needleman-Wunsch matrix
+            y: position y in the Needleman-Wunsch matrix
+            insertion_cost: costs for a step to the left
+            deletion_cost: costs for a step upwards
+        """
+        substitution = self._data.cost_function.get_scores()[self._data.codes_a[y - 1]][self._data.codes_b[x - 1]]
+        insertion = self._result.table_values[y][x - 1] + insertion_cost
+        matching = self._result.table_values[y - 1][x - 1] + substitution
+        deletion = self._result.table_values[y - 1][x] + deletion_cost
+        value = max(insertion, matching, deletion)
+
+        self._result.table_values[y][x] = value
+        self._result.table_directions[y][x] = (Backtracking.DIAGONAL if matching == value else 0) \
+            | (Backtracking.LEFT if insertion == value else 0) \
+            | (Backtracking.UP if deletion == value else 0)
+
     def get_new_table(self, cost_function, gap_cost, sequence_a, sequence_b):
         """
         Returns a Needleman-Wunsch 2D table needed for the 3D version of Needleman-Wunsch.
@@ -196,15 +410,15 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
             sequence_b: second sequence
 
         Returns:
-            a deepcopy of a a 2D Needleman-Wunsch matrix
+            a 2D Needleman-Wunsch matrix, which belongs only to this run
         """
 
         self.__set_parameters(cost_function, gap_cost, sequence_a, sequence_b, strings.EMPTY, strings.EMPTY)
         self.__initialize_global()
         self._compute_alignments()
-        return copy.deepcopy(AlignmentOutputData.table_values)
+        return self._result.table_values
 
-    def get_data(self, cost_function, gap_cost, sequence_a, sequence_b):
+    def get_data(self, cost_function, gap_cost, sequence_a, sequence_b, linear_space=True, end_gaps=None):
         """
         Returns relevant data needed for example for the Feng-Doolittle algorithm.
 
@@ -213,18 +427,91 @@ class NeedlemanWunsch(NeedlemanWunschBase, AlignmentAlgorithm):
                 gap_cost: costs for a gap
                 sequence_a: first sequence
                 sequence_b: second sequence
+                linear_space: If True, only two rows are kept and the optimal alignment with the fewest gaps is used.
+                    Otherwise the whole matrix is filled and a random optimal alignment is used.
+                end_gaps: EndGaps which are free (None for a global alignment), they are counted as gaps
 
         Returns:
             a tuple with the alignment score, the number of gaps and the length of the alignment
         """
 
-        self.__set_parameters(cost_function, gap_cost, sequence_a, sequence_b)
+        self.__set_parameters(cost_function, gap_cost, sequence_a, sequence_b, strings.EMPTY, strings.EMPTY, end_gaps)
+
+        if linear_space:
+            return self.__get_data_in_linear_space()
+
         self.__initialize_global()
         self._compute_alignments()
-        backtracking = Backtracking()
-        paths = self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1), False, backtracking)
-        gaps = self._count_gaps(paths[0])
-        return (AlignmentOutputData.table_values[self._tbl_len_y - 1][self._tbl_len_x - 1], gaps, len(paths[0]) - 1)
+        self.__fill_end_gaps()
+        backtracking = Backtracking(self._result)
+        path = next(self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1), False, backtracking))
+        moves = MoveString().from_path(path)
+        return (self._result.table_values[self._tbl_len_y - 1][self._tbl_len_x - 1], moves.count_gaps(), len(moves))
+
+    def __get_data_in_linear_space(self):
+        """
+        Returns the score, the number of gaps and the length of an optimal alignment without a traceback.
+        Besides the row of the scores a row with the number of gaps is kept.
+        A cell gets the fewest gaps of the cells from which its score can be reached (plus one for a gap),
+        so of all optimal alignments the one with the fewest gaps is chosen.
+        Each column of an alignment contains two characters or one character and a gap,
+        so its length is (len(sequence_a) + len(sequence_b) + gaps) / 2.
+        With free gaps after a sequence, its alignment can end in each cell of the last row or column
+        and the remaining characters are aligned with free gaps, so only these cells are compared.
+
+        Returns:
+            a tuple with the alignment score, the number of gaps and the length of the alignment
+        """
+        gap_cost = self._data.gap_cost
+        end_gaps = self._data.end_gaps
+        scores = self._data.cost_function.get_scores()
+        codes_b = self._data.codes_b
+        too_many_gaps = self._tbl_len_x + self._tbl_len_y  # more gaps than any alignment has
+        last_x = self._tbl_len_x - 1
+        last_y = self._tbl_len_y - 1
+        row_gap_cost = 0 if end_gaps.start_a else gap_cost
+        column_gap_cost = 0 if end_gaps.start_b else gap_cost
+
+        row = [x * row_gap_cost for x in range(0, self._tbl_len_x)]
+        gaps_row = list(range(0, self._tbl_len_x))
+        best_in_column = (row[-1], -gaps_row[-1] - last_y)  # score and negative gaps of the best end in the last column
+
+        for y in range(1, self._tbl_len_y):
+            scores_a = scores[self._data.codes_a[y - 1]]
+            diagonal = row[0]
+            diagonal_gaps = gaps_row[0]
+            value = row[0] = y * column_gap_cost
+            gaps = gaps_row[0] = y
+
+            for x in range(1, self._tbl_len_x):
+                insertion = value + gap_cost
+                matching = diagonal + scores_a[codes_b[x - 1]]
+                deletion = row[x] + gap_cost
+                value = max(insertion, matching, deletion)
+
+                # the fewest gaps of all directions which reach the value
+                gaps = min(diagonal_gaps if matching == value else too_many_gaps,
+                           gaps + 1 if insertion == value else too_many_gaps,
+                           gaps_row[x] + 1 if deletion == value else too_many_gaps)
+
+                diagonal = row[x]
+                diagonal_gaps = gaps_row[x]
+                row[x] = value
+                gaps_row[x] = gaps
+
+            if end_gaps.end_b:
+                best_in_column = max(best_in_column, (row[-1], -gaps_row[-1] - (last_y - y)))
+
+        ends = [(row[-1], -gaps_row[-1])]
+
+        if end_gaps.end_b:
+            ends.append(best_in_column)
+
+        if end_gaps.end_a:
+            ends.extend([(row[x], -gaps_row[x] - (last_x - x)) for x in range(0, last_x)])
+
+        score, negative_gaps = max(ends)
+        return score, -negative_gaps, (last_y + last_x - negative_gaps) // 2
 
 if __name__ == '__main__':
     # run Needleman-Wunsch with some parameters
@@ -3,7 +3,7 @@ from prakt.nw3 import NeedlemanWunsch3Base
 from algorithms.alignment.alignment_algorithm_3d import AlignmentAlgorithm3D
 from algorithms.backtracking.backtracking_3d import Backtracking3D
 from data.alignment_input_data import AlignmentInputData
-from data.alignment_output_data import AlignmentOutputData
+from data.dp_table import DPTable
 from formats.fasta import Fasta
 from formats.multi_fasta_format import MultiFasta
 from maths.cost_function import CostFunction
@@ -57,7 +57,7 @@ class NeedlemanWunsch3(NeedlemanWunsch3Base, AlignmentAlgorithm3D):
         else:
             return False
 
-    def run(self, seq_fasta_fn, subst_matrix_fn, cost_gap_open, complete_traceback):
+    def run(self, seq_fasta_fn, subst_matrix_fn, cost_gap_open, complete_traceback, checkpoint=None, resume=False):
         """
         Calculate optimal alignment with Needleman-Wunsch 3D algorithm and returns outputs of this algorithm
         for testing purposes.
@@ -67,6 +67,8 @@ class NeedlemanWunsch3(NeedlemanWunsch3Base, AlignmentAlgorithm3D):
             subst_matrix_fn: path to substitution matrix
             cost_gap_open: cost to open a gap
             complete_traceback: If True, return all optimal alignments. Otherwise choose a random alignment.
+            checkpoint: Checkpoint which stores the progress of the fill (None for no checkpoints)
+            resume: if True, the fill continues after the last checkpoint of a fill with the same parameters
 
         Returns:
             tuple of
@@ -81,15 +83,18 @@ class NeedlemanWunsch3(NeedlemanWunsch3Base, AlignmentAlgorithm3D):
         """
 
         self.__evaluate_parameters(seq_fasta_fn, subst_matrix_fn, cost_gap_open)
+        self._checkpoint = checkpoint
+        self._resume = resume
         self._input()
         self.__initialize_global()
         self._compute_alignments()
 
-        backtracking = Backtracking3D()
-        AlignmentOutputData.paths = \
+        backtracking = Backtracking3D(self._result)
+        self._result.paths = \
             self._traceback(Vector(self._tbl_len_x - 1, self._tbl_len_y - 1, self._tbl_len_z - 1), False, backtracking)
         self._create_alignments()
         self._output()
+        self._publish()
 
         return (self._data.ids[0],
                 self._data.sequence_a,
@@ -97,8 +102,8 @@ class NeedlemanWunsch3(NeedlemanWunsch3Base, AlignmentAlgorithm3D):
                 self._data.sequence_b,
                 self._data.ids[2],
                 self._data.sequence_c,
-                AlignmentOutputData.table_values_3d[self._tbl_len_z - 1][self._tbl_len_y - 1][self._tbl_len_x - 1],
-                AlignmentOutputData.alignments)
+                self._result.table_values_3d[self._tbl_len_z - 1][self._tbl_len_y - 1][self._tbl_len_x - 1],
+                self._result.alignments)
 
     def __evaluate_parameters(self, seq_fasta_fn, subst_matrix_fn, cost_gap_open):
         """
@@ -133,6 +138,7 @@ class NeedlemanWunsch3(NeedlemanWunsch3Base, AlignmentAlgorithm3D):
         self._tbl_len_x = len(sequence_c) + 1
         self._tbl_len_y = len(sequence_b) + 1
         self._tbl_len_z = len(sequence_a) + 1
+        self._new_output_data()
         self._data = AlignmentInputData().\
             init_needleman(cost_function, gap_cost, sequence_a, sequence_b, sequence_c,
                            ids=[sequence_id_a, sequence_id_b, sequence_id_c])
@@ -141,43 +147,102 @@ class NeedlemanWunsch3(NeedlemanWunsch3Base, AlignmentAlgorithm3D):
         """
         Initializes the three-dimensional Needleman-Wunsch matrix.
         """
-        AlignmentOutputData.table_values_3d = \
-            [[[0 for x in range(self._tbl_len_x)] for x in range(self._tbl_len_y)] for x in range(self._tbl_len_z)]
+        self._result.table_values_3d = \
+            DPTable((self._tbl_len_z, self._tbl_len_y, self._tbl_len_x),
+                    self._score_bound(self._data.gap_cost, self._data.codes_a, self._data.codes_b, self._data.codes_c))
 
         self.__init_2d_needleman_tables()
 
         for x in range(0, self._tbl_len_x):
             for y in range(0, self._tbl_len_y):
-                AlignmentOutputData.table_values_3d[0][y][x] \
-                    = AlignmentOutputData.table_values_xy[x][y] + (x + y) * self._data.gap_cost
+                self._result.table_values_3d[0][y][x] \
+                    = self._result.table_values_xy[x][y] + (x + y) * self._data.gap_cost
 
         for x in range(0, self._tbl_len_x):
             for z in range(0, self._tbl_len_z):
-                AlignmentOutputData.table_values_3d[z][0][x] \
-                    = AlignmentOutputData.table_values_xz[x][z] + (x + z) * self._data.gap_cost
+                self._result.table_values_3d[z][0][x] \
+                    = self._result.table_values_xz[x][z] + (x + z) * self._data.gap_cost
 
         for y in range(0, self._tbl_len_y):
             for z in range(0, self._tbl_len_z):
-                AlignmentOutputData.table_values_3d[z][y][0] \
-                    = AlignmentOutputData.table_values_yz[y][z] + (y + z) * self._data.gap_cost
+                self._result.table_values_3d[z][y][0] \
+                    = self._result.table_values_yz[y][z] + (y + z) * self._data.gap_cost
+
+        self.__init_direction_table()
+
+    def __init_direction_table(self):
+        """
+        Initializes the direction bits of the three-dimensional Needleman-Wunsch matrix
+        and computes them for the cells on the faces, the other cells get them during the computation.
+        """
+        self._result.table_directions_3d = \
+            [[bytearray(self._tbl_len_x) for y in range(self._tbl_len_y)] for z in range(self._tbl_len_z)]
+
+        for x in range(0, self._tbl_len_x):
+            for y in range(0, self._tbl_len_y):
+                self.__set_face_directions(x, y, 0)
+
+        for x in range(0, self._tbl_len_x):
+            for z in range(0, self._tbl_len_z):
+                self.__set_face_directions(x, 0, z)
+
+        for y in range(0, self._tbl_len_y):
+            for z in range(0, self._tbl_len_z):
+                self.__set_face_directions(0, y, z)
+
+    def __set_face_directions(self, x, y, z):
+        """
+        Stores which cases reach the score of a cell on a face.
+        The case with three characters is not possible on a face.
+
+        Args:
+            x: position in the third sequence
+            y: position in the second sequence
+            z: position in the first sequence
+        """
+        table = self._result.table_values_3d.rows
+        get_value = self._data.cost_function.get_value
+        gap_costs = 2 * self._data.gap_cost
+        value = table[z][y][x]
+        directions = 0
+
+        if z > 0 and y > 0 and value == table[z - 1][y - 1][x] \
+                + get_value(self._data.sequence_a[z - 1], self._data.sequence_b[y - 1]) + gap_costs:
+            directions |= Backtracking3D.MATCH_AB
+
+        if z > 0 and x > 0 and value == table[z - 1][y][x - 1] \
+                + get_value(self._data.sequence_a[z - 1], self._data.sequence_c[x - 1]) + gap_costs:
+            directions |= Backtracking3D.MATCH_AC
+
+        if y > 0 and x > 0 and value == table[z][y - 1][x - 1] \
+                + get_value(self._data.sequence_b[y - 1], self._data.sequence_c[x - 1]) + gap_costs:
+            directions |= Backtracking3D.MATCH_BC
+
+        if z > 0 and value == table[z - 1][y][x] + gap_costs:
+            directions |= Backtracking3D.ONLY_A
+
+        if y > 0 and value == table[z][y - 1][x] + gap_costs:
+            directions |= Backtracking3D.ONLY_B
+
+        if x > 0 and value == table[z][y][x - 1] + gap_costs:
+            directions |= Backtracking3D.ONLY_C
+
+        self._result.table_directions_3d[z][y][x] = directions
 
     def __init_2d_needleman_tables(self):
         """
         Computes two-dimensional Needleman-Wunsch to create the faces of the three-dimensional Needleman-Wunsch matrix.
+        Each table is computed by its own NeedlemanWunsch instance in its own output data, so it is not copied.
         """
-        AlignmentOutputData.table_values_xy = NeedlemanWunsch(). \
+        self._result.table_values_xy = NeedlemanWunsch(). \
             get_new_table(self._data.cost_function, self._data.gap_cost, self._data.sequence_c, self._data.sequence_b)
 
-        AlignmentOutputData.table_values_xz = NeedlemanWunsch(). \
+        self._result.table_values_xz = NeedlemanWunsch(). \
             get_new_table(self._data.cost_function, self._data.gap_cost, self._data.sequence_c, self._data.sequence_a)
 
-        AlignmentOutputData.table_values_yz = NeedlemanWunsch(). \
+        self._result.table_values_yz = NeedlemanWunsch(). \
             get_new_table(self._data.cost_function, self._data.gap_cost, self._data.sequence_b, self._data.sequence_a)
 
-        # print(OutputData.table_values_xy)
-        # print(OutputData.table_values_xz)
-        # print(OutputData.table_values_yz)
-
 if __name__ == '__main__':
     nw3 = NeedlemanWunsch3()
     nw3.run("INPUT/sequences.fasta", "INPUT/pam250.txt", -8, False)
\ No newline at end of file
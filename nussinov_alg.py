@@ -2,6 +2,7 @@ from prakt.nussinov import NussinovBase
 
 from algorithms.backtracking.nussinov_backtracking import NussinovBacktracking
 from algorithms.prediction.structure_prediction_algorithm import StructurePredictionAlgorithm
+from data.dp_table import DPTable
 from data.prediction_input_data import PredictionInputData
 from data.prediction_output_data import PredictionOutputData
 from formats.fasta import Fasta
@@ -65,13 +66,14 @@ class Nussinov(NussinovBase, StructurePredictionAlgorithm):
         self.__initialize()
         self._compute_structures()
 
-        backtracking = NussinovBacktracking()
-        PredictionOutputData.structures = self._traceback(Vector(self._tbl_len_x - 1, 0), backtracking)
+        backtracking = NussinovBacktracking(self._result)
+        self._result.structures = self._traceback(Vector(self._tbl_len_x - 1, 0), backtracking)
 
         self._create_structures()
         self._output()
+        self._publish()
 
-        return (self._data.id, self._data.sequence, PredictionOutputData.dot_bracket_structures[0])
+        return (self._data.id, self._data.sequence, self._result.dot_bracket_structures[0])
 
     def __evaluate_parameters(self, seq_fasta_fn):
         """
@@ -85,13 +87,17 @@ class Nussinov(NussinovBase, StructurePredictionAlgorithm):
 
         self._tbl_len_x = len(sequence) + 1
         self._tbl_len_y = len(sequence)
+        self._result = PredictionOutputData()
         self._data = PredictionInputData().init_nussinov(self.MINIMUM_LOOP_LENGTH, sequence, sequence_id)
 
     def __initialize(self):
         """
         Initializes the Nussinov matrix.
+        Only the cells on and above the diagonal are used, so it is stored as a triangle
+        and the number of base pairs is the largest possible value.
         """
-        PredictionOutputData.table_values = [[0 for x in range(self._tbl_len_x)] for x in range(self._tbl_len_y)]
+        self._result.table_values = DPTable((self._tbl_len_y, self._tbl_len_x), len(self._data.sequence),
+                                            triangular=True)
 
     def _value(self, x, y):
         """
@@ -101,7 +107,7 @@ class Nussinov(NussinovBase, StructurePredictionAlgorithm):
             x: current position x in the Nussinov matrix
             y: current position y in the Nussinov matrix
         """
-        value_a = PredictionOutputData.table_values[y][x - 1]
+        value_a = self._result.table_values.rows[y][x - 1]
         value_b = 0
 
         current_base = self._data.sequence[x - 1]  # -1 because the x-value of the table has size: len(sequence) + 1
@@ -110,7 +116,7 @@ class Nussinov(NussinovBase, StructurePredictionAlgorithm):
             base = self._data.sequence[k]
 
             if base_pairs.complementary(base, current_base):
-                value = PredictionOutputData.table_values[y][k] + PredictionOutputData.table_values[k + 1][x - 1] + 1
+                value = self._result.table_values.rows[y][k] + self._result.table_values.rows[k + 1][x - 1] + 1
                 if value > value_b:
                     value_b = value
 
@@ -0,0 +1,274 @@
+import system.string_symbols as strings
+import system.words as words
+from algorithms import available_engines as engines
+from algorithms.alignment.waterman_eggert import WatermanEggert
+from gotoh import Gotoh
+from maths.cost_function import CostFunction
+from system import messages
+
+class SmithWaterman(Gotoh):
+    """
+    Computes optimal, affine, local alignment.
+    Only the aligned region is stored in matrices, so the memory depends on its size and not on the whole input:
+    a first pass keeps only one row of each matrix and finds the last cell of an optimal local alignment,
+    a second pass goes backwards from this cell over the reversed prefixes until a cell is found
+    from which a global alignment up to the last cell reaches the optimal score.
+    Afterwards the region between both cells is aligned globally like in Gotoh,
+    whose traceback returns all optimal alignments of this region.
+    """
+
+    _OPTIMAL_ALIGNMENTS_NUMBER = words.OPTIMAL_REGION_ALIGNMENTS_NUMBER
+
+    def compute(self, input):
+        """
+        Checks input from console and if it is correct,
+        it runs the algorithm.
+
+        Args:
+            input: input from console
+        """
+        if self._input_ok(input):
+            gap_alpha = input[2]
+            gap_beta = input[3]
+            sequence_a_path = input[4]
+            sequence_b_path = input[5]
+
+            if len(input) >= 7:
+                traceback_mode = input[6]
+            else:
+                traceback_mode = strings.EMPTY
+
+            if len(input) >= 8:
+                max_alignments = input[7]
+            else:
+                max_alignments = None
+
+            self.run(sequence_a_path,
+                     sequence_b_path,
+                     CostFunction(input[1]).get_path(),
+                     gap_alpha,
+                     gap_beta,
+                     traceback_mode == self.TRACEBACK_ALL,
+                     max_alignments=max_alignments)
+        else:
+            print(messages.WRONG_PATHS)
+
+    def run(self, seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, affine_cost_gap_open, affine_cost_gap_extend,
+            complete_traceback, *, max_alignments=None, seed=None):
+        """
+        Calculate optimal local alignment(s) with the Smith-Waterman algorithm.
+        If several regions reach the optimal score, the region which ends first (in the first sequence,
+        then in the second one) is aligned and of its starts the one closest to the end is chosen.
+        The region is always filled by the Python engine, so max_alignments and seed are keyword-only
+        and a positional engine of Gotoh.run is not taken for them.
+
+        Args:
+            seq1_fasta_fn: path to fasta file containing first sequence
+            seq2_fasta_fn: path to fasta file containing second sequence
+            subst_matrix_fn: path to substitution matrix
+            affine_cost_gap_open: cost to open a gap
+            affine_cost_gap_extend: cost to extend a gap
+            complete_traceback: If True, return all optimal alignments of the region. Otherwise choose a random one.
+            max_alignments: maximum number of optimal alignments returned with complete_traceback (None for all),
+                otherwise number of randomly chosen optimal alignments (None for one)
+            seed: seed for the random choice of optimal alignments (each one is chosen with the same probability)
+
+        Returns:
+            tuple of
+            (id_seq1: fasta id of first sequence,
+             seq1: first sequence,
+             id_seq2: fasta id of second sequence,
+             seq2: second sequence,
+             score: score of optimal local alignment (0 if no pair of characters has a positive score),
+             [(aln_string_seq1, aln_string_seq2), ...]: list of tuples containing the aligned regions)
+        """
+        self._evaluate_parameters(seq1_fasta_fn,
+                                  seq2_fasta_fn,
+                                  subst_matrix_fn,
+                                  affine_cost_gap_open,
+                                  affine_cost_gap_extend,
+                                  complete_traceback)
+
+        score, end_y, end_x = self.__find_end()
+
+        if score > 0:
+            start_y, start_x = self.__find_start(score, end_y, end_x)
+            self.__align_region(start_y, start_x, end_y, end_x, max_alignments, seed)
+        else:
+            self._result.moves = []
+            self._result.graph = None
+
+        self._result.score = score
+        self._output()
+        self._publish()
+
+        return (self._data.ids[0],
+                self._data.sequence_a,
+                self._data.ids[1],
+                self._data.sequence_b,
+                self._result.score,
+                self._result.alignments)
+
+    def iterate_alignments(self, seq1_fasta_fn, seq2_fasta_fn, subst_matrix_fn, affine_cost_gap_open,
+                           affine_cost_gap_extend):
+        """
+        Yields the best non-overlapping local alignments one after another with the Waterman-Eggert algorithm:
+        no two alignments contain the same pair of aligned characters or gap positions.
+        The next alignment is only computed when it is requested (e.g. take the k best with itertools.islice).
+
+        Args:
+            seq1_fasta_fn: path to fasta file containing first sequence
+            seq2_fasta_fn: path to fasta file containing second sequence
+            subst_matrix_fn: path to substitution matrix
+            affine_cost_gap_open: cost to open a gap
+            affine_cost_gap_extend: cost to extend a gap
+
+        Yields:
+            tuples (score, start in the first sequence, start in the second sequence,
+            [aln_string_seq1, aln_string_seq2]), the scores never increase
+        """
+        self._evaluate_parameters(seq1_fasta_fn,
+                                  seq2_fasta_fn,
+                                  subst_matrix_fn,
+                                  affine_cost_gap_open,
+                                  affine_cost_gap_extend,
+                                  False)
+        sequence_a = self._data.sequence_a
+        sequence_b = self._data.sequence_b
+
+        for score, moves in WatermanEggert().iterate_alignments(self._data):
+            yield score, moves.start_a, moves.start_b, moves.materialize(sequence_a, sequence_b)
+
+    def __find_end(self):
+        """
+        Computes the optimal local score with one row of each matrix.
+        A cell of the main matrix gets at least zero, because a local alignment can begin at each cell.
+
+        Returns:
+            tuple (optimal score, row of the last cell, column of the last cell),
+            of the cells with this score the first one in row-major order is returned
+        """
+        gap_beta = self._data.gap_beta
+        gap_opening = self._data.gap_opening
+        scores = self._data.cost_function.get_scores()
+        codes_b = self._data.codes_b
+
+        row = [0] * self._tbl_len_x
+        vertical_gaps_row = [strings.NEGATIVE_INFINITY] * self._tbl_len_x
+        best = (0, 0, 0)
+
+        for y in range(1, self._tbl_len_y):
+            scores_a = scores[self._data.codes_a[y - 1]]
+            diagonal = row[0]
+            value = 0
+            horizontal_gap = strings.NEGATIVE_INFINITY
+
+            for x in range(1, self._tbl_len_x):
+                horizontal_gap = max(horizontal_gap + gap_beta, value + gap_opening)
+                vertical_gap = max(vertical_gaps_row[x] + gap_beta, row[x] + gap_opening)
+                value = max(0, diagonal + scores_a[codes_b[x - 1]], horizontal_gap, vertical_gap)
+
+                diagonal = row[x]
+                row[x] = value
+                vertical_gaps_row[x] = vertical_gap
+
+                if value > best[0]:
+                    best = (value, y, x)
+
+        return best
+
+    def __find_start(self, score, end_y, end_x):
+        """
+        Computes global alignments which end in the last cell with one row of each matrix.
+        The prefixes of both sequences are reversed, so the rows go backwards from the last cell.
+        The first cell whose score is the optimal local score is the start of an optimal local alignment.
+
+        Args:
+            score: optimal local score
+            end_y: row of the last cell
+            end_x: column of the last cell
+
+        Returns:
+            tuple (row of the start cell, column of the start cell) in the matrix of the whole sequences
+        """
+        gap_alpha = self._data.gap_alpha
+        gap_beta = self._data.gap_beta
+        gap_opening = self._data.gap_opening
+        scores = self._data.cost_function.get_scores()
+        codes_a = self._data.codes_a[end_y - 1::-1]
+        codes_b = self._data.codes_b[end_x - 1::-1]
+
+        row = [0] + [gap_alpha + gap_beta * x for x in range(1, end_x + 1)]
+        vertical_gaps_row = [strings.NEGATIVE_INFINITY] * (end_x + 1)
+
+        for y in range(1, end_y + 1):
+            scores_a = scores[codes_a[y - 1]]
+            diagonal = row[0]
+            value = row[0] = gap_alpha + gap_beta * y
+            horizontal_gap = strings.NEGATIVE_INFINITY
+
+            for x in range(1, end_x + 1):
+                horizontal_gap = max(horizontal_gap + gap_beta, value + gap_opening)
+                vertical_gap = max(vertical_gaps_row[x] + gap_beta, row[x] + gap_opening)
+                value = max(diagonal + scores_a[codes_b[x - 1]], horizontal_gap, vertical_gap)
+
+                diagonal = row[x]
+                row[x] = value
+                vertical_gaps_row[x] = vertical_gap
+
+                if value == score:
+                    return end_y - y, end_x - x
+
+        raise ValueError(messages.NO_START_CELL)
+
+    def __align_region(self, start_y, start_x, end_y, end_x, max_alignments, seed):
+        """
+        Aligns the region between the start and the last cell globally with the Gotoh matrices.
+        While the matrices are filled, the input data contains only the region,
+        afterwards the input data of the whole sequences is restored.
+
+        Args:
+            start_y: row of the start cell
+            start_x: column of the start cell
+            end_y: row of the last cell
+            end_x: column of the last cell
+            max_alignments: maximum number of optimal alignments of a complete traceback (None for all),
+                otherwise number of randomly chosen optimal alignments (None for one)
+            seed: seed for the random choice of optimal alignments
+        """
+        sequence_data = self._data
+        self._set_parameters(sequence_data.cost_function, sequence_data.gap_alpha, sequence_data.gap_beta,
+                             sequence_data.sequence_a[start_y:end_y], sequence_data.sequence_b[start_x:end_x],
+                             sequence_data.ids[0], sequence_data.ids[1])
+        self._align_with_tables(engines.PYTHON, max_alignments, seed)
+        self._result.moves = (self.__shift(moves, start_y, start_x) for moves in self._result.moves)
+
+        self._data = sequence_data
+        self._tbl_len_x = len(self._data.sequence_b) + 1
+        self._tbl_len_y = len(self._data.sequence_a) + 1
+
+    def __shift(self, moves, start_y, start_x):
+        """
+        Moves an alignment of the region to its position in the whole sequences.
+
+        Args:
+            moves: move string of an alignment of the region
+            start_y: row of the start cell
+            start_x: column of the start cell
+        """
+        moves.start_a += start_y
+        moves.start_b += start_x
+        return moves
+
+if __name__ == '__main__':
+    # run Smith-Waterman with some parameters
+    sw = SmithWaterman()
+    sw.run("INPUT/sequence1.fasta", "INPUT/sequence2.fasta", "INPUT/pam250.txt", -8, -1, True)
+    '''
+    Optimal Alignment Score: 18
+    Number of Optimal Alignments: 1
+    Optimal Alignments:
+    Seq1   TACG
+           *:**
+    Seq2   TCCG
+    '''
@@ -2,11 +2,15 @@ import argparse
 import sys
 
 from algorithms import available_algorithms
+from algorithms import available_engines
 from algorithms.alignment.alignment_algorithm import AlignmentAlgorithm
+from data.end_gaps import EndGaps
 from maths import matrix_types
 from system import commands
 from system import messages
 
+import system.string_symbols as strings
+
 SUBPARSERS_NAME = "algorithms"
 STORE_TRUE = "store_true"
 
@@ -18,6 +22,7 @@ def start():
     __parse_needleman_wunsch(subparsers)
     __parse_needleman_wunsch_3d(subparsers)
     __parse_nussinov(subparsers)
+    __parse_smith_waterman(subparsers)
 
     args = parser.parse_args()
 
@@ -38,6 +43,10 @@ def __parse_gotoh(subparsers):
     matrix_type.add_argument(matrix_types.PAM250_SHORT, matrix_types.PAM250, action=STORE_TRUE)
 
     gotoh.add_argument(commands.ALL_SHORT, commands.ALL, default=False, action=STORE_TRUE)
+    gotoh.add_argument(commands.ENGINE_SHORT, commands.ENGINE, default=available_engines.PYTHON,
+                       choices=available_engines.GOTOH_ENGINES)
+    gotoh.add_argument(commands.MAX_ALIGNMENTS_SHORT, commands.MAX_ALIGNMENTS, default=None, type=int)
+    gotoh.add_argument(commands.END_GAPS_SHORT, commands.END_GAPS, default=EndGaps.GLOBAL, choices=EndGaps.MODES)
 
     gotoh.add_argument(commands.PATH_1, type=str)
     gotoh.add_argument(commands.PATH_2, type=str)
@@ -59,6 +68,11 @@ def __parse_needleman_wunsch(subparsers):
     matrix_type.add_argument(matrix_types.PAM250_SHORT, matrix_types.PAM250, action=STORE_TRUE)
 
     needleman_wunsch.add_argument(commands.ALL_SHORT, commands.ALL, default=False, action=STORE_TRUE)
+    needleman_wunsch.add_argument(commands.ENGINE_SHORT, commands.ENGINE, default=available_engines.PYTHON,
+                                  choices=available_engines.NEEDLEMAN_WUNSCH_ENGINES)
+    needleman_wunsch.add_argument(commands.MAX_ALIGNMENTS_SHORT, commands.MAX_ALIGNMENTS, default=None, type=int)
+    needleman_wunsch.add_argument(commands.END_GAPS_SHORT, commands.END_GAPS, default=EndGaps.GLOBAL,
+                                  choices=EndGaps.MODES)
 
     needleman_wunsch.add_argument(commands.PATH_1, type=str)
     needleman_wunsch.add_argument(commands.PATH_2, type=str)
@@ -87,6 +101,28 @@ def __parse_nussinov(subparsers):
     nussinov.add_argument(commands.PATH, type=str)
 
 
+def __parse_smith_waterman(subparsers):
+    """"
+    Parses Smith-Waterman parametes.
+
+    Args:
+        subparsers: set of parsers which stores the parser for Smith-Waterman
+    """
+    smith_waterman = subparsers.add_parser(available_algorithms.SMITH_WATERMAN)
+
+    matrix_type = smith_waterman.add_mutually_exclusive_group(required=True)
+    matrix_type.add_argument(matrix_types.BLOSUM62_SHORT, matrix_types.BLOSUM62, action=STORE_TRUE)
+    matrix_type.add_argument(matrix_types.PAM250_SHORT, matrix_types.PAM250, action=STORE_TRUE)
+
+    smith_waterman.add_argument(commands.ALL_SHORT, commands.ALL, default=False, action=STORE_TRUE)
+    smith_waterman.add_argument(commands.MAX_ALIGNMENTS_SHORT, commands.MAX_ALIGNMENTS, default=None, type=int)
+
+    smith_waterman.add_argument(commands.PATH_1, type=str)
+    smith_waterman.add_argument(commands.PATH_2, type=str)
+    smith_waterman.add_argument(commands.GAP_OPEN, type=int)
+    smith_waterman.add_argument(commands.GAP_EXTENSION, type=int)
+
+
 def __input(args):
     """
     Creates the input which an algorithm needs.
@@ -107,6 +143,8 @@ def __input(args):
             alg_input = __input_needleman_wunsch_3d(args)
         elif algorithm == available_algorithms.NUSSINOV:
             alg_input = __input_nussinov(args)
+        elif algorithm == available_algorithms.SMITH_WATERMAN:
+            alg_input = __input_smith_waterman(args)
         else:
             print(messages.DOES_NOT_EXIST)
     else:
@@ -137,6 +175,12 @@ def __input_gotoh(args):
 
     if args.all == True:
         input.append(AlignmentAlgorithm.TRACEBACK_ALL)
+    else:
+        input.append(strings.EMPTY)
+
+    input.append(args.engine)
+    input.append(args.max_alignments)
+    input.append(args.end_gaps)
 
     return input
 
@@ -162,6 +206,12 @@ def __input_needleman_wunsch(args):
 
     if args.all == True:
         input.append(AlignmentAlgorithm.TRACEBACK_ALL)
+    else:
+        input.append(strings.EMPTY)
+
+    input.append(args.engine)
+    input.append(args.max_alignments)
+    input.append(args.end_gaps)
 
     return input
 
@@ -197,4 +247,33 @@ def __input_nussinov(args):
     input.append(available_algorithms.NUSSINOV)
     input.append(args.seq_path)
 
+    return input
+
+def __input_smith_waterman(args):
+    """
+    Creates the input for Smith-Waterman.
+
+    Args:
+        args: structure containing parsed input parameters
+    """
+    input = []
+    input.append(available_algorithms.SMITH_WATERMAN)
+
+    if args.blosum62 == True:
+        input.append(matrix_types.BLOSUM62)
+    else:
+        input.append(matrix_types.PAM250)
+
+    input.append(args.gap_open)
+    input.append(args.gap_extension)
+    input.append(args.seq_1_path)
+    input.append(args.seq_2_path)
+
+    if args.all == True:
+        input.append(AlignmentAlgorithm.TRACEBACK_ALL)
+    else:
+        input.append(strings.EMPTY)
+
+    input.append(args.max_alignments)
+
     return input
\ No newline at end of file
@@ -1,7 +1,13 @@
 ALL = "--all"
 ALL_SHORT = "-a"
+END_GAPS = "--end-gaps"
+END_GAPS_SHORT = "-g"
+ENGINE = "--engine"
+ENGINE_SHORT = "-e"
 GAP_EXTENSION = "gap_extension"
 GAP_OPEN = "gap_open"
+MAX_ALIGNMENTS = "--max-alignments"
+MAX_ALIGNMENTS_SHORT = "-m"
 PATH = "seq_path"
 PATH_1 = "seq_1_path"
 PATH_2 = "seq_2_path"
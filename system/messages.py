@@ -1,8 +1,17 @@
 # stores all messages used in the program
+CHECKPOINT_END_GAPS = "Checkpoints are not supported with free end gaps!"
+CHECKPOINT_ENGINE = "Checkpoints are only supported by the Python engine!"
+CHECKPOINT_MISMATCH = "The checkpoint file belongs to a computation with other parameters!"
 DOES_NOT_EXIST = "The algorithm is not available!"
+EMPTY_SEED = "A seed needs at least one pair of characters!"
+END_GAPS_ENGINE = "Free end gaps are only supported by the Python engine!"
 HELP = "Pass '--help' to the program to find right arguments."
 HINT = "Hint: where XY table contains the alignment of sequence three with sequence two"
+NO_START_CELL = "The reverse pass found no start of the optimal local alignment!"
+NUMPY_MISSING = "The chosen engine needs NumPy, which is not installed!"
+POSITIVE_GAP_ALPHA = "The linear space engine needs a gap_alpha which is not positive!"
 OVERWRITE_METHOD = "Subclasses has to overwrite this method!"
+WFA_SCHEME = "The wavefront engine needs a match and a lower mismatch score, gap_alpha <= 0 and gap_beta < match / 2!"
 WRONG_FASTA_FORMAT = "Wrong formated formats file!"
 WRONG_PATHS = "One or more sequence paths are wrong!"
 
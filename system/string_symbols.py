@@ -17,6 +17,7 @@ NAN = "NaN"
 NEW_LINE_1 = "\r\n"
 NEW_LINE_2 = "\n"
 NEW_LINE_3 = "\r"
+NEW_LINE_ALL_TYPES = "\r\n|\n|\r"
 POSITIVE_INFINITY = maxsize
 SEMICOLON = ";"
 SPACE = " "
@@ -3,7 +3,9 @@ COST_FUNCTION = "cost-function: "
 GAP_COST = "gap-cost: "
 INPUT = "Input"
 OPTIMAL_ALIGNMENTS = "Optimal Alignments: "
+OPTIMAL_ALIGNMENTS_NUMBER = "Number of Optimal Alignments: "
 OPTIMAL_BASEPAIRS_NUMBER = "Maximum Number of Base pairs: "
+OPTIMAL_REGION_ALIGNMENTS_NUMBER = "Number of Optimal Alignments of the Region: "
 OPTIMAL_SCORE = "Optimal Alignment Score: "
 OPTIMAL_STRUCTURE = "Optimal Structure: "
 OTHER_PARAMETERS = "Other Parameters\n" \
@@ -1,6 +1,14 @@
+import tempfile
 import unittest
 
 import gotoh
+from algorithms.alignment.row_engine import RowEngine
+from algorithms.alignment.tiled_engine import TiledEngine
+from data.alignment_input_data import AlignmentInputData
+from data.alignment_output_data import AlignmentOutputData
+from data.checkpoint import Checkpoint
+from data.end_gaps import EndGaps
+from maths.cost_function import CostFunction
 from prakt.gt import GotohBase
 
 class TestMethodsGotoh(unittest.TestCase):
@@ -81,3 +89,273 @@ class TestMethodsGotoh(unittest.TestCase):
         assert seq2 == "TCCGA"
         assert score == -9
         assert alignments == [["-----", "TCCGA"]]  # order of elements is random!
+
+    def test_numpy_engine(self):
+        """Checks if the NumPy engine returns the same scores and alignments as the Python engine."""
+        gt = gotoh.Gotoh()
+        inputs = [("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1),
+                  ("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -4, -1),
+                  ("../T_INPUT/6test_seq1.fasta", "../T_INPUT/6test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/empty_test.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -8, -1)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_open, gap_extend) in inputs:
+            expected = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True)
+            result = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True, "numpy")
+
+            assert result == expected
+
+    def test_linear_engine(self):
+        """Checks if the linear space engine returns one of the optimal alignments."""
+        gt = gotoh.Gotoh()
+        inputs = [("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1),
+                  ("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -4, -1),
+                  ("../T_INPUT/6test_seq1.fasta", "../T_INPUT/6test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -8, -1)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_open, gap_extend) in inputs:
+            expected = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True)
+            result = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, False, "linear")
+            (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+            assert (id_seq1, seq1, id_seq2, seq2, score) == expected[:5]
+            assert len(alignments) == 1
+            assert alignments[0] in expected[5]
+
+    def test_banded_engine(self):
+        """Checks if the banded engine returns the optimal score and optimal alignments."""
+        gt = gotoh.Gotoh()
+        inputs = [("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1),
+                  ("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -4, -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../T_INPUT/11test_seq1.fasta", "../T_INPUT/11test_seq2.fasta", "../INPUT/pam250.txt", -10, -1)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_open, gap_extend) in inputs:
+            expected = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True)
+            result = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True, "banded")
+
+            assert result[:5] == expected[:5]
+            assert len(result[5]) > 0
+            assert all(alignment in expected[5] for alignment in result[5])
+
+    def test_tiled_engine(self):
+        """Checks if the tiled engine returns the same scores and alignments as the Python engine."""
+        gt = gotoh.Gotoh()
+        inputs = [("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1),
+                  ("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -4, -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/empty_test.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -8, -1)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_open, gap_extend) in inputs:
+            expected = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True)
+            result = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True, "tiled")
+
+            assert result == expected
+
+        # many small tiles which are computed in two processes
+        cost_function = CostFunction()
+        cost_function.set_matrix("../INPUT/pam250.txt")
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = \
+            gt.run("../T_INPUT/11test_seq1.fasta", "../T_INPUT/11test_seq2.fasta", "../INPUT/pam250.txt", -10, -1, False)
+        data = AlignmentInputData().init_gotoh(cost_function, -10, -1, seq1, seq2, ids=[id_seq1, id_seq2])
+
+        tables = RowEngine().compute_gotoh(data)
+        tiled_score, directions = TiledEngine(2, 16).compute_gotoh(data)
+
+        assert tiled_score == tables[0][-1][-1] == score
+        assert (directions == tables[3]).all()
+
+    def test_scratch_directory(self):
+        """Checks if matrices which are stored in a scratch directory give the same results as matrices in memory."""
+        inputs = [("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1),
+                  ("../T_INPUT/13test_long_seq.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -3, -1),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -8, -1)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            gt = gotoh.Gotoh(scratch_directory=directory, memory_budget=4096)
+
+            for (seq1_path, seq2_path, matrix_path, gap_open, gap_extend) in inputs:
+                expected = gotoh.Gotoh().run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True,
+                                             max_alignments=10)
+                result = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True, max_alignments=10)
+
+                assert result == expected
+
+    def test_checkpoint(self):
+        """Checks if a fill which is resumed from a checkpoint gives the same results as a complete fill."""
+        gt = gotoh.Gotoh()
+        paths = ("../T_INPUT/13test_long_seq.fasta", "../T_INPUT/11test_seq1.fasta", "../INPUT/pam250.txt")
+        expected = gt.run(*paths, -10, -1, False, seed=1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = directory + "/gotoh.checkpoint"
+            assert gt.run(*paths, -10, -1, False, seed=1, checkpoint=Checkpoint(checkpoint_path, cells=10000)) \
+                == expected
+
+            # a fill which was killed after some checkpoints and while it wrote a checkpoint
+            with open(checkpoint_path, "r+b") as file:
+                file.truncate(file.seek(0, 2) // 2)
+
+            result = gt.run(*paths, -10, -1, False, seed=1, checkpoint=Checkpoint(checkpoint_path, cells=10000),
+                            resume=True)
+            assert result == expected
+
+            with self.assertRaises(ValueError):
+                gt.run(*paths, -8, -1, False, checkpoint=Checkpoint(checkpoint_path), resume=True)
+
+            with self.assertRaises(ValueError):  # only the Python engine writes checkpoints
+                gt.run(*paths, -10, -1, False, "banded", checkpoint=Checkpoint(checkpoint_path))
+
+            # a resumed fill only restores the last row, but the free end gaps need the whole last column
+            for mode in [EndGaps.OVERLAP, EndGaps.SEMI_GLOBAL]:
+                with self.assertRaises(ValueError):
+                    gt.run(*paths, -10, -1, False, checkpoint=Checkpoint(directory + "/" + mode + ".checkpoint",
+                                                                         cells=10000),
+                           resume=True, end_gaps=EndGaps().from_mode(mode))
+
+            # the checkpoint is closed by a fill which raises an error
+            checkpoint = Checkpoint(checkpoint_path, cells=10000)
+            closings = []
+            close = checkpoint.close
+            checkpoint.close = lambda: closings.append(close())
+            failing = gotoh.Gotoh()
+            failing._value = lambda *arguments: 1 / 0
+
+            with self.assertRaises(ZeroDivisionError):
+                failing.run(*paths, -10, -1, False, checkpoint=checkpoint)
+            assert len(closings) == 1
+
+    def test_run_batch(self):
+        """Checks if the batch engine returns the same scores and optimal alignments as the run function."""
+        gt = gotoh.Gotoh()
+        inputs = [("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta"),
+                  ("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta"),
+                  ("../T_INPUT/6test_seq1.fasta", "../T_INPUT/6test_seq2.fasta"),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta"),
+                  ("../T_INPUT/5test_seq2.fasta", "../T_INPUT/empty_test.fasta"),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta")]
+
+        expected = [gt.run(seq1_path, seq2_path, "../INPUT/pam250.txt", -8, -1, True)
+                    for (seq1_path, seq2_path) in inputs]
+        pairs = [(result[1], result[3]) for result in expected]
+
+        assert [score for (score, alignment) in gt.run_batch(pairs, "../INPUT/pam250.txt", -8, -1)] \
+            == [result[4] for result in expected]
+
+        for i, (score, alignment) in enumerate(gt.run_batch(pairs, "../INPUT/pam250.txt", -8, -1, True)):
+            assert score == expected[i][4]
+            assert alignment in expected[i][5]
+
+    def test_score_all(self):
+        """Checks if the striped engine returns the same scores as the run function."""
+        gt = gotoh.Gotoh()
+        sequence_paths = ["../T_INPUT/11test_seq2.fasta", "../T_INPUT/11test_seq1.fasta", "../T_INPUT/5test_seq2.fasta"]
+
+        for (matrix_path, gap_open, gap_extend) in [("../INPUT/pam250.txt", -10, -1),
+                                                    ("../INPUT/blosum62.txt", -11, -1),
+                                                    ("../INPUT/blosum62.txt", 0, -300)]:  # needs int32 values
+            results = gt.score_all("../T_INPUT/11test_seq1.fasta", "../T_INPUT/12test_database.fasta",
+                                   matrix_path, gap_open, gap_extend)
+
+            assert [sequence_id for (sequence_id, score) in results] == ["Protein2", "Protein1", "Seq2"]
+
+            for i in range(0, len(sequence_paths)):
+                expected = gt.run("../T_INPUT/11test_seq1.fasta", sequence_paths[i], matrix_path, gap_open,
+                                  gap_extend, False, "numpy")
+                assert results[i][1] == expected[4]
+
+    def test_max_alignments(self):
+        """Checks if the complete traceback stops after max_alignments and works with long paths."""
+        gt = gotoh.Gotoh()
+        result = gt.run("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1,
+                        True, max_alignments=1)
+
+        assert result[5] == [['TGGA', '--GG']]
+
+        # the paths are longer than the recursion limit
+        for complete_traceback in [True, False]:
+            result = gt.run("../T_INPUT/13test_long_seq.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt",
+                            -3, -1, complete_traceback, max_alignments=3)
+            (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+            assert score == -1499
+            assert 0 < len(alignments) <= 3
+            assert all(alignment[0] == seq1 and alignment[1].replace("-", "") == seq2 for alignment in alignments)
+
+    def test_random_alignments(self):
+        """Checks if the optimal alignments are counted and reproducibly drawn from all optimal alignments."""
+        gt = gotoh.Gotoh()
+        expected = gt.run("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1,
+                          True)
+
+        assert AlignmentOutputData.graph.count() == 2
+
+        result = gt.run("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1,
+                        False, max_alignments=20, seed=1)
+
+        assert result[4] == expected[4]
+        assert len(result[5]) == 20
+        assert sorted(set(map(tuple, result[5]))) == sorted(map(tuple, expected[5]))
+        assert result == gt.run("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt",
+                                -3, -1, False, max_alignments=20, seed=1)
+
+    def test_end_gaps(self):
+        """Checks the alignments with free end gaps and their scores without a traceback."""
+        gt = gotoh.Gotoh()
+        cost_function = CostFunction()
+        cost_function.set_matrix("../T_INPUT/5eva.txt")
+        expected = {EndGaps.GLOBAL: (-3, [['TACGCAGA', 'T---CCGA'], ['TACGCAGA', 'TCC---GA'],
+                                          ['TACGCAGA', 'TCCG---A']]),
+                    EndGaps.GLOCAL: (-3, [['TACGCAGA', 'T---CCGA'], ['TACGCAGA', 'TCC---GA'],
+                                          ['TACGCAGA', 'TCCG---A']]),
+                    EndGaps.OVERLAP: (3, [['TACGCAGA', '---TCCGA']]),
+                    EndGaps.SEMI_GLOBAL: (3, [['TACGCAGA', '---TCCGA'], ['TACGCAGA', 'TCCGA---']])}
+
+        for mode in EndGaps.MODES:
+            result = gt.run("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -4,
+                            -1, True, end_gaps=EndGaps().from_mode(mode))
+
+            assert (result[4], result[5]) == expected[mode]
+            assert gt.get_score(cost_function, -4, -1, "TACGCAGA", "TCCGA", EndGaps().from_mode(mode)) == \
+                expected[mode][0]
+
+        with self.assertRaises(ValueError):
+            gt.run("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -4, -1, True,
+                   "banded", end_gaps=EndGaps(end_b=True))
+
+    def test_extend_seed(self):
+        """Checks the X-drop extension of a seed to both sides."""
+        gt = gotoh.Gotoh()
+
+        for x_drop in [0, 20, 1000]:  # the unrelated flanks are never part of the extension
+            assert gt.extend_seed("PPPPPPHEAGAWGHEEPPPPPP", "GGGGGGHEAGAWGHEEGGGGGG", "../INPUT/blosum62.txt", -11, -1,
+                                  10, 10, x_drop, 2) == (62, 6, 6, ['HEAGAWGHEE', 'HEAGAWGHEE'])
+
+        assert gt.extend_seed("HEAGAWGHEE", "PAWHEAE", "../INPUT/blosum62.txt", -2, -1, 4, 2, 100) == \
+            (9, 2, 1, ['AGAWGHE-E', 'A-W--HEAE'])
+
+        with self.assertRaises(ValueError):
+            gt.extend_seed("HEAGAWGHEE", "PAWHEAE", "../INPUT/blosum62.txt", -2, -1, 4, 2, 100, 0)
+
+    def test_wfa_engine(self):
+        """Checks if the wavefront engine returns one of the optimal alignments for match and mismatch scores."""
+        gt = gotoh.Gotoh()
+        inputs = [("../T_INPUT/4test_seq1.fasta", "../T_INPUT/4test_seq2.fasta", "../T_INPUT/4eva.txt", -3, -1),
+                  ("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -4, -1),
+                  ("../T_INPUT/6test_seq1.fasta", "../T_INPUT/6test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_open, gap_extend) in inputs:
+            expected = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, True)
+            result = gt.run(seq1_path, seq2_path, matrix_path, gap_open, gap_extend, False, "wfa")
+            (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+            assert (id_seq1, seq1, id_seq2, seq2, score) == expected[:5]
+            assert len(alignments) == 1
+            assert alignments[0] in expected[5]
+
+        with self.assertRaises(ValueError):  # pam250 has no single match score
+            gt.run("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -8, -1, False, "wfa")
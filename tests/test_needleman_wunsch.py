@@ -1,7 +1,20 @@
+import concurrent.futures
+import contextlib
+import io
+import tempfile
 import unittest
 
 import needleman_wunsch
+from algorithms.alignment.incremental_alignment import IncrementalAlignment
+from algorithms.alignment.tiled_engine import TiledEngine
+from algorithms.alignment.wavefront_engine import WavefrontEngine
+from data.alignment_input_data import AlignmentInputData
+from data.alignment_output_data import AlignmentOutputData
+from data.checkpoint import Checkpoint
+from data.end_gaps import EndGaps
+from maths.cost_function import CostFunction
 from prakt.nw import NeedlemanWunschBase
+from system import words
 
 class TestMethodsNeedleman(unittest.TestCase):
     """Test class to test Needleman-Wunsch algorithm."""
@@ -75,3 +88,321 @@ class TestMethodsNeedleman(unittest.TestCase):
         assert seq2 == "TCCGA"
         assert score == -5
         assert alignments == [["-----", "TCCGA"]]  # order of elements is random!
+
+    def test_numpy_engine(self):
+        """Checks if the NumPy engine returns the same scores and alignments as the Python engine."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        inputs = [("../T_INPUT/1test_seq1.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -2),
+                  ("../T_INPUT/2test_seq1.fasta", "../T_INPUT/2test_seq2.fasta", "../T_INPUT/2eva.txt", -2),
+                  ("../T_INPUT/3test_seq1.fasta", "../T_INPUT/3test_seq2.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/empty_test.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -1)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_cost) in inputs:
+            expected = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, True)
+            result = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, True, "numpy")
+
+            assert result == expected
+
+    def test_linear_engine(self):
+        """Checks if the linear space engine returns one of the optimal alignments."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        inputs = [("../T_INPUT/1test_seq1.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -2),
+                  ("../T_INPUT/2test_seq1.fasta", "../T_INPUT/2test_seq2.fasta", "../T_INPUT/2eva.txt", -2),
+                  ("../T_INPUT/3test_seq1.fasta", "../T_INPUT/3test_seq2.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -1)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_cost) in inputs:
+            expected = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, True)
+            result = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, False, "linear")
+            (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+            assert (id_seq1, seq1, id_seq2, seq2, score) == expected[:5]
+            assert len(alignments) == 1
+            assert alignments[0] in expected[5]
+
+    def test_banded_engine(self):
+        """Checks if the banded engine returns the optimal score and optimal alignments."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        inputs = [("../T_INPUT/1test_seq1.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -2),
+                  ("../T_INPUT/3test_seq1.fasta", "../T_INPUT/3test_seq2.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../T_INPUT/11test_seq1.fasta", "../T_INPUT/11test_seq2.fasta", "../INPUT/pam250.txt", -4)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_cost) in inputs:
+            expected = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, True)
+            result = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, True, "banded")
+
+            assert result[:5] == expected[:5]
+            assert len(result[5]) > 0
+            assert all(alignment in expected[5] for alignment in result[5])
+
+    def test_tiled_engine(self):
+        """Checks if the tiled engine returns the same scores and alignments as the Python engine."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        inputs = [("../T_INPUT/1test_seq1.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -2),
+                  ("../T_INPUT/3test_seq1.fasta", "../T_INPUT/3test_seq2.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/empty_test.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/3eva.txt", -1),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -1)]
+
+        for (seq1_path, seq2_path, matrix_path, gap_cost) in inputs:
+            expected = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, True)
+            result = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, True, "tiled")
+
+            assert result == expected
+
+        # many small tiles which are computed in two processes
+        cost_function = CostFunction()
+        cost_function.set_matrix("../INPUT/pam250.txt")
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = \
+            nw.run("../T_INPUT/11test_seq1.fasta", "../T_INPUT/11test_seq2.fasta", "../INPUT/pam250.txt", -4, False)
+        data = AlignmentInputData().init_needleman(cost_function, -4, seq1, seq2, ids=[id_seq1, id_seq2])
+
+        table_values, table_directions = WavefrontEngine().compute_needleman(data)
+        tiled_score, directions = TiledEngine(2, 16).compute_needleman(data)
+
+        assert tiled_score == table_values[-1][-1] == score
+        assert (directions == table_directions).all()
+
+    def test_run_batch(self):
+        """Checks if the batch engine returns the same scores and optimal alignments as the run function."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        inputs = [("../T_INPUT/1test_seq1.fasta", "../T_INPUT/1test_seq2.fasta"),
+                  ("../T_INPUT/2test_seq1.fasta", "../T_INPUT/2test_seq2.fasta"),
+                  ("../T_INPUT/3test_seq1.fasta", "../T_INPUT/3test_seq2.fasta"),
+                  ("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta"),
+                  ("../T_INPUT/5test_seq2.fasta", "../T_INPUT/empty_test.fasta"),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta")]
+
+        expected = [nw.run(seq1_path, seq2_path, "../INPUT/pam250.txt", -2, True)
+                    for (seq1_path, seq2_path) in inputs]
+        pairs = [(result[1], result[3]) for result in expected]
+
+        assert [score for (score, alignment) in nw.run_batch(pairs, "../INPUT/pam250.txt", -2)] \
+            == [result[4] for result in expected]
+
+        for i, (score, alignment) in enumerate(nw.run_batch(pairs, "../INPUT/pam250.txt", -2, True)):
+            assert score == expected[i][4]
+            assert alignment in expected[i][5]
+    def test_max_alignments(self):
+        """Checks if the complete traceback stops after max_alignments and works with long paths."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        expected = nw.run("../T_INPUT/1test_seq1.fasta", "../T_INPUT/2test_seq1.fasta", "../INPUT/pam250.txt", -1, True)
+        result = nw.run("../T_INPUT/1test_seq1.fasta", "../T_INPUT/2test_seq1.fasta", "../INPUT/pam250.txt", -1, True,
+                        max_alignments=2)
+
+        assert len(expected[5]) > 2
+        assert result[5] == expected[5][:2]
+
+        # the paths are longer than the recursion limit
+        result = nw.run("../T_INPUT/13test_long_seq.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -1,
+                        True, max_alignments=3)
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+        assert len(seq1) == 1500
+        assert score == -1494
+        assert len(alignments) == 3
+        assert all(alignment[0] == seq1 and alignment[1].replace("-", "") == seq2 for alignment in alignments)
+
+    def test_random_alignments(self):
+        """Checks if the optimal alignments are counted and reproducibly drawn from all optimal alignments."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        expected = nw.run("../T_INPUT/1test_seq1.fasta", "../T_INPUT/2test_seq1.fasta", "../INPUT/pam250.txt", -1, True)
+
+        assert AlignmentOutputData.graph.count() == len(expected[5])
+
+        result = nw.run("../T_INPUT/1test_seq1.fasta", "../T_INPUT/2test_seq1.fasta", "../INPUT/pam250.txt", -1, False,
+                        max_alignments=50, seed=1)
+
+        assert len(result[5]) == 50
+        assert all(alignment in expected[5] for alignment in result[5])
+        assert result == nw.run("../T_INPUT/1test_seq1.fasta", "../T_INPUT/2test_seq1.fasta", "../INPUT/pam250.txt", -1,
+                                False, max_alignments=50, seed=1)
+
+    def test_printed_count(self):
+        """Checks if the printed number of optimal alignments fits the returned alignments."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        empty_paths = ("../T_INPUT/empty_test.fasta", "../T_INPUT/empty_test.fasta", "../T_INPUT/3eva.txt")
+
+        with tempfile.TemporaryDirectory() as directory:
+            with open(directory + "/seq1.fasta", "w") as file:
+                file.write("> Seq1\nAAA\n")
+            with open(directory + "/seq2.fasta", "w") as file:
+                file.write("> Seq2\nA\n")
+
+            paths = (directory + "/seq1.fasta", directory + "/seq2.fasta", "../T_INPUT/1eva.txt")
+
+            # the complete traceback also counts the alignments which are not returned
+            for (input_paths, complete_traceback, max_alignments, expected_alignments, expected_line) in \
+                    [(empty_paths, True, None, [], None),
+                     (empty_paths, False, None, [['', '']], "1"),
+                     (paths, True, 2, [['AAA', '--A'], ['AAA', '-A-']], "3")]:
+                output = io.StringIO()
+
+                with contextlib.redirect_stdout(output):
+                    result = nw.run(*input_paths, -1, complete_traceback, max_alignments=max_alignments)
+
+                lines = [line[len(words.OPTIMAL_ALIGNMENTS_NUMBER):] for line in output.getvalue().splitlines()
+                         if line.startswith(words.OPTIMAL_ALIGNMENTS_NUMBER)]
+
+                assert result[5] == expected_alignments
+                assert lines == ([] if expected_line is None else [expected_line])
+
+    def test_threads(self):
+        """Checks if alignments in parallel threads have their own output data."""
+        inputs = [("../T_INPUT/%dtest_seq1.fasta" % i, "../T_INPUT/%dtest_seq2.fasta" % i, "../T_INPUT/%deva.txt" % i)
+                  for i in range(1, 7)]
+        expected = [needleman_wunsch.NeedlemanWunsch().run(a, b, matrix, -1, True) for (a, b, matrix) in inputs * 3]
+
+        def align(paths):
+            nw = needleman_wunsch.NeedlemanWunsch(publish_output=False)
+            result = nw.run(paths[0], paths[1], paths[2], -1, True, "numpy")
+            return result, nw.get_output_data().graph.count()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(align, inputs * 3))
+
+        assert [result for (result, count) in results] == expected
+        assert all(count == len(result[5]) for (result, count) in results)
+
+    def test_compact_table(self):
+        """Checks if the matrix is stored with the smallest integer type which can contain its values."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        result = nw.run("../T_INPUT/13test_long_seq.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -1,
+                        False)
+        table = nw.get_output_data().table_values
+
+        assert table.values.itemsize == 2
+        assert len(table.values) == len(table) * len(table[0]) == 1501 * (len(result[3]) + 1)
+        assert table[len(table) - 1][len(table[0]) - 1] == result[4] == -1494
+
+    def test_scratch_directory(self):
+        """Checks if matrices which are stored in a scratch directory give the same results as matrices in memory."""
+        inputs = [("../T_INPUT/1test_seq1.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -2),
+                  ("../T_INPUT/13test_long_seq.fasta", "../T_INPUT/1test_seq2.fasta", "../T_INPUT/1eva.txt", -1),
+                  ("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -1)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            nw = needleman_wunsch.NeedlemanWunsch(scratch_directory=directory, memory_budget=4096)
+
+            for (seq1_path, seq2_path, matrix_path, gap_cost) in inputs:
+                expected = needleman_wunsch.NeedlemanWunsch().run(seq1_path, seq2_path, matrix_path, gap_cost, True,
+                                                                  max_alignments=10)
+                result = nw.run(seq1_path, seq2_path, matrix_path, gap_cost, True, max_alignments=10)
+
+                assert result == expected
+
+            assert nw.get_output_data().table_values.values.itemsize == 2
+
+    def test_incremental_alignment(self):
+        """Checks if an alignment which is updated after changes is the same as a new alignment."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = \
+            nw.run("../T_INPUT/11test_seq1.fasta", "../T_INPUT/11test_seq2.fasta", "../INPUT/pam250.txt", -4, True)
+        cost_function = CostFunction()
+        cost_function.set_matrix("../INPUT/pam250.txt")
+
+        incremental = IncrementalAlignment(cost_function, -4, seq1, seq2, checkpoint_interval=8)
+        assert incremental.get_score() == score
+        assert list(incremental.get_alignments()) == alignments
+
+        changes = [(incremental.append_a, ("WKL",)),
+                   (incremental.append_b, ("WKLHH",)),
+                   (incremental.replace_a, (len(seq1) - 5, len(seq1) - 3, "C")),
+                   (incremental.replace_b, (len(seq2) - 10, len(seq2) - 10, "AAG")),
+                   (incremental.replace_a, (len(seq1) - 20, len(seq1) + 2, "")),
+                   (incremental.replace_b, (3, 4, "W"))]
+
+        for (change, arguments) in changes:
+            changed_score = change(*arguments)
+            expected = IncrementalAlignment(cost_function, -4, incremental.sequence_a, incremental.sequence_b)
+
+            assert changed_score == incremental.get_score() == expected.get_score()
+            assert list(incremental.get_alignments(10)) == list(expected.get_alignments(10))
+
+    def test_get_data(self):
+        """Checks if the score, the gaps and the length of an optimal alignment are returned without a traceback."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        cost_function = CostFunction()
+        cost_function.set_matrix("../INPUT/pam250.txt")
+
+        assert nw.get_data(cost_function, -1, "TACGCAGA", "TCCGA") == (31, 3, 8)
+        assert nw.get_data(cost_function, -1, "TACGCAGA", "TCCGA", False) == (31, 3, 8)
+        assert nw.get_data(cost_function, -1, "", "TCCGA") == (-5, 5, 5)
+
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = \
+            nw.run("../T_INPUT/11test_seq1.fasta", "../T_INPUT/11test_seq2.fasta", "../INPUT/pam250.txt", -4, True)
+        fewest_gaps = min([alignment[0].count("-") + alignment[1].count("-") for alignment in alignments])
+
+        assert nw.get_data(cost_function, -4, seq1, seq2) == \
+            (score, fewest_gaps, (len(seq1) + len(seq2) + fewest_gaps) // 2)
+
+    def test_end_gaps(self):
+        """Checks the alignments with free end gaps and their scores without a traceback."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        cost_function = CostFunction()
+        cost_function.set_matrix("../T_INPUT/5eva.txt")
+        expected = {EndGaps.GLOBAL: (2, [['TACGCAGA', 'T-C-C-GA']]),
+                    EndGaps.GLOCAL: (2, [['TACGCAGA', 'T-C-C-GA']]),
+                    EndGaps.OVERLAP: (3, [['TACGCAGA', '---TCCGA']]),
+                    EndGaps.SEMI_GLOBAL: (3, [['TACGCAGA', '---TCCGA'], ['TACGCAGA', 'TCCG-A--'],
+                                              ['TACGCAGA', 'TCCGA---']])}
+
+        for mode in EndGaps.MODES:
+            result = nw.run("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -1,
+                            True, end_gaps=EndGaps().from_mode(mode))
+
+            assert (result[4], result[5]) == expected[mode]
+            assert nw.get_data(cost_function, -1, "TACGCAGA", "TCCGA", True, EndGaps().from_mode(mode))[0] == \
+                expected[mode][0]
+            assert nw.get_data(cost_function, -1, "TACGCAGA", "TCCGA", False, EndGaps().from_mode(mode))[0] == \
+                expected[mode][0]
+
+        # the read is aligned completely, the gaps before and after it are free
+        result = nw.run("../T_INPUT/5test_seq2.fasta", "../T_INPUT/5test_seq1.fasta", "../T_INPUT/5eva.txt", -1,
+                        True, end_gaps=EndGaps(start_a=True, end_a=True))
+        assert result[4] == 3
+        assert nw.get_data(cost_function, -1, "", "TCCGA", True, EndGaps(start_a=True)) == (0, 5, 5)
+
+        with self.assertRaises(ValueError):
+            nw.run("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -1, True,
+                   "numpy", end_gaps=EndGaps(end_b=True))
+
+        # a resumed fill only restores the last row, but the free end gaps need the whole last column
+        with tempfile.TemporaryDirectory() as directory:
+            for mode in [EndGaps.OVERLAP, EndGaps.SEMI_GLOBAL]:
+                with self.assertRaises(ValueError):
+                    nw.run("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -1,
+                           True, checkpoint=Checkpoint(directory + "/nw.checkpoint", cells=1), resume=True,
+                           end_gaps=EndGaps().from_mode(mode))
+
+    def test_move_strings(self):
+        """Checks if the alignments are stored as run-length encoded moves."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+        result = nw.run("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -1, True)
+        moves = nw.get_output_data().moves
+
+        assert [str(moves_x) for moves_x in moves] == ["1M1D1M1D1M1D2M"]
+        assert [moves_x.materialize(result[1], result[3]) for moves_x in moves] == result[5]
+        assert moves[0].count_gaps() == 3 and len(moves[0]) == 8
+
+    def test_bit_vector_engine(self):
+        """Checks the edit distance and the pattern search of the bit-vector engine."""
+        nw = needleman_wunsch.NeedlemanWunsch()
+
+        for block_size in [None, 1, 2, 64]:
+            assert nw.edit_distance("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta",
+                                    block_size=block_size) == 3
+            assert nw.edit_distance("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", 3, block_size) == 3
+            assert nw.edit_distance("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", 2, block_size) is None
+
+            # TCCGA in TACGCAGA ends after TACG, TACGC, TACGCA and TACGCAGA with two errors
+            assert nw.search_pattern("../T_INPUT/5test_seq2.fasta", "../T_INPUT/5test_seq1.fasta", 2, block_size) == \
+                [(4, 2), (5, 2), (6, 2), (8, 2)]
+            assert nw.search_pattern("../T_INPUT/5test_seq2.fasta", "../T_INPUT/5test_seq1.fasta", 1, block_size) == []
+
+        assert nw.edit_distance("../T_INPUT/empty_test.fasta", "../T_INPUT/5test_seq2.fasta") == 5
+        assert nw.edit_distance("../T_INPUT/13test_long_seq.fasta", "../T_INPUT/13test_long_seq.fasta", 0, 64) == 0
@@ -1,6 +1,8 @@
+import tempfile
 import unittest
 
 import needleman_wunsch3
+from data.checkpoint import Checkpoint
 from prakt.nw3 import NeedlemanWunsch3Base
 
 class TestMethodsNeedleman3(unittest.TestCase):
@@ -26,6 +28,24 @@ class TestMethodsNeedleman3(unittest.TestCase):
         assert score == 2
         assert alignments == [["CTCACA", "C--AC-", "GT-AC-"]]  # order of elements is random!
 
+    def test_checkpoint(self):
+        """Checks if a fill which is resumed from a checkpoint gives the same results as a complete fill."""
+        nw3 = needleman_wunsch3.NeedlemanWunsch3()
+        expected = nw3.run("../T_INPUT/7test_seq.fasta", "../T_INPUT/7eva.txt", -1, False)
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = directory + "/nw3.checkpoint"
+            nw3.run("../T_INPUT/7test_seq.fasta", "../T_INPUT/7eva.txt", -1, False, Checkpoint(checkpoint_path, cells=1))
+
+            # a fill which was killed after some layers
+            with open(checkpoint_path, "r+b") as file:
+                file.truncate(file.seek(0, 2) // 2)
+
+            result = nw3.run("../T_INPUT/7test_seq.fasta", "../T_INPUT/7eva.txt", -1, False,
+                             Checkpoint(checkpoint_path, cells=1), True)
+
+            assert result == expected
+
     def test_empty(self):
         """Checks if everything is fine with an empty sequence."""
         nw3 = needleman_wunsch3.NeedlemanWunsch3()
@@ -0,0 +1,74 @@
+import unittest
+
+import smith_waterman
+from algorithms.alignment.alignment_algorithm import AlignmentAlgorithm
+from data.alignment_output_data import AlignmentOutputData
+
+class TestMethodsSmithWaterman(unittest.TestCase):
+    """Test class to test Smith-Waterman algorithm."""
+
+    def test_instance(self):
+        """Check inheritance."""
+        assert issubclass(smith_waterman.SmithWaterman, AlignmentAlgorithm)
+
+    def test_5(self):
+        """Test if run function can be called."""
+        sw = smith_waterman.SmithWaterman()
+        result = sw.run("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta", "../T_INPUT/5eva.txt", -4, -1,
+                        True)
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+        assert id_seq1 == "Seq1"
+        assert id_seq2 == "Seq2"
+        assert seq1 == "TACGCAGA"
+        assert seq2 == "TCCGA"
+        assert score == 3
+        assert alignments == [['TACG', 'TCCG']]  # the region which ends first is aligned
+
+    def test_6(self):
+        """Test sequences without a pair of characters with a positive score."""
+        sw = smith_waterman.SmithWaterman()
+        result = sw.run("../T_INPUT/6test_seq1.fasta", "../T_INPUT/6test_seq2.fasta", "../T_INPUT/6eva.txt", -4, -1,
+                        True)
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+        assert score == 0
+        assert alignments == []
+
+    def test_11(self):
+        """Test protein sequences with a gap."""
+        sw = smith_waterman.SmithWaterman()
+        result = sw.run("../T_INPUT/11test_seq1.fasta", "../T_INPUT/11test_seq2.fasta", "../INPUT/blosum62.txt",
+                        -11, -1, True)
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+        assert score == 439
+        assert len(alignments) == 1
+        assert alignments[0][0].replace("-", "") == seq1
+        assert alignments[0][1] == "PWPPTYEQTSVQDPMCEWRVMPSQWATNRREGVAPLPYET---" \
+                                   "ANPHFWNHLGTIANYDMDIMNAPEERSMMFWNYEHLNILAFDCGDARP"
+
+    def test_region_tables(self):
+        """Test if only the aligned region is stored in matrices."""
+        sw = smith_waterman.SmithWaterman()
+        result = sw.run("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -8, -1, False)
+        (id_seq1, seq1, id_seq2, seq2, score, alignments) = result
+
+        assert score == 18
+        assert alignments == [['TACG', 'TCCG']]
+        assert len(AlignmentOutputData.table_values) == 5
+        assert len(AlignmentOutputData.table_values[0]) == 5
+
+        with self.assertRaises(TypeError):  # the engine of Gotoh.run is not taken for max_alignments
+            sw.run("../INPUT/sequence1.fasta", "../INPUT/sequence2.fasta", "../INPUT/pam250.txt", -8, -1, False, 2)
+
+    def test_iterate_alignments(self):
+        """Test if the best non-overlapping local alignments are returned one after another."""
+        sw = smith_waterman.SmithWaterman()
+        alignments = sw.iterate_alignments("../T_INPUT/5test_seq1.fasta", "../T_INPUT/5test_seq2.fasta",
+                                           "../T_INPUT/5eva.txt", -4, -1)
+
+        assert next(alignments) == (3, 0, 0, ['TACG', 'TCCG'])  # the same alignment as with run
+        assert next(alignments) == (3, 4, 1, ['CAGA', 'CCGA'])
+        assert next(alignments) == (2, 2, 1, ['CGCA', 'CCGA'])
+        assert [score for (score, start_a, start_b, alignment) in alignments] == [1, 1]